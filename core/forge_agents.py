@@ -2,9 +2,26 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-import json
 import time
-import urllib.request
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+from core.forge_http import RESPONSE_CACHE
+from core.forge_parsers import PARSERS, parser_for
+from core.forge_stream import STREAM_PROVIDERS, split_stream_url, stream_hub
+
+FORGE_HEADERS = {"User-Agent": "IrsanAI-TPM/Forge"}
+
+
+def fetch_json(url: str, timeout: float = 6.0, source_type: str = "") -> Any:
+    """GET ``url`` through the shared cache/pool and decode it with the ``source_type`` parser."""
+    parser = parser_for(source_type)
+    body = RESPONSE_CACHE.get(url, headers=FORGE_HEADERS, timeout=timeout, source_type=source_type, max_bytes=parser.max_body_bytes)
+    try:
+        return parser.decode(body)
+    except ValueError:
+        RESPONSE_CACHE.invalidate(url)
+        raise
 
 
 @dataclass
@@ -20,6 +37,8 @@ class AgentSignal:
 
 
 class BaseAgent(ABC):
+    streaming = False
+
     def __init__(self, spec: dict):
         self.spec = spec
         self.name = spec["name"]
@@ -28,6 +47,8 @@ class BaseAgent(ABC):
         self.weight = float(spec.get("weight", 1.0))
         self.failures = 0
         self.success = 0
+        self.last_ok_ts: float | None = None
+        self.last_latency_ms = 0.0
 
     @abstractmethod
     def parse_value(self, payload: dict) -> float:
@@ -42,14 +63,13 @@ class BaseAgent(ABC):
                 url = url.replace("{API_KEY}", key)
         return url
 
-    def fetch(self, timeout: float = 6.0) -> AgentSignal:
-        t0 = time.time()
-        req = urllib.request.Request(self._resolve_url(), headers={"User-Agent": "IrsanAI-TPM/Forge"})
-        with urllib.request.urlopen(req, timeout=timeout) as response:
-            raw = response.read().decode("utf-8")
-            payload = json.loads(raw)
+    def fetch_payload(self, timeout: float = 6.0) -> Any:
+        return fetch_json(self._resolve_url(), timeout=timeout, source_type=self.spec.get("source_type", ""))
+
+    def signal_from_payload(self, payload: Any, latency_ms: float) -> AgentSignal:
         value = self.parse_value(payload)
-        latency_ms = (time.time() - t0) * 1000.0
+        self.last_ok_ts = time.time()
+        self.last_latency_ms = latency_ms
         self.success += 1
         return AgentSignal(
             name=self.name,
@@ -62,25 +82,97 @@ class BaseAgent(ABC):
             source_ok=True,
         )
 
+    def fetch(self, timeout: float = 6.0) -> AgentSignal:
+        t0 = time.time()
+        payload = self.fetch_payload(timeout=timeout)
+        try:
+            return self.signal_from_payload(payload, (time.time() - t0) * 1000.0)
+        except Exception:
+            RESPONSE_CACHE.invalidate(self._resolve_url())
+            raise
+
+    def close(self) -> None:
+        return None
+
+    def freshness_s(self, now: float | None = None) -> float:
+        if self.last_ok_ts is None:
+            return 0.0
+        return max(0.0, (now or time.time()) - self.last_ok_ts)
+
+    def carry_forward(self, value: float, now: float | None = None) -> AgentSignal:
+        """Re-emit the last good value with its real age when the source misses the tick deadline."""
+        return AgentSignal(
+            name=self.name,
+            domain=self.domain,
+            market=self.market,
+            value=value,
+            latency_ms=self.last_latency_ms,
+            uptime=self.success / max(1, self.success + self.failures),
+            freshness_s=self.freshness_s(now),
+            source_ok=False,
+        )
+
 
 class GenericMarketAgent(BaseAgent):
     def parse_value(self, payload: dict) -> float:
         stype = self.spec["source_type"]
-        if stype == "kraken":
-            return float(payload["result"]["XXBTZUSD"][-1][4])
-        if stype == "binance":
-            return float(payload["price"])
-        if stype == "open_meteo":
-            return float(payload["current"]["temperature_2m"])
-        if stype == "alphavantage_commodity":
-            data = payload.get("data", [])
-            if not data:
-                raise ValueError("alphavantage_commodity payload has no data")
-            return float(data[0]["value"])
-        raise ValueError(f"unsupported source_type={stype}")
+        if stype == "coingecko":
+            query = parse_qs(urlsplit(self.spec["url"]).query)
+            coin = query["ids"][0].split(",")[0]
+            currency = query.get("vs_currencies", ["usd"])[0].split(",")[0]
+            return float(payload[coin][currency])
+        parser = PARSERS.get(stype)
+        if parser is None or not parser.path:
+            raise ValueError(f"unsupported source_type={stype}")
+        try:
+            return float(parser.extract(payload))
+        except ValueError as exc:
+            raise ValueError(f"{stype} {exc}") from exc
+
+
+class StreamingMarketAgent(BaseAgent):
+    """Zero-I/O agent fed by the provider's shared WebSocket subscription.
+
+    ``url`` is the stream endpoint plus a ``symbol`` query parameter, e.g.
+    ``wss://stream.binance.com:9443/stream?symbol=btcusdt`` or ``wss://ws.kraken.com/v2?symbol=BTC/USD``.
+    """
+
+    streaming = True
+
+    def __init__(self, spec: dict, staleness_s: float = 30.0):
+        super().__init__(spec)
+        endpoint, symbol = split_stream_url(self._resolve_url())
+        self.symbol = symbol.lower() if spec["source_type"] == "binance_ws" else symbol
+        self.staleness_s = float(spec.get("staleness_seconds", staleness_s))
+        self.hub = stream_hub(spec["source_type"], endpoint)
+        self.hub.add_symbol(self.symbol)
+
+    def parse_value(self, payload: dict) -> float:
+        return float(payload["price"])
+
+    def fetch(self, timeout: float = 6.0) -> AgentSignal:
+        quote = self.hub.quote(self.symbol)
+        if quote is None:
+            raise LookupError(f"no {self.symbol} tick from {self.hub.endpoint} yet {self.hub.last_error}".strip())
+        price, ts = quote
+        age = time.time() - ts
+        if age > self.staleness_s:
+            raise TimeoutError(f"{self.symbol} stream stale for {age:.0f}s")
+        signal = self.signal_from_payload({"price": price}, 0.0)
+        self.last_ok_ts = ts
+        signal.freshness_s = age
+        return signal
+
+    def close(self) -> None:
+        self.hub.remove_symbol(self.symbol)
 
 
 class DynamicAgentFactory:
     @staticmethod
-    def build(agent_specs: list[dict]) -> list[BaseAgent]:
-        return [GenericMarketAgent(spec) for spec in agent_specs]
+    def build(agent_specs: list[dict], stream_staleness_s: float = 30.0) -> list[BaseAgent]:
+        return [
+            StreamingMarketAgent(spec, staleness_s=stream_staleness_s)
+            if spec.get("source_type") in STREAM_PROVIDERS
+            else GenericMarketAgent(spec)
+            for spec in agent_specs
+        ]
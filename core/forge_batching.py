@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import json
+import time
+from typing import Any, Callable
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from core.forge_agents import AgentSignal, BaseAgent, fetch_json
+from core.forge_http import RESPONSE_CACHE
+
+# statuses that mean the combined request itself is malformed; 429/418 and 5xx are throttling or outages
+BATCH_REJECT_STATUS = frozenset({400, 404, 414, 422})
+
+
+def _fan_out_whole(payload: Any, agents: list[BaseAgent]) -> dict[str, Any]:
+    return {agent.name: payload for agent in agents}
+
+
+@dataclass
+class FetchJob:
+    """One HTTP request per tick whose decoded payload is shared by every subscribed agent."""
+
+    key: str
+    url: str
+    source_type: str
+    agents: list[BaseAgent]
+    fan_out: Callable[[Any, list[BaseAgent]], dict[str, Any]] = _fan_out_whole
+    batch_key: tuple | None = None
+
+    @property
+    def coalesced(self) -> int:
+        """Subscribers served by another agent's identical URL in this job."""
+        return len(self.agents) - len({agent._resolve_url() for agent in self.agents})
+
+    def run(self, timeout: float = 6.0) -> dict[str, AgentSignal | Exception]:
+        t0 = time.time()
+        payload = fetch_json(self.url, timeout=timeout, source_type=self.source_type)
+        latency_ms = (time.time() - t0) * 1000.0
+        parts = self.fan_out(payload, self.agents)
+        out: dict[str, AgentSignal | Exception] = {}
+        for agent in self.agents:
+            try:
+                if agent.name not in parts:
+                    raise KeyError(f"{self.source_type} batch response has no entry for {agent.name}")
+                out[agent.name] = agent.signal_from_payload(parts[agent.name], latency_ms)
+            except Exception as exc:
+                out[agent.name] = exc
+        if any(isinstance(result, Exception) for result in out.values()):
+            RESPONSE_CACHE.invalidate(self.url)
+        return out
+
+
+@dataclass
+class ProviderBatch:
+    """How one provider folds several symbols into a single request.
+
+    ``symbol_params`` vary per agent (the first one is required); all other query parameters must match.
+    """
+
+    symbol_params: tuple[str, ...]
+    build_query: Callable[[list[dict[str, str]]], dict[str, str]]
+    fan_out: Callable[[Any, list[BaseAgent]], dict[str, Any]]
+    validate: Callable[[dict[str, str]], bool] = field(default=lambda query: True)
+
+
+def _binance_query(queries: list[dict[str, str]]) -> dict[str, str]:
+    symbols = list(dict.fromkeys(q["symbol"] for q in queries))
+    return {"symbols": json.dumps(symbols, separators=(",", ":"))}
+
+
+def _binance_fan_out(payload: Any, agents: list[BaseAgent]) -> dict[str, Any]:
+    by_symbol = {str(row.get("symbol")): row for row in payload if isinstance(row, dict)}
+    out: dict[str, Any] = {}
+    for agent in agents:
+        symbol = _query(agent)["symbol"]
+        if symbol in by_symbol:
+            out[agent.name] = by_symbol[symbol]
+    return out
+
+
+def _coingecko_query(queries: list[dict[str, str]]) -> dict[str, str]:
+    ids = list(dict.fromkeys(q["ids"] for q in queries))
+    currencies = list(dict.fromkeys(c for q in queries for c in q.get("vs_currencies", "usd").split(",")))
+    return {"ids": ",".join(ids), "vs_currencies": ",".join(currencies)}
+
+
+def _open_meteo_query(queries: list[dict[str, str]]) -> dict[str, str]:
+    return {
+        "latitude": ",".join(q["latitude"] for q in queries),
+        "longitude": ",".join(q["longitude"] for q in queries),
+    }
+
+
+# Open-Meteo answers with the centre of the grid cell it used, which can be a few km off the request
+OPEN_METEO_MATCH_DEGREES = 0.2
+
+
+def _open_meteo_fan_out(payload: Any, agents: list[BaseAgent]) -> dict[str, Any]:
+    """Match every agent to the nearest returned location within ``OPEN_METEO_MATCH_DEGREES``.
+
+    Rows are matched on their ``latitude``/``longitude``, never on position, so a missing or reordered
+    location leaves its agent without an entry instead of handing it another location's weather.
+    """
+    rows = [row for row in (payload if isinstance(payload, list) else [payload]) if isinstance(row, dict)]
+    located = []
+    for row in rows:
+        try:
+            located.append((float(row["latitude"]), float(row["longitude"]), row))
+        except (KeyError, TypeError, ValueError):
+            continue
+    out: dict[str, Any] = {}
+    for agent in agents:
+        query = _query(agent)
+        lat, lon = float(query["latitude"]), float(query["longitude"])
+        best = min(located, key=lambda item: abs(item[0] - lat) + abs(item[1] - lon), default=None)
+        if best is not None and abs(best[0] - lat) <= OPEN_METEO_MATCH_DEGREES and abs(best[1] - lon) <= OPEN_METEO_MATCH_DEGREES:
+            out[agent.name] = best[2]
+    return out
+
+
+PROVIDER_BATCHES: dict[str, ProviderBatch] = {
+    "binance": ProviderBatch(
+        symbol_params=("symbol",),
+        build_query=_binance_query,
+        fan_out=_binance_fan_out,
+    ),
+    "coingecko": ProviderBatch(
+        symbol_params=("ids", "vs_currencies"),
+        build_query=_coingecko_query,
+        fan_out=_fan_out_whole,
+        validate=lambda query: "," not in query.get("ids", ","),
+    ),
+    "open_meteo": ProviderBatch(
+        symbol_params=("latitude", "longitude"),
+        build_query=_open_meteo_query,
+        fan_out=_open_meteo_fan_out,
+        validate=lambda query: "," not in query.get("latitude", ",") + query.get("longitude", ","),
+    ),
+}
+
+
+def _query(agent: BaseAgent) -> dict[str, str]:
+    return dict(parse_qsl(urlsplit(agent._resolve_url()).query, keep_blank_values=True))
+
+
+class ProviderBatcher:
+    """Plans the per-tick fetch jobs, folding same-provider agents into multi-symbol requests.
+
+    Agents of a batchable ``source_type`` that share host, path and non-symbol query parameters are
+    combined into one request (Binance ``symbols=[...]``, CoinGecko ``ids=a,b``, Open-Meteo lat/lon
+    lists). A batch the provider rejects as malformed (``BATCH_REJECT_STATUS``) is remembered and its
+    agents fall back to single requests; rate limits keep the batch so throttling does not multiply traffic.
+    """
+
+    def __init__(self, max_batch: int = 50, enabled: bool = True):
+        self.max_batch = max(1, max_batch)
+        self.enabled = enabled
+        self.rejected: set[tuple] = set()
+
+    def _batch_key(self, agent: BaseAgent) -> tuple | None:
+        stype = agent.spec.get("source_type", "")
+        provider = PROVIDER_BATCHES.get(stype)
+        if provider is None:
+            return None
+        parts = urlsplit(agent._resolve_url())
+        query = dict(parse_qsl(parts.query, keep_blank_values=True))
+        if provider.symbol_params[0] not in query or not provider.validate(query):
+            return None
+        rest = tuple(sorted((k, v) for k, v in query.items() if k not in provider.symbol_params))
+        key = (stype, parts.scheme, parts.netloc, parts.path, rest)
+        return None if key in self.rejected else key
+
+    def plan(self, agents: list[BaseAgent]) -> list[FetchJob]:
+        """Build the tick's jobs: identical resolved URLs are coalesced, batchable providers folded."""
+        by_url: dict[str, list[BaseAgent]] = {}
+        groups: dict[tuple, list[BaseAgent]] = {}
+        for agent in agents:
+            key = self._batch_key(agent) if self.enabled else None
+            if key is None:
+                by_url.setdefault(agent._resolve_url(), []).append(agent)
+            else:
+                groups.setdefault(key, []).append(agent)
+
+        jobs = [
+            FetchJob(key=url, url=url, source_type=members[0].spec.get("source_type", ""), agents=members)
+            for url, members in by_url.items()
+        ]
+        for key, members in groups.items():
+            stype, scheme, netloc, path, rest = key
+            provider = PROVIDER_BATCHES[stype]
+            for start in range(0, len(members), self.max_batch):
+                chunk = members[start : start + self.max_batch]
+                urls = {agent._resolve_url() for agent in chunk}
+                if len(urls) == 1:
+                    url = urls.pop()
+                    jobs.append(FetchJob(key=url, url=url, source_type=stype, agents=chunk))
+                    continue
+                query = dict(rest)
+                query.update(provider.build_query([_query(agent) for agent in chunk]))
+                url = urlunsplit((scheme, netloc, path, urlencode(query), ""))
+                jobs.append(FetchJob(key=url, url=url, source_type=stype, agents=chunk, fan_out=provider.fan_out, batch_key=key))
+        return jobs
+
+    def reject(self, job: FetchJob) -> None:
+        """Stop batching a group after the provider refused the combined request."""
+        if job.batch_key is not None:
+            self.rejected.add(job.batch_key)
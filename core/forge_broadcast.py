@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+import json
+import secrets
+import threading
+import time
+from typing import Any
+
+from core.forge_delta import frame_diff
+from core.forge_metrics import METRICS
+
+
+@dataclass(frozen=True)
+class PublishedFrame:
+    """One published frame, serialized once in every shape a client can ask for."""
+
+    stream: str
+    seq: int
+    payload: str
+    # JSON array of patch ops from seq - 1, or None when no base exists or the patch is not smaller
+    ops: str | None
+
+    @property
+    def snapshot(self) -> str:
+        return f'{{"type":"snapshot","stream":"{self.stream}","seq":{self.seq},"frame":{self.payload}}}'
+
+    @property
+    def delta(self) -> str:
+        return f'{{"type":"delta","stream":"{self.stream}","seq":{self.seq},"base":{self.seq - 1},"ops":{self.ops}}}'
+
+
+class FrameHub:
+    """Publish-once fan-out of frames to WebSocket clients.
+
+    ``publish`` (callable from any thread) serializes a frame once and hands the same string to every
+    subscriber's bounded queue on the event loop. When a slow client's queue is full its oldest frame is
+    dropped, so a lagging phone gets the newest state instead of a growing backlog. ``serve`` runs one
+    connection: the latest frame on connect, then queued frames, and a heartbeat message after
+    ``heartbeat_s`` of silence so proxies and mobile radios keep idle connections open.
+
+    Frames are numbered by ``seq``. Delta clients get one ``snapshot`` and then ``delta`` messages holding
+    the JSON-patch ops from ``base`` to ``seq``; a dropped frame, or a ``{"type": "resync"}`` message from the
+    client, turns the next message into a snapshot again. The last ``history`` patches are kept so polling
+    clients can catch up with ``since``. ``seq`` restarts with the process, so every message also carries
+    this hub's random ``stream_id``; a base from another stream is answered with a snapshot.
+    """
+
+    def __init__(self, queue_size: int = 4, heartbeat_s: float = 20.0, history: int = 32):
+        self.queue_size = max(1, queue_size)
+        self.heartbeat_s = max(1.0, heartbeat_s)
+        self.stream_id = secrets.token_hex(6)
+        self.sequence = 0
+        self.latest: str | None = None
+        self.stats = {"published": 0, "dropped": 0, "heartbeats": 0, "snapshot_bytes": 0, "delta_bytes": 0}
+        self._history: deque[PublishedFrame] = deque(maxlen=max(1, history))
+        self._doc: Any = None
+        self._subscribers: set[asyncio.Queue[PublishedFrame]] = set()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def clients(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, frame: dict[str, Any]) -> int:
+        payload = json.dumps(frame, separators=(",", ":"))
+        # diff the decoded payload so the patch reproduces exactly what snapshot clients receive
+        doc = json.loads(payload)
+        with self._lock:
+            ops = None
+            if self._doc is not None:
+                encoded = json.dumps(frame_diff(self._doc, doc), separators=(",", ":"))
+                ops = encoded if len(encoded) < len(payload) else None
+            self.sequence += 1
+            self.latest = payload
+            self._doc = doc
+            item = PublishedFrame(self.stream_id, self.sequence, payload, ops)
+            self._history.append(item)
+            self.stats["published"] += 1
+            self.stats["snapshot_bytes"] = len(payload)
+            self.stats["delta_bytes"] = len(ops) if ops is not None else len(payload)
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._fan_out, item)
+        return item.seq
+
+    def since(self, seq: int, stream: str = "") -> str:
+        """Message that brings a client at ``seq`` of ``stream`` to the latest frame: chained deltas when
+        the history still covers the gap, otherwise a snapshot (always one for a different stream)."""
+        with self._lock:
+            history = list(self._history)
+        if not history:
+            return f'{{"type":"snapshot","stream":"{self.stream_id}","seq":0,"frame":null}}'
+        latest = history[-1]
+        if stream != self.stream_id:
+            return latest.snapshot
+        if seq == latest.seq:
+            return f'{{"type":"delta","stream":"{self.stream_id}","seq":{seq},"base":{seq},"ops":[]}}'
+        chain = [item for item in history if item.seq > seq]
+        if seq <= 0 or seq > latest.seq or chain[0].seq != seq + 1 or any(item.ops is None for item in chain):
+            return latest.snapshot
+        if len(chain) == 1:
+            return latest.delta
+        ops = ",".join(item.ops[1:-1] for item in chain if item.ops != "[]")
+        return f'{{"type":"delta","stream":"{self.stream_id}","seq":{latest.seq},"base":{seq},"ops":[{ops}]}}'
+
+    def _enqueue(self, queue: asyncio.Queue[PublishedFrame], item: PublishedFrame) -> None:
+        if queue.full():
+            queue.get_nowait()
+            self.stats["dropped"] += 1
+            METRICS.inc("forge_ws_dropped_frames_total", help_text="Stale frames dropped for slow WebSocket clients")
+        queue.put_nowait(item)
+
+    def _fan_out(self, item: PublishedFrame) -> None:
+        for queue in list(self._subscribers):
+            self._enqueue(queue, item)
+
+    def _subscribe(self) -> asyncio.Queue[PublishedFrame]:
+        self._loop = asyncio.get_running_loop()
+        queue: asyncio.Queue[PublishedFrame] = asyncio.Queue(maxsize=self.queue_size)
+        with self._lock:
+            if self._history:
+                queue.put_nowait(self._history[-1])
+        self._subscribers.add(queue)
+        METRICS.set("forge_ws_clients", len(self._subscribers), help_text="Connected WebSocket clients")
+        return queue
+
+    def _unsubscribe(self, queue: asyncio.Queue[PublishedFrame]) -> None:
+        self._subscribers.discard(queue)
+        METRICS.set("forge_ws_clients", len(self._subscribers), help_text="Connected WebSocket clients")
+
+    async def _drain(self, websocket: Any, queue: asyncio.Queue[PublishedFrame], state: dict[str, Any]) -> None:
+        # clients may still send the old "next frame please" messages; reading them also surfaces disconnects
+        while True:
+            text = await websocket.receive_text()
+            if state["delta"] and '"resync"' in text:
+                state["synced"] = False
+                with self._lock:
+                    latest = self._history[-1] if self._history else None
+                if latest is not None:
+                    self._enqueue(queue, latest)
+
+    async def serve(self, websocket: Any, delta: bool = False) -> None:
+        """Stream frames to an accepted WebSocket until either side closes it.
+
+        With ``delta`` the client gets snapshot/delta envelopes instead of bare frames."""
+        queue = self._subscribe()
+        state = {"delta": delta, "synced": False}
+        receiver = asyncio.ensure_future(self._drain(websocket, queue, state))
+        last_sent = 0
+        try:
+            while True:
+                getter = asyncio.ensure_future(queue.get())
+                done, _ = await asyncio.wait({getter, receiver}, timeout=self.heartbeat_s, return_when=asyncio.FIRST_COMPLETED)
+                if receiver in done:
+                    getter.cancel()
+                    return
+                if getter not in done:
+                    getter.cancel()
+                    self.stats["heartbeats"] += 1
+                    await websocket.send_text(json.dumps({"type": "heartbeat", "ts": int(time.time()), "seq": self.sequence}))
+                    continue
+                item = getter.result()
+                # a frame published while this client subscribed can arrive twice; send it once
+                if item.seq <= last_sent and (state["synced"] or not delta):
+                    continue
+                if not delta:
+                    text = item.payload
+                elif state["synced"] and item.ops is not None and item.seq - 1 == last_sent:
+                    text = item.delta
+                else:
+                    text = item.snapshot
+                    state["synced"] = True
+                await websocket.send_text(text)
+                last_sent = item.seq
+        except Exception:
+            return
+        finally:
+            receiver.cancel()
+            self._unsubscribe(queue)
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+import time
+from typing import Any, Callable
+
+
+@dataclass
+class CircuitState:
+    state: str = "closed"
+    consecutive_failures: int = 0
+    opened_at: float = 0.0
+    cooldown_s: float = 0.0
+    trips: int = 0
+    skipped: int = 0
+    # half-open: the probe fetch is out and its result has not been recorded yet
+    probing: bool = False
+
+
+class CircuitBreaker:
+    """Per-agent closed/open/half-open breaker for the fetch path.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and the agent is not fetched at
+    all. The cooldown comes from ``predictor`` (``MetacognitiveResilienceOrchestrator.predict``) and is
+    clamped to ``[cooldown_s, max_cooldown_s]``. Once it elapses a single half-open probe decides whether
+    the circuit closes again or re-opens; further calls are refused until that probe is recorded.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        cooldown_s: float = 45.0,
+        max_cooldown_s: float = 300.0,
+        predictor: Callable[[str], dict[str, Any]] | None = None,
+    ):
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown_s = max(0.0, cooldown_s)
+        self.max_cooldown_s = max(self.cooldown_s, max_cooldown_s)
+        self.predictor = predictor
+        self.circuits: dict[str, CircuitState] = {}
+
+    def _circuit(self, name: str) -> CircuitState:
+        return self.circuits.setdefault(name, CircuitState())
+
+    def allow(self, name: str, now: float | None = None) -> bool:
+        circuit = self._circuit(name)
+        if circuit.state == "closed":
+            return True
+        if circuit.state == "open" and (now or time.time()) - circuit.opened_at >= circuit.cooldown_s:
+            circuit.state = "half_open"
+            circuit.probing = True
+            return True
+        circuit.skipped += 1
+        return False
+
+    def record_success(self, name: str) -> None:
+        circuit = self._circuit(name)
+        circuit.state = "closed"
+        circuit.probing = False
+        circuit.consecutive_failures = 0
+        circuit.cooldown_s = 0.0
+
+    def record_failure(self, name: str, source_id: str, now: float | None = None) -> None:
+        circuit = self._circuit(name)
+        circuit.consecutive_failures += 1
+        circuit.probing = False
+        if circuit.state == "half_open" or circuit.consecutive_failures >= self.failure_threshold:
+            predicted = 0.0
+            if self.predictor is not None:
+                predicted = float(self.predictor(source_id).get("predicted_cooldown_s", 0) or 0)
+            circuit.state = "open"
+            circuit.opened_at = now or time.time()
+            circuit.cooldown_s = min(self.max_cooldown_s, max(self.cooldown_s, predicted))
+            circuit.trips += 1
+
+    def snapshot(self, name: str, now: float | None = None) -> dict[str, Any]:
+        circuit = self._circuit(name)
+        remaining = 0.0
+        if circuit.state == "open":
+            remaining = max(0.0, circuit.opened_at + circuit.cooldown_s - (now or time.time()))
+        return {**asdict(circuit), "retry_in_s": round(remaining, 1)}
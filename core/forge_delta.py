@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import copy
+from typing import Any
+
+
+def _pointer(path: str, key: str | int) -> str:
+    return f"{path}/{str(key).replace('~', '~0').replace('/', '~1')}"
+
+
+def _same(old: Any, new: Any) -> bool:
+    # == treats False, 0 and 0.0 as equal, but a JSON client sees false, 0 and 0.0 as different values
+    if type(old) is not type(new):
+        return False
+    if isinstance(old, dict):
+        return old.keys() == new.keys() and all(_same(value, new[key]) for key, value in old.items())
+    if isinstance(old, list):
+        return len(old) == len(new) and all(map(_same, old, new))
+    return old == new
+
+
+def frame_diff(old: Any, new: Any, path: str = "") -> list[dict[str, Any]]:
+    """JSON-patch (RFC 6902 ``add``/``remove``/``replace``) operations turning ``old`` into ``new``.
+
+    Both sides are expected to be JSON-decoded values. Objects are diffed key by key and equal-length arrays
+    element by element; arrays that change length are replaced whole, which keeps the diff linear in the
+    frame size.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops: list[dict[str, Any]] = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": _pointer(path, key)})
+        for key, value in new.items():
+            if key not in old:
+                ops.append({"op": "add", "path": _pointer(path, key), "value": value})
+            elif old[key] != value or not _same(old[key], value):
+                ops.extend(frame_diff(old[key], value, _pointer(path, key)))
+        return ops
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        ops = []
+        for index, (before, after) in enumerate(zip(old, new)):
+            if before != after or not _same(before, after):
+                ops.extend(frame_diff(before, after, _pointer(path, index)))
+        return ops
+    if old == new and _same(old, new):
+        return []
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def apply_patch(doc: Any, ops: list[dict[str, Any]]) -> Any:
+    """Apply operations produced by ``frame_diff`` to a copy of ``doc``."""
+    doc = copy.deepcopy(doc)
+    for op in ops:
+        if op["path"] == "":
+            doc = copy.deepcopy(op["value"])
+            continue
+        *parents, last = [part.replace("~1", "/").replace("~0", "~") for part in op["path"].split("/")[1:]]
+        target = doc
+        for part in parents:
+            target = target[int(part)] if isinstance(target, list) else target[part]
+        key: str | int = int(last) if isinstance(target, list) else last
+        if op["op"] == "remove":
+            del target[key]
+        else:
+            target[key] = copy.deepcopy(op["value"])
+    return doc
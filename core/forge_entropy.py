@@ -1,11 +1,20 @@
 from __future__ import annotations
 
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import importlib.util
 import math
-from collections import Counter
+import multiprocessing
+from multiprocessing import shared_memory
+from typing import Any
 
 import numpy as np
 
+_LN2 = math.log(2)
+# below this many points the fixed cost of the b³ bincount tables outweighs a plain counting loop
+_SMALL_TE_POINTS = 32
+
 
 class EntropySignalEngine:
     """Windowed Shannon entropy + coarse compression helpers."""
@@ -21,15 +30,50 @@ class EntropySignalEngine:
         probs = probs[probs > 0]
         return float(-(probs * np.log2(probs)).sum())
 
+    def _window_entropies(self, windows: np.ndarray) -> np.ndarray:
+        """Row-wise :meth:`shannon_entropy` of a 2-D window matrix.
+
+        Bin indices follow ``np.histogram``'s equal-width rule (index estimate corrected against the
+        ``linspace`` edges), so counts match the per-window loop exactly. Rows are summed in groups of equal
+        non-empty bin count, each as a dense ``(rows, k)`` block of the non-zero terms in bin order, so
+        ``np.sum`` sees the same operands in the same order as ``probs[probs > 0].sum()`` and the entropies are
+        bit-identical.
+        """
+        rows, size = windows.shape
+        b = self.bins
+        if size < 2:
+            return np.zeros(rows)
+        first, last = windows.min(axis=1), windows.max(axis=1)
+        flat = first == last
+        first, last = np.where(flat, first - 0.5, first), np.where(flat, last + 0.5, last)
+        edges = np.linspace(first, last, b + 1, axis=1)
+        idx = (((windows - first[:, None]) / (last - first)[:, None]) * b).astype(np.intp)
+        idx[idx == b] -= 1
+        idx -= windows < np.take_along_axis(edges, idx, axis=1)
+        idx += (windows >= np.take_along_axis(edges, idx + 1, axis=1)) & (idx != b - 1)
+        counts = np.bincount((np.arange(rows)[:, None] * b + idx).ravel(), minlength=rows * b).reshape(rows, b)
+
+        probs = counts / size
+        with np.errstate(divide="ignore", invalid="ignore"):
+            terms = probs * np.log2(probs)
+        occupied = counts > 0
+        nonempty = occupied.sum(axis=1)
+        out = np.empty(rows)
+        for k in np.unique(nonempty):
+            group = np.flatnonzero(nonempty == k)
+            out[group] = -np.sum(terms[group][occupied[group]].reshape(len(group), k), axis=1)
+        return out
+
+    def _windows(self, seq: list[float] | np.ndarray, window: int, stride: int) -> np.ndarray:
+        arr = np.asarray(seq, dtype=float)
+        return np.lib.stride_tricks.sliding_window_view(arr, window)[:: max(1, stride)]
+
     def sliding_entropy(self, seq: list[float], window: int = 1000, stride: int = 50) -> list[float]:
         if len(seq) < 2:
             return []
         if len(seq) <= window:
             return [self.shannon_entropy(seq)]
-        out: list[float] = []
-        for i in range(0, len(seq) - window + 1, max(1, stride)):
-            out.append(self.shannon_entropy(seq[i : i + window]))
-        return out
+        return self._window_entropies(self._windows(seq, window, stride)).tolist()
 
     def bottleneck_compress(self, seq: list[float], out_points: int = 20) -> list[float]:
         if not seq:
@@ -46,10 +90,15 @@ class EntropySignalEngine:
         stride: int = 10,
         entropy_quantile: float = 0.70,
         out_points: int = 20,
+        offset: int = 0,
+        cache: dict[tuple[int, int], float] | None = None,
     ) -> dict[str, list[float] | float]:
         """Filter noisy regions, keep high-entropy signal windows, then compress.
 
         Pipeline: sliding entropy -> threshold gate -> concatenate selected windows -> bottleneck compress.
+        For a rolling series, pass the absolute index of ``seq[0]`` as ``offset`` and keep one ``cache`` per
+        series: window entropies are kept under (absolute start, window) and only windows not seen on an
+        earlier call are computed.
         """
         if not seq:
             return {"filtered": [], "compressed": [], "threshold": 0.0}
@@ -58,89 +107,208 @@ class EntropySignalEngine:
             compressed = self.bottleneck_compress(series, out_points=out_points)
             return {"filtered": series, "compressed": compressed, "threshold": 0.0}
 
-        entropies: list[float] = []
-        windows: list[list[float]] = []
-        step = max(1, stride)
-        for i in range(0, len(series) - window + 1, step):
-            chunk = series[i : i + window]
-            windows.append(chunk)
-            entropies.append(self.shannon_entropy(chunk))
-
-        threshold = float(np.quantile(np.asarray(entropies, dtype=float), min(1.0, max(0.0, entropy_quantile))))
-        selected: list[float] = []
-        for chunk, h in zip(windows, entropies):
-            if h >= threshold:
-                selected.extend(chunk)
+        windows = self._windows(series, window, stride)
+        if cache is None:
+            entropies = np.asarray(self.sliding_entropy(series, window=window, stride=stride), dtype=float)
+        else:
+            for key in [key for key in cache if key[0] < offset or key[1] != window]:
+                del cache[key]
+            starts = [offset + i * max(1, stride) for i in range(len(windows))]
+            missing = [i for i, start in enumerate(starts) if (start, window) not in cache]
+            if missing:
+                for i, h in zip(missing, self._window_entropies(windows[missing]).tolist()):
+                    cache[(starts[i], window)] = h
+            entropies = np.asarray([cache[(start, window)] for start in starts], dtype=float)
+
+        threshold = float(np.quantile(entropies, min(1.0, max(0.0, entropy_quantile))))
+        selected = windows[entropies >= threshold].ravel().tolist()
         if not selected:
             selected = series[-window:]
         compressed = self.bottleneck_compress(selected, out_points=out_points)
         return {"filtered": selected, "compressed": compressed, "threshold": threshold}
 
 
+def _te_rows_worker(
+    shm_name: str, shape: tuple[int, int], dtype: str, bins: int, lag: int, destinations: list[int]
+) -> tuple[list[int], np.ndarray]:
+    """Process-pool task: TE rows for a slice of destinations over digitized series in shared memory."""
+    # spawn workers share the parent's resource tracker, so attaching does not add a second owner
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        stacked = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf).astype(np.int64)
+    finally:
+        shm.close()
+    engine = TransferEntropyEngine(bins=bins, lag=lag)
+    return destinations, np.stack([engine._te_row(stacked, stacked[dst]) for dst in destinations])
+
+
+def _surrogate_rows(
+    bins: int, xt: np.ndarray, yt1: np.ndarray, yt: np.ndarray, surrogates: int, seed: int, max_rows: int = 2048
+) -> tuple[np.ndarray, np.ndarray]:
+    """Observed TE per source row plus how many of ``surrogates`` time-shuffled copies reach it.
+
+    Shuffled copies of all rows are stacked and counted with the same batched bincount as the observed
+    rows, in chunks of at most ``max_rows`` copies. Runs in-process or as a process-pool task.
+    """
+    engine = TransferEntropyEngine(bins=bins)
+    rng = np.random.default_rng(seed)
+    observed = engine._te_aligned(xt, yt1, yt)
+    exceed = np.zeros(len(xt), dtype=np.int64)
+    per_chunk = max(1, max_rows // max(1, surrogates))
+    for start in range(0, len(xt), per_chunk):
+        block = xt[start : start + per_chunk]
+        shuffled = rng.permuted(np.repeat(block, surrogates, axis=0), axis=1)
+        te = engine._te_aligned(shuffled, yt1, yt).reshape(len(block), surrogates)
+        exceed[start : start + per_chunk] = (te >= observed[start : start + per_chunk, None]).sum(axis=1)
+    return observed, exceed
+
+
 class TransferEntropyEngine:
-    """Transfer entropy estimator plus histogram-based mutual information."""
+    """Transfer entropy estimator plus histogram-based mutual information.
 
-    def __init__(self, bins: int = 12, lag: int = 1):
+    With ``workers > 1`` the TE matrix for groups of at least ``parallel_min_agents`` series is split by
+    destination across a process pool; the digitized series are shared with workers through
+    ``multiprocessing.shared_memory``. Smaller groups stay in-process, where IPC would dominate, and so does
+    any group whose pool or shared-memory segment cannot be used.
+    """
+
+    def __init__(self, bins: int = 12, lag: int = 1, workers: int = 0, parallel_min_agents: int = 48):
         self.bins = bins
         self.lag = lag
+        self.workers = max(0, workers)
+        self.parallel_min_agents = max(2, parallel_min_agents)
+        self._pool: ProcessPoolExecutor | None = None
         self._has_scipy = importlib.util.find_spec("scipy") is not None
 
-    def _digitize(self, seq: list[float]) -> list[int]:
-        if not seq:
-            return []
-        lo, hi = min(seq), max(seq)
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _serial_rows(self, stacked: np.ndarray) -> np.ndarray:
+        block = np.zeros((stacked.shape[0], stacked.shape[0]), dtype=float)
+        for pos in range(stacked.shape[0]):
+            block[:, pos] = self._te_row(stacked, stacked[pos])
+        return block
+
+    def _parallel_rows(self, stacked: np.ndarray) -> np.ndarray:
+        k = stacked.shape[0]
+        compact = stacked.astype(np.int16 if self.bins <= np.iinfo(np.int16).max else np.int64)
+        try:
+            shm = shared_memory.SharedMemory(create=True, size=max(1, compact.nbytes))
+        except OSError:
+            # no usable /dev/shm (e.g. some Android builds)
+            return self._serial_rows(stacked)
+        try:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+            np.ndarray(compact.shape, dtype=compact.dtype, buffer=shm.buf)[:] = compact
+            chunks = [list(map(int, part)) for part in np.array_split(np.arange(k), self.workers) if len(part)]
+            futures = [
+                self._pool.submit(_te_rows_worker, shm.name, compact.shape, compact.dtype.str, self.bins, self.lag, chunk)
+                for chunk in chunks
+            ]
+            block = np.zeros((k, k), dtype=float)
+            for future in futures:
+                destinations, rows = future.result()
+                block[:, destinations] = rows.T
+            return block
+        except (BrokenProcessPool, OSError):
+            # a dead worker breaks the whole pool; drop it (the next call starts a fresh one) and finish in-process
+            self.close()
+            return self._serial_rows(stacked)
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def _digitize(self, seq: list[float] | np.ndarray) -> np.ndarray:
+        """Equal-width bin codes over the series' own [min, max] range."""
+        arr = np.asarray(seq, dtype=float)
+        if arr.size == 0:
+            return np.zeros(0, dtype=np.int64)
+        lo, hi = float(arr.min()), float(arr.max())
         if hi == lo:
-            return [0] * len(seq)
+            return np.zeros(arr.size, dtype=np.int64)
         step = (hi - lo) / self.bins
-        return [min(self.bins - 1, max(0, int((v - lo) / step))) for v in seq]
+        return np.clip(((arr - lo) / step).astype(np.int64), 0, self.bins - 1)
+
+    def _mi_from_codes(self, xd: np.ndarray, yd: np.ndarray) -> float:
+        n = min(len(xd), len(yd))
+        b = self.bins
+        pxy = np.bincount(xd[:n] * b + yd[:n], minlength=b * b) / n
+        px = np.bincount(xd[:n], minlength=b) / n
+        py = np.bincount(yd[:n], minlength=b) / n
+        nz = np.nonzero(pxy)[0]
+        joint = pxy[nz]
+        denom = px[nz // b] * py[nz % b]
+        return max(0.0, float(np.sum(joint * np.log2(joint / denom))))
 
     def mutual_information_hist(self, x: list[float], y: list[float]) -> float:
         n = min(len(x), len(y))
         if n < 4:
             return 0.0
-        xd = self._digitize(x[:n])
-        yd = self._digitize(y[:n])
-        px = Counter(xd)
-        py = Counter(yd)
-        pxy = Counter(zip(xd, yd))
-        mi = 0.0
-        for (xi, yi), cxy in pxy.items():
-            pxy_v = cxy / n
-            denom = (px[xi] / n) * (py[yi] / n)
-            if denom <= 0:
-                continue
-            mi += pxy_v * math.log2(pxy_v / denom)
-        return max(0.0, float(mi))
+        return self._mi_from_codes(self._digitize(x[:n]), self._digitize(y[:n]))
 
-    def calculate_transfer_entropy(self, x: list[float], y: list[float], normalized: bool = False) -> float:
-        """Estimate transfer entropy TE(X→Y) = Σ p(y_t+1,y_t,x_t) log2( p(y_t+1|y_t,x_t)/p(y_t+1|y_t) )."""
-        n = min(len(x), len(y))
-        if n < self.lag + 3:
-            return 0.0
-        xd = self._digitize(x[:n])
-        yd = self._digitize(y[:n])
+    def _te_from_codes(self, xd: np.ndarray, yd: np.ndarray) -> float:
+        """TE(X→Y) from bin codes: (y_t+1, y_t, x_t) states are flat indices counted with ``np.bincount``."""
+        n = min(len(xd), len(yd))
+        b = self.bins
+        yt1 = yd[self.lag + 1 : n]
+        yt = yd[self.lag : n - 1]
+        xt = xd[self.lag : n - 1]
+        total = n - self.lag - 1
+
+        c_xyz = np.bincount((yt1 * b + yt) * b + xt, minlength=b**3)
+        c_yz = np.bincount(yt * b + xt, minlength=b * b)
+        c_xy = np.bincount(yt1 * b + yt, minlength=b * b)
+        c_y = np.bincount(yt, minlength=b)
+
+        nz = np.nonzero(c_xyz)[0]
+        s_yt1, s_yt, s_xt = nz // (b * b), (nz // b) % b, nz % b
+        count = c_xyz[nz].astype(float)
+        p_xyz = count / total
+        p_yt1_yt_xt = count / c_yz[s_yt * b + s_xt]
+        p_yt1_yt = c_xy[s_yt1 * b + s_yt] / c_y[s_yt]
+        ratio = p_yt1_yt_xt / np.maximum(p_yt1_yt, 1e-12)
+        return max(0.0, float(np.sum(p_xyz * (np.log(ratio + 1e-12) / _LN2))))
+
+    def _te_small(self, x: list[float], y: list[float]) -> float:
+        """Same estimate as ``_te_from_codes`` with dict counts, for series shorter than ``_SMALL_TE_POINTS``."""
 
+        def digitize(seq: list[float]) -> list[int]:
+            lo, hi = min(seq), max(seq)
+            if hi == lo:
+                return [0] * len(seq)
+            step = (hi - lo) / self.bins
+            return [min(self.bins - 1, max(0, int((v - lo) / step))) for v in seq]
+
+        xd, yd = digitize(x), digitize(y)
         c_xyz: dict[tuple[int, int, int], int] = {}
         c_yz: dict[tuple[int, int], int] = {}
         c_xy: dict[tuple[int, int], int] = {}
         c_y: dict[int, int] = {}
-
-        for t in range(self.lag, n - 1):
+        for t in range(self.lag, len(yd) - 1):
             yt1, yt, xt = yd[t + 1], yd[t], xd[t]
             c_xyz[(yt1, yt, xt)] = c_xyz.get((yt1, yt, xt), 0) + 1
             c_yz[(yt, xt)] = c_yz.get((yt, xt), 0) + 1
             c_xy[(yt1, yt)] = c_xy.get((yt1, yt), 0) + 1
             c_y[yt] = c_y.get(yt, 0) + 1
-
-        total = n - self.lag - 1
+        total = len(yd) - self.lag - 1
         te = 0.0
         for (yt1, yt, xt), count in c_xyz.items():
-            p_xyz = count / total
-            p_yt1_yt_xt = count / c_yz[(yt, xt)]
-            p_yt1_yt = c_xy[(yt1, yt)] / c_y[yt]
-            ratio = p_yt1_yt_xt / max(p_yt1_yt, 1e-12)
-            te += p_xyz * math.log(ratio + 1e-12, 2)
-        te = max(0.0, te)
+            ratio = (count / c_yz[(yt, xt)]) / max(c_xy[(yt1, yt)] / c_y[yt], 1e-12)
+            te += (count / total) * (math.log(ratio + 1e-12) / _LN2)
+        return max(0.0, te)
+
+    def calculate_transfer_entropy(self, x: list[float], y: list[float], normalized: bool = False) -> float:
+        """Estimate transfer entropy TE(X→Y) = Σ p(y_t+1,y_t,x_t) log2( p(y_t+1|y_t,x_t)/p(y_t+1|y_t) )."""
+        n = min(len(x), len(y))
+        if n < self.lag + 3:
+            return 0.0
+        if n < _SMALL_TE_POINTS:
+            te = self._te_small([float(v) for v in x[:n]], [float(v) for v in y[:n]])
+        else:
+            te = self._te_from_codes(self._digitize(x[:n]), self._digitize(y[:n]))
         if normalized:
             h_y = self.mutual_information_hist(y[:-1], y[1:]) if len(y) > 1 else 0.0
             if h_y > 1e-12:
@@ -150,11 +318,517 @@ class TransferEntropyEngine:
     def score(self, x: list[float], y: list[float]) -> float:
         return self.calculate_transfer_entropy(x, y)
 
-    def correlation_graph(self, series_by_agent: dict[str, list[float]]) -> dict[str, float]:
+    def _te_row(self, x_codes: np.ndarray, yd: np.ndarray) -> np.ndarray:
+        """TE(X_s→Y) for every row s of ``x_codes`` against one destination in a single bincount pass."""
+        n = x_codes.shape[1]
+        return self._te_aligned(x_codes[:, self.lag : n - 1], yd[self.lag + 1 : n], yd[self.lag : n - 1])
+
+    def _te_aligned(self, xt: np.ndarray, yt1: np.ndarray, yt: np.ndarray) -> np.ndarray:
+        """TE for each row of source codes ``xt`` already aligned with the destination states (y_t+1, y_t).
+
+        The destination-only tables (y_t+1, y_t) and (y_t) are built once and shared by all rows.
+        """
+        k, total = xt.shape
+        b = self.bins
+        offsets = np.arange(k)[:, None]
+
+        c_xy = np.bincount(yt1 * b + yt, minlength=b * b)
+        c_y = np.bincount(yt, minlength=b)
+        c_xyz = np.bincount((offsets * b**3 + (yt1 * b + yt) * b + xt).ravel(), minlength=k * b**3).reshape(k, b**3)
+        c_yz = np.bincount((offsets * b * b + yt * b + xt).ravel(), minlength=k * b * b).reshape(k, b * b)
+
+        rows, cols = np.nonzero(c_xyz)
+        s_yt1, s_yt, s_xt = cols // (b * b), (cols // b) % b, cols % b
+        count = c_xyz[rows, cols].astype(float)
+        p_yt1_yt_xt = count / c_yz[rows, s_yt * b + s_xt]
+        p_yt1_yt = c_xy[s_yt1 * b + s_yt] / c_y[s_yt]
+        terms = (count / total) * (np.log(p_yt1_yt_xt / np.maximum(p_yt1_yt, 1e-12) + 1e-12) / _LN2)
+        return np.maximum(0.0, np.bincount(rows, weights=terms, minlength=k))
+
+    def lag_scan(
+        self,
+        series_by_agent: dict[str, list[float]],
+        max_lag: int,
+        pairs: set[tuple[str, str]] | None = None,
+    ) -> dict[str, dict[str, float | int]]:
+        """Best source delay per directed edge: TE(X→Y) for lags 1..max_lag, keeping the argmax.
+
+        Lag ℓ pairs (y_t+1, y_t) with x_t+1-ℓ, so ℓ = 1 is the alignment of :meth:`calculate_transfer_entropy`.
+        All lags share the sample range t ∈ [max_lag, n-2] so their values are comparable. Each series is
+        digitized once; per destination the (y_t+1, y_t) tables are built once and every (source, lag) row is
+        counted in the same bincount. ``pairs`` limits the scan to given (src, dst) edges.
+        """
+        max_lag = max(1, max_lag)
+        names = list(series_by_agent.keys())
+        codes = [self._digitize(series_by_agent[name]) for name in names]
+        lags = np.arange(1, max_lag + 1)
+        result: dict[str, dict[str, float | int]] = {}
+
+        for j, dst in enumerate(names):
+            by_length: dict[int, list[tuple[int, np.ndarray]]] = {}
+            for i, src in enumerate(names):
+                if i == j or (pairs is not None and (src, dst) not in pairs):
+                    continue
+                n = min(len(codes[i]), len(codes[j]))
+                if n - 1 - max_lag < 2:
+                    continue
+                xd = codes[i] if len(codes[i]) == n else self._digitize(series_by_agent[src][:n])
+                by_length.setdefault(n, []).append((i, xd))
+            for n, sources in by_length.items():
+                yd = codes[j] if len(codes[j]) == n else self._digitize(series_by_agent[dst][:n])
+                xt = np.stack([xd[max_lag + 1 - lag : n - lag] for _, xd in sources for lag in lags])
+                te = self._te_aligned(xt, yd[max_lag + 1 : n], yd[max_lag : n - 1]).reshape(len(sources), max_lag)
+                best = te.argmax(axis=1)
+                for row, (i, _) in enumerate(sources):
+                    result[f"{names[i]}->{dst}"] = {"lag": int(lags[best[row]]), "te": float(te[row, best[row]])}
+        return result
+
+    def surrogate_test(
+        self,
+        series_by_agent: dict[str, list[float]],
+        pairs: set[tuple[str, str]] | None = None,
+        surrogates: int = 100,
+        seed: int | None = None,
+    ) -> dict[str, dict[str, float]]:
+        """Permutation p-value per directed edge: TE against ``surrogates`` time-shuffled copies of the source.
+
+        ``p = (1 + #{surrogate TE >= observed TE}) / (surrogates + 1)``. Per destination all sources and their
+        shuffles go through one batched bincount; destinations run on the process pool under the same
+        ``workers`` / ``parallel_min_agents`` rule as :meth:`transfer_entropy_matrix`.
+        """
+        surrogates = max(1, surrogates)
+        names = list(series_by_agent.keys())
+        codes = [self._digitize(series_by_agent[name]) for name in names]
+        rng = np.random.default_rng(seed)
+        tasks: list[tuple[str, list[int], tuple]] = []
+        for j, dst in enumerate(names):
+            by_length: dict[int, list[tuple[int, np.ndarray]]] = {}
+            for i, src in enumerate(names):
+                if i == j or (pairs is not None and (src, dst) not in pairs):
+                    continue
+                n = min(len(codes[i]), len(codes[j]))
+                if n < self.lag + 3:
+                    continue
+                xd = codes[i] if len(codes[i]) == n else self._digitize(series_by_agent[src][:n])
+                by_length.setdefault(n, []).append((i, xd))
+            for n, sources in by_length.items():
+                yd = codes[j] if len(codes[j]) == n else self._digitize(series_by_agent[dst][:n])
+                xt = np.stack([xd[self.lag : n - 1] for _, xd in sources])
+                args = (self.bins, xt, yd[self.lag + 1 : n], yd[self.lag : n - 1], surrogates, int(rng.integers(2**63)))
+                tasks.append((dst, [i for i, _ in sources], args))
+
+        outcomes = None
+        if self.workers > 1 and len(names) >= self.parallel_min_agents and len(tasks) > 1:
+            try:
+                if self._pool is None:
+                    self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+                outcomes = [future.result() for future in [self._pool.submit(_surrogate_rows, *args) for _, _, args in tasks]]
+            except (BrokenProcessPool, OSError):
+                # same recovery as _parallel_rows: drop the broken pool and finish in-process
+                self.close()
+        if outcomes is None:
+            outcomes = [_surrogate_rows(*args) for _, _, args in tasks]
+
+        result: dict[str, dict[str, float]] = {}
+        for (dst, sources, _), (observed, exceed) in zip(tasks, outcomes):
+            for row, i in enumerate(sources):
+                result[f"{names[i]}->{dst}"] = {
+                    "te": float(observed[row]),
+                    "p_value": float((1 + exceed[row]) / (surrogates + 1)),
+                }
+        return result
+
+    def transfer_entropy_matrix(self, series_by_agent: dict[str, list[float]]) -> tuple[list[str], np.ndarray]:
+        """Full directed matrix ``M[i, j] = TE(names[i] → names[j])``.
+
+        Every series is digitized once per call. Series of equal length are evaluated in one batched
+        pass per destination; pairs of differing length fall back to the pairwise estimator, which
+        truncates both to the shorter length exactly like ``calculate_transfer_entropy``.
+        """
         names = list(series_by_agent.keys())
-        graph: dict[str, float] = {}
-        for i, src in enumerate(names):
-            for dst in names[i + 1 :]:
-                score = self.score(series_by_agent[src], series_by_agent[dst])
-                graph[f"{src}->{dst}"] = score
-        return graph
+        size = len(names)
+        matrix = np.zeros((size, size), dtype=float)
+        codes = [self._digitize(series_by_agent[name]) for name in names]
+        lengths = np.asarray([len(c) for c in codes])
+
+        for length in np.unique(lengths):
+            if length < self.lag + 3:
+                continue
+            members = np.nonzero(lengths == length)[0]
+            if len(members) < 2:
+                continue
+            stacked = np.stack([codes[i] for i in members])
+            if self.workers > 1 and len(members) >= self.parallel_min_agents:
+                matrix[np.ix_(members, members)] = self._parallel_rows(stacked)
+            else:
+                matrix[np.ix_(members, members)] = self._serial_rows(stacked)
+            matrix[members, members] = 0.0
+
+        for i in range(size):
+            for j in range(size):
+                if i != j and lengths[i] != lengths[j]:
+                    matrix[i, j] = self.calculate_transfer_entropy(series_by_agent[names[i]], series_by_agent[names[j]])
+        return names, matrix
+
+    def _mi_row(self, x_codes: np.ndarray, yd: np.ndarray) -> np.ndarray:
+        """MI(X_s; Y) for every row s of ``x_codes`` in one bincount pass (same estimate as ``_mi_from_codes``)."""
+        k, n = x_codes.shape
+        b = self.bins
+        offsets = np.arange(k)[:, None]
+        c_xy = np.bincount((offsets * b * b + x_codes * b + yd).ravel(), minlength=k * b * b).reshape(k, b * b)
+        px = np.bincount((offsets * b + x_codes).ravel(), minlength=k * b).reshape(k, b) / n
+        py = np.bincount(yd, minlength=b) / n
+        rows, cols = np.nonzero(c_xy)
+        joint = c_xy[rows, cols] / n
+        terms = joint * np.log2(joint / (px[rows, cols // b] * py[cols % b]))
+        return np.maximum(0.0, np.bincount(rows, weights=terms, minlength=k))
+
+    def sparse_transfer_entropy(
+        self,
+        series_by_agent: dict[str, list[float]],
+        top_k: int = 5,
+        mi_threshold: float = 0.0,
+        candidates: int = 16,
+    ) -> dict[str, Any]:
+        """Two-stage TE graph: MI screening, then full TE on survivors, keeping the top-k sources per destination.
+
+        Stage one drops every source whose MI with the destination is below ``mi_threshold`` and keeps at most
+        ``candidates`` sources (highest MI) per destination, so stage two evaluates O(N·candidates) pairs
+        instead of N². Returns the sparse edge list (strongest first) plus pair counters.
+        """
+        names = list(series_by_agent.keys())
+        size = len(names)
+        codes = [self._digitize(series_by_agent[name]) for name in names]
+        lengths = np.asarray([len(c) for c in codes])
+        top_k = max(1, top_k)
+        candidates = max(top_k, candidates)
+        edges: list[dict[str, Any]] = []
+        evaluated = 0
+
+        for dst in range(size):
+            if lengths[dst] < self.lag + 3:
+                continue
+            peers = np.asarray([i for i in range(size) if i != dst and lengths[i] >= self.lag + 3], dtype=np.int64)
+            if peers.size == 0:
+                continue
+            same = peers[lengths[peers] == lengths[dst]]
+            mi = np.zeros(size, dtype=float)
+            if same.size:
+                mi[same] = self._mi_row(np.stack([codes[i] for i in same]), codes[dst])
+            for i in peers[lengths[peers] != lengths[dst]]:
+                mi[i] = self.mutual_information_hist(series_by_agent[names[i]], series_by_agent[names[dst]])
+            survivors = peers[mi[peers] >= mi_threshold]
+            survivors = survivors[np.argsort(-mi[survivors], kind="stable")[:candidates]]
+            if survivors.size == 0:
+                continue
+            evaluated += int(survivors.size)
+
+            te = np.zeros(size, dtype=float)
+            same = survivors[lengths[survivors] == lengths[dst]]
+            if same.size:
+                te[same] = self._te_row(np.stack([codes[i] for i in same]), codes[dst])
+            for i in survivors[lengths[survivors] != lengths[dst]]:
+                te[i] = self.calculate_transfer_entropy(series_by_agent[names[i]], series_by_agent[names[dst]])
+            for i in survivors[np.argsort(-te[survivors], kind="stable")[:top_k]]:
+                edges.append({"src": names[i], "dst": names[dst], "te": float(te[i]), "mi": float(mi[i])})
+
+        edges.sort(key=lambda edge: edge["te"], reverse=True)
+        total = size * (size - 1)
+        return {"edges": edges, "pairs_total": total, "pairs_evaluated": evaluated, "pairs_pruned": total - evaluated}
+
+    @staticmethod
+    def graph_from_matrix(names: list[str], matrix: np.ndarray) -> dict[str, float]:
+        return {f"{src}->{dst}": float(matrix[i, j]) for i, src in enumerate(names) for j, dst in enumerate(names) if i != j}
+
+    def correlation_graph(self, series_by_agent: dict[str, list[float]]) -> dict[str, float]:
+        """Directed ``"src->dst"`` view of :meth:`transfer_entropy_matrix` (both directions per pair)."""
+        names, matrix = self.transfer_entropy_matrix(series_by_agent)
+        return self.graph_from_matrix(names, matrix)
+
+
+def _xlogx(values: np.ndarray) -> np.ndarray:
+    """Elementwise n·ln n with 0·ln 0 = 0."""
+    return values * np.log(values, out=np.zeros_like(values), where=values > 0)
+
+
+class OnlineTransferEntropy:
+    """Streaming TE(X→Y) for every agent pair from count tables updated once per tick; without ``decay`` it
+    matches :class:`TransferEntropyEngine` on the last ``window`` ticks and the same bin codes."""
+
+    def __init__(
+        self,
+        bins: int = 12,
+        lag: int = 1,
+        window: int = 120,
+        decay: float = 0.0,
+        warmup: int = 8,
+        margin: float = 0.1,
+        refit_ratio: float = 0.2,
+    ):
+        self.bins = bins
+        self.lag = max(0, lag)
+        self.window = max(self.lag + 3, window)
+        self.decay = min(max(0.0, decay), 0.999)
+        self.warmup = max(2, warmup)
+        self.margin = max(0.0, margin)
+        self.refit_ratio = refit_ratio
+        # code columns per agent: the window plus the tick before it, whose state is the one evicted next
+        self._span = self.window + 1
+        self.names: list[str] = []
+        self._slot: dict[str, int] = {}
+        self._edges: dict[str, tuple[float, float]] = {}
+        self._samples: dict[str, int] = {}
+        self._clipped: dict[str, int] = {}
+        # +1 / -1: side the agent's values last escaped its edges on
+        self._escape: dict[str, int] = {}
+        self._pending_refit: set[str] = set()
+        self._last_refit_tick = 0
+        self._history: deque[dict[str, float]] = deque(maxlen=self.window)
+        self._tick = 0
+        self.stats = {"updates": 0, "rebuilds": 0, "refits": 0}
+        self._reset_tables()
+
+    def _reset_tables(self) -> None:
+        size, b = len(self.names), self.bins
+        # bin code of every agent per tick (column tick % span), -1 when it did not report
+        self._codes = np.full((size, self._span), -1, dtype=np.int64)
+        self._seen = np.zeros((size, size), dtype=np.int64)
+        self._fill = np.zeros((size, size), dtype=np.int64)
+        self._c_xyz = np.zeros((size, size, b**3))
+        self._c_yz = np.zeros((size, size, b * b))
+        self._c_xy = np.zeros((size, size, b * b))
+        self._c_y = np.zeros((size, size, b))
+        self._total = np.zeros((size, size))
+        # Σ n·ln n per pair of c_xyz, c_yz, c_xy and c_y, kept in step with the counts
+        self._s_xyz = np.zeros((size, size))
+        self._s_yz = np.zeros((size, size))
+        self._s_xy = np.zeros((size, size))
+        self._s_y = np.zeros((size, size))
+        self._weight = 1.0
+
+    def _fit(self, name: str) -> bool:
+        values = [tick[name] for tick in self._history if name in tick]
+        if len(values) < self.warmup:
+            return False
+        lo, hi = min(values), max(values)
+        span = (hi - lo) or max(abs(hi) * 1e-3, 1e-9)
+        escape = self._escape.pop(name, 0)
+        below = max(self.margin, 0.5) if escape < 0 else self.margin
+        above = max(self.margin, 0.5) if escape > 0 else self.margin
+        lo, hi = lo - below * span, hi + above * span
+        self._edges[name] = (lo, (hi - lo) / self.bins)
+        self._samples[name] = 0
+        self._clipped[name] = 0
+        return True
+
+    def update(self, values: dict[str, float]) -> None:
+        """Feed one tick of fresh values (agents missing from ``values`` did not report this tick).
+
+        Agents are binned with edges fitted on their first ``warmup`` samples and refitted, with headroom on
+        the side the values escaped, once more than ``refit_ratio`` of their samples were clipped. Refits are
+        batched to at most one per quarter window and replay the pairs touching the refitted agents.
+        """
+        values = {name: float(v) for name, v in values.items() if math.isfinite(float(v))}
+        self._history.append(values)
+        self._tick += 1
+        grown = False
+        refitted: list[str] = []
+        for name, value in values.items():
+            if name not in self._slot:
+                self._slot[name] = len(self.names)
+                self.names.append(name)
+                grown = True
+            edges = self._edges.get(name)
+            if edges is None:
+                if self._fit(name):
+                    refitted.append(name)
+                continue
+            lo, step = edges
+            self._samples[name] += 1
+            if not lo <= value <= lo + step * self.bins:
+                self._clipped[name] += 1
+                self._escape[name] = 1 if value > lo else -1
+            settled = self._samples[name] >= max(self.warmup, len(self._history) // 2)
+            if settled and self._clipped[name] > self.refit_ratio * self._samples[name]:
+                self._pending_refit.add(name)
+        # refits replay history: batch them, at most one replay per quarter window
+        if self._pending_refit and self._tick - self._last_refit_tick >= max(1, self.window // 4):
+            for name in sorted(self._pending_refit):
+                self._fit(name)
+                self.stats["refits"] += 1
+                refitted.append(name)
+            self._pending_refit.clear()
+            self._last_refit_tick = self._tick
+        if grown:
+            self._reset_tables()
+            self._replay()
+        else:
+            self._codes[:, self._tick % self._span] = self._encode(values)
+            if refitted:
+                self._replay([self._slot[name] for name in refitted])
+            else:
+                self._step(self._tick)
+        self.stats["updates"] += 1
+
+    def _encode(self, values: dict[str, float]) -> np.ndarray:
+        b = self.bins
+        codes = np.full(len(self.names), -1, dtype=np.int64)
+        for name, value in values.items():
+            edges = self._edges.get(name)
+            if edges is not None:
+                codes[self._slot[name]] = min(b - 1, max(0, int((value - edges[0]) / edges[1])))
+        return codes
+
+    def _recode(self, slots: list[int] | None = None) -> None:
+        """Re-encode the retained ticks with the current edges, for every agent or only ``slots``."""
+        fresh = np.full((len(self.names), self._span), -1, dtype=np.int64)
+        first = self._tick - len(self._history) + 1
+        for age, tick in enumerate(self._history):
+            fresh[:, (first + age) % self._span] = self._encode(tick)
+        if slots is None:
+            self._codes = fresh
+        else:
+            self._codes[slots] = fresh[slots]
+
+    def _replay(self, slots: list[int] | None = None) -> None:
+        """Rebuild the tables from the retained ticks, either entirely or only for pairs touching ``slots``."""
+        self.stats["rebuilds"] += 1
+        ticks = len(self._history)
+        first = self._tick - ticks + 1
+        if slots is None:
+            self._recode()
+            for age in range(ticks):
+                self._add(first + age)
+            return
+        touched = np.zeros(len(self.names), dtype=bool)
+        touched[slots] = True
+        pairs = touched[:, None] | touched[None, :]
+        # untouched pairs still take the live step for the newest tick
+        self._step(self._tick, pairs=~pairs)
+        # the tick before the window is blank for touched agents, so their replay starts without a state
+        self._recode(slots)
+        for table in (self._seen, self._fill, *self._count_tables()):
+            table[pairs] = 0
+        for age in range(ticks):
+            # decayed weights consistent with the live scale, without advancing it
+            weight = self._weight * (1.0 - self.decay) ** (ticks - 1 - age) if self.decay else 1.0
+            self._add(first + age, pairs=pairs, weight=weight)
+
+    def _count_tables(self) -> tuple[np.ndarray, ...]:
+        counts = (self._c_xyz, self._c_yz, self._c_xy, self._c_y, self._total)
+        return counts + (self._s_xyz, self._s_yz, self._s_xy, self._s_y)
+
+    def _apply(self, src: np.ndarray, dst: np.ndarray, states: np.ndarray, weight: float) -> None:
+        """Add ``weight`` to one state per (src, dst) pair; pairs are unique within a call."""
+        b = self.bins
+        yt1, yt, xt = states // (b * b), (states // b) % b, states % b
+        for counts, terms, index in (
+            (self._c_xyz, self._s_xyz, states),
+            (self._c_yz, self._s_yz, yt * b + xt),
+            (self._c_xy, self._s_xy, yt1 * b + yt),
+            (self._c_y, self._s_y, yt),
+        ):
+            before = counts[src, dst, index]
+            after = before + weight
+            counts[src, dst, index] = after
+            terms[src, dst] += _xlogx(after) - _xlogx(before)
+        self._total[src, dst] += weight
+
+    def _states(self, tick: int) -> tuple[np.ndarray, np.ndarray]:
+        """Validity mask and (y_t+1, y_t, x_t) state code of every pair at ``tick``."""
+        b = self.bins
+        cur = self._codes[:, tick % self._span]
+        prev = self._codes[:, (tick - 1) % self._span]
+        # the destination reported on this and the previous tick, the source on the previous one
+        valid = (prev[:, None] >= 0) & (prev[None, :] >= 0) & (cur[None, :] >= 0)
+        np.fill_diagonal(valid, False)
+        return valid, (cur[None, :] * b + prev[None, :]) * b + prev[:, None]
+
+    def _expire(self, tick: int, pairs: np.ndarray | None) -> None:
+        """Drop each pair's state leaving the window; the oldest ``lag`` retained states are never counted,
+        so the one that joins them is taken out of the counts."""
+        oldest = tick - self.window + 1
+        if oldest < 2:
+            return
+        valid, _ = self._states(oldest)
+        if pairs is not None:
+            valid &= pairs
+        src, dst = np.nonzero(valid)
+        counted = self._fill[src, dst] > self.lag
+        cs, cd = src[counted], dst[counted]
+        stamp = np.full(cs.size, oldest)
+        remaining = np.full(cs.size, self.lag)
+        at = oldest
+        while (remaining > 0).any() and at < tick:
+            at += 1
+            valid, _ = self._states(at)
+            hit = (remaining > 0) & valid[cs, cd]
+            remaining[hit] -= 1
+            stamp[hit & (remaining == 0)] = at
+        if cs.size:
+            prev = self._codes[:, (stamp - 1) % self._span]
+            cur = self._codes[cd, stamp % self._span]
+            columns = np.arange(cs.size)
+            states = (cur * self.bins + prev[cd, columns]) * self.bins + prev[cs, columns]
+            self._apply(cs, cd, states, -1.0)
+        self._fill[src, dst] -= 1
+
+    def _step(self, tick: int, pairs: np.ndarray | None = None) -> None:
+        if not self.decay:
+            self._expire(tick, pairs)
+        self._add(tick, pairs)
+
+    def _add(self, tick: int, pairs: np.ndarray | None = None, weight: float | None = None) -> None:
+        valid, states = self._states(tick)
+        if pairs is not None:
+            valid &= pairs
+        src, dst = np.nonzero(valid)
+        if src.size == 0:
+            return
+        states = states[src, dst]
+
+        if not self.decay:
+            self._fill[src, dst] += 1
+            counted = self._fill[src, dst] > self.lag
+            self._apply(src[counted], dst[counted], states[counted], 1.0)
+            return
+
+        # decayed pairs skip only the first ``lag`` states they ever see
+        self._seen[src, dst] += 1
+        keep = self._seen[src, dst] > self.lag
+        src, dst, states = src[keep], dst[keep], states[keep]
+        if weight is None:
+            self._weight /= 1.0 - self.decay
+            weight = self._weight
+        self._fill[src, dst] += 1
+        self._apply(src, dst, states, weight)
+        if self._weight > 1e12:
+            scale = self._weight
+            for table in (self._c_xyz, self._c_yz, self._c_xy, self._c_y, self._total):
+                table /= scale
+            # Σ (n/w)·ln(n/w) = Σ n·ln n / w − (Σ n / w)·ln w, and every table sums to the pair's total
+            for terms in (self._s_xyz, self._s_yz, self._s_xy, self._s_y):
+                terms /= scale
+                terms -= self._total * math.log(scale)
+            self._weight = 1.0
+
+    def matrix(self) -> tuple[list[str], np.ndarray]:
+        """``M[i, j] = TE(names[i] → names[j])`` from the per-pair Σ n·ln n terms, O(N²)."""
+        total = self._total
+        with np.errstate(divide="ignore", invalid="ignore"):
+            te = (self._s_xyz - self._s_yz - self._s_xy + self._s_y) / (total * _LN2)
+        matrix = np.maximum(0.0, np.where(total > 0, te, 0.0))
+        counted = self._fill if self.decay else self._fill - self.lag
+        matrix[counted < 2] = 0.0
+        return list(self.names), matrix
+
+    def snapshot(self) -> dict[str, Any]:
+        size = len(self.names)
+        return {
+            "agents": size,
+            "pairs": size * (size - 1),
+            "window": self.window,
+            "decay": self.decay,
+            "fitted_agents": len(self._edges),
+            **self.stats,
+        }
@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import base64
+import http.client
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import OrderedDict, defaultdict
+from email.message import Message
+
+from core.forge_parsers import DEFAULT_MAX_BODY_BYTES, BodyTooLarge, read_limited
+
+_RETRYABLE = (http.client.RemoteDisconnected, http.client.BadStatusLine, BrokenPipeError, ConnectionResetError)
+_REDIRECTS = {301, 302, 303, 307, 308}
+
+
+class HTTPConnectionPool:
+    """Per-host keep-alive connection pool shared by all agents.
+
+    Connections are reused across ticks and agents, evicted after ``idle_timeout_s`` and capped at
+    ``max_per_host`` (idle + in use). Non-2xx responses raise ``urllib.error.HTTPError`` so callers keep
+    the same error handling as with ``urllib.request.urlopen``. Like ``urlopen``, the pool honours
+    ``HTTP_PROXY``/``HTTPS_PROXY``/``NO_PROXY``: plain HTTP goes to the proxy with an absolute URL, HTTPS is
+    tunnelled with ``CONNECT``.
+    """
+
+    def __init__(self, max_per_host: int = 4, idle_timeout_s: float = 60.0, max_redirects: int = 3):
+        self.max_per_host = max(1, max_per_host)
+        self.idle_timeout_s = idle_timeout_s
+        self.max_redirects = max_redirects
+        self._cond = threading.Condition()
+        self._idle: dict[tuple[str, str, int, str], list[tuple[http.client.HTTPConnection, float]]] = defaultdict(list)
+        self._in_use: dict[tuple[str, str, int, str], int] = defaultdict(int)
+        self._stats: dict[str, dict[str, int]] = defaultdict(lambda: {"new": 0, "reused": 0, "evicted": 0, "retried": 0})
+
+    def configure(self, *, max_per_host: int | None = None, idle_timeout_s: float | None = None) -> None:
+        with self._cond:
+            if max_per_host is not None:
+                self.max_per_host = max(1, int(max_per_host))
+            if idle_timeout_s is not None:
+                self.idle_timeout_s = float(idle_timeout_s)
+            self._cond.notify_all()
+
+    @staticmethod
+    def _proxy_for(scheme: str, host: str) -> str:
+        proxy = urllib.request.getproxies().get(scheme, "")
+        if not proxy or urllib.request.proxy_bypass(host):
+            return ""
+        return proxy if "://" in proxy else f"http://{proxy}"
+
+    @staticmethod
+    def _proxy_auth(proxy: urllib.parse.SplitResult) -> dict[str, str]:
+        if proxy.username is None:
+            return {}
+        user = urllib.parse.unquote(proxy.username)
+        password = urllib.parse.unquote(proxy.password or "")
+        token = base64.b64encode(f"{user}:{password}".encode("utf-8")).decode("ascii")
+        return {"Proxy-Authorization": f"Basic {token}"}
+
+    def _evict_idle(self, key: tuple[str, str, int, str], now: float) -> None:
+        keep = []
+        for conn, last_used in self._idle[key]:
+            if now - last_used > self.idle_timeout_s:
+                conn.close()
+                self._stats[key[1]]["evicted"] += 1
+            else:
+                keep.append((conn, last_used))
+        self._idle[key] = keep
+
+    def _acquire(self, key: tuple[str, str, int, str], timeout: float) -> tuple[http.client.HTTPConnection, bool]:
+        scheme, host, port, proxy = key
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                self._evict_idle(key, time.time())
+                if self._idle[key]:
+                    conn, _ = self._idle[key].pop()
+                    self._in_use[key] += 1
+                    self._stats[host]["reused"] += 1
+                    return conn, True
+                if self._in_use[key] < self.max_per_host:
+                    self._in_use[key] += 1
+                    self._stats[host]["new"] += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"no free connection for {host} within {timeout}s")
+                self._cond.wait(remaining)
+        if not proxy:
+            cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            return cls(host, port, timeout=timeout), False
+        via = urllib.parse.urlsplit(proxy)
+        via_port = via.port or (443 if via.scheme == "https" else 80)
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(via.hostname or "", via_port, timeout=timeout)
+            conn.set_tunnel(host, port, headers=self._proxy_auth(via))
+            return conn, False
+        cls = http.client.HTTPSConnection if via.scheme == "https" else http.client.HTTPConnection
+        return cls(via.hostname or "", via_port, timeout=timeout), False
+
+    def _release(self, key: tuple[str, str, int, str], conn: http.client.HTTPConnection, reusable: bool) -> None:
+        with self._cond:
+            self._in_use[key] -= 1
+            if reusable:
+                self._idle[key].append((conn, time.time()))
+            else:
+                conn.close()
+            self._cond.notify()
+
+    def _request_once(self, url: str, headers: dict[str, str], timeout: float, max_bytes: int) -> tuple[int, Message, bytes]:
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme or "http"
+        port = parts.port or (443 if scheme == "https" else 80)
+        proxy = self._proxy_for(scheme, parts.hostname or "")
+        key = (scheme, parts.hostname or "", port, proxy)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        if proxy and scheme != "https":
+            # forward proxy: absolute-form request target, credentials on every request
+            path = urllib.parse.urlunsplit((scheme, parts.netloc, parts.path or "/", parts.query, ""))
+            headers = {**headers, **self._proxy_auth(urllib.parse.urlsplit(proxy))}
+
+        for attempt in range(2):
+            conn, reused = self._acquire(key, timeout)
+            try:
+                conn.timeout = timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                conn.request("GET", path, headers={**headers, "Connection": "keep-alive"})
+                response = conn.getresponse()
+                length = response.getheader("Content-Length")
+                if length and length.isdigit() and int(length) > max_bytes:
+                    raise BodyTooLarge(f"response body of {length} bytes exceeds {max_bytes}")
+                body = read_limited(response, max_bytes)
+            except _RETRYABLE:
+                self._release(key, conn, False)
+                # the server closed an idle keep-alive socket; retry once on a fresh connection
+                if reused and attempt == 0:
+                    with self._cond:
+                        self._stats[key[1]]["retried"] += 1
+                    continue
+                raise
+            except BaseException:
+                self._release(key, conn, False)
+                raise
+            self._release(key, conn, not response.will_close)
+            return response.status, response.headers, body
+        raise ConnectionError(f"connection to {key[1]} failed after retry")
+
+    def get(
+        self,
+        url: str,
+        headers: dict[str, str] | None = None,
+        timeout: float = 6.0,
+        max_bytes: int = DEFAULT_MAX_BODY_BYTES,
+    ) -> tuple[int, Message, bytes]:
+        headers = dict(headers or {})
+        for _ in range(self.max_redirects + 1):
+            status, response_headers, body = self._request_once(url, headers, timeout, max_bytes)
+            location = response_headers.get("Location")
+            if status in _REDIRECTS and location:
+                url = urllib.parse.urljoin(url, location)
+                continue
+            if status >= 400:
+                raise urllib.error.HTTPError(url, status, f"HTTP {status}", response_headers, None)
+            return status, response_headers, body
+        raise urllib.error.HTTPError(url, status, "too many redirects", response_headers, None)
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        with self._cond:
+            out: dict[str, dict[str, int]] = {}
+            for host, counters in self._stats.items():
+                idle = sum(len(conns) for key, conns in self._idle.items() if key[1] == host)
+                out[host] = {**counters, "idle": idle}
+            return out
+
+    def close(self) -> None:
+        with self._cond:
+            for conns in self._idle.values():
+                for conn, _ in conns:
+                    conn.close()
+            self._idle.clear()
+
+
+HTTP_POOL = HTTPConnectionPool()
+
+
+class ResponseCache:
+    """Bounded LRU of response bodies below the agent fetch path.
+
+    Entries younger than the ``source_type`` TTL are served without any request; older entries that carry
+    an ``ETag``/``Last-Modified`` validator are revalidated with a conditional GET (304 keeps the body).
+    """
+
+    def __init__(self, pool: HTTPConnectionPool, max_entries: int = 256, ttl_by_source: dict[str, float] | None = None):
+        self.pool = pool
+        self.max_entries = max(1, max_entries)
+        self.ttl_by_source = dict(ttl_by_source or {})
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "revalidations": 0, "evictions": 0, "bytes_saved": 0}
+
+    def configure(self, *, max_entries: int | None = None, ttl_by_source: dict[str, float] | None = None) -> None:
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max(1, int(max_entries))
+            if ttl_by_source is not None:
+                self.ttl_by_source = {str(k): float(v) for k, v in ttl_by_source.items()}
+            self._trim()
+
+    def ttl_for(self, source_type: str) -> float:
+        return float(self.ttl_by_source.get(source_type, self.ttl_by_source.get("default", 0.0)))
+
+    def _trim(self) -> None:
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def get(
+        self,
+        url: str,
+        headers: dict[str, str] | None = None,
+        timeout: float = 6.0,
+        source_type: str = "",
+        max_bytes: int = DEFAULT_MAX_BODY_BYTES,
+    ) -> bytes:
+        ttl = self.ttl_for(source_type)
+        request_headers = dict(headers or {})
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+                if time.time() - entry["stored_at"] < ttl:
+                    self._stats["hits"] += 1
+                    self._stats["bytes_saved"] += len(entry["body"])
+                    return entry["body"]
+                if entry.get("etag"):
+                    request_headers["If-None-Match"] = entry["etag"]
+                if entry.get("last_modified"):
+                    request_headers["If-Modified-Since"] = entry["last_modified"]
+
+        status, response_headers, body = self.pool.get(url, headers=request_headers, timeout=timeout, max_bytes=max_bytes)
+        with self._lock:
+            if status == 304 and entry is not None:
+                entry["stored_at"] = time.time()
+                self._stats["revalidations"] += 1
+                self._stats["bytes_saved"] += len(entry["body"])
+                return entry["body"]
+            self._stats["misses"] += 1
+            etag = response_headers.get("ETag")
+            last_modified = response_headers.get("Last-Modified")
+            if ttl > 0 or etag or last_modified:
+                self._entries[url] = {"body": body, "etag": etag, "last_modified": last_modified, "stored_at": time.time()}
+                self._entries.move_to_end(url)
+                self._trim()
+            else:
+                self._entries.pop(url, None)
+        return body
+
+    def invalidate(self, url: str) -> None:
+        """Drop an entry whose body turned out to be unusable (e.g. a rate-limit notice)."""
+        with self._lock:
+            self._entries.pop(url, None)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries), "max_entries": self.max_entries}
+
+
+RESPONSE_CACHE = ResponseCache(HTTP_POOL)
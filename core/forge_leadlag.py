@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import numpy as np
+
+
+class LeadLagEngine:
+    """Linear lead–lag detector: FFT cross-correlation of every agent pair's returns.
+
+    Series are reduced to first differences over each pair's common (most recent) overlap and z-scored, so
+    a correlation peak at lag ``k > 0`` means the source's moves are followed ``k`` ticks later by the
+    destination's. Series of equal length share one batched ``rfft``/``irfft`` over their stacked return
+    matrix, O(N·W log W) for the transforms plus O(N²·W) for the spectra products, chunked to bound memory;
+    pairs of differing length are evaluated on their own overlap, so one short newcomer does not shrink the
+    window of every other pair.
+    """
+
+    def __init__(self, max_lag: int = 10, min_points: int = 8, chunk_elements: int = 4_000_000):
+        self.max_lag = max(1, max_lag)
+        self.min_points = max(4, min_points)
+        self.chunk_elements = chunk_elements
+
+    @staticmethod
+    def _returns(levels: np.ndarray) -> np.ndarray:
+        """z-scored first differences of every row of ``levels``."""
+        returns = np.diff(levels, axis=1)
+        returns -= returns.mean(axis=1, keepdims=True)
+        scale = returns.std(axis=1, keepdims=True)
+        return np.divide(returns, scale, out=np.zeros_like(returns), where=scale > 0)
+
+    def _peaks(self, returns: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Peak correlation and its lag for every ordered pair of rows of an equal-width return matrix."""
+        size, width = returns.shape
+        max_lag = min(self.max_lag, width - 2)
+        nfft = 1 << int(2 * width - 1).bit_length()
+        spectra = np.fft.rfft(returns, n=nfft, axis=1)
+        lags = np.concatenate((np.arange(0, max_lag + 1), np.arange(-max_lag, 0)))
+        corr = np.zeros((size, size))
+        best = np.zeros((size, size), dtype=np.int64)
+        rows = max(1, self.chunk_elements // max(1, size * nfft))
+        for start in range(0, size, rows):
+            block = np.conj(spectra[start : start + rows, None, :]) * spectra[None, :, :]
+            # circular index k holds sum_t x_i[t] * x_j[t + k]; negative lags wrap to the end
+            cc = np.fft.irfft(block, n=nfft, axis=2)[:, :, lags] / width
+            peak = np.abs(cc).argmax(axis=2)
+            corr[start : start + rows] = np.take_along_axis(cc, peak[:, :, None], axis=2)[:, :, 0]
+            best[start : start + rows] = lags[peak]
+        return corr, best
+
+    def matrix(self, series_by_agent: dict[str, list[float]]) -> tuple[list[str], np.ndarray, np.ndarray]:
+        """``(names, corr, lag)`` where ``corr[i, j]`` is the peak correlation of i's returns with j's returns
+        ``lag[i, j]`` ticks later (``|lag| <= max_lag``; negative means j leads i)."""
+        names = [name for name, values in series_by_agent.items() if len(values) >= self.min_points]
+        size = len(names)
+        corr = np.zeros((size, size))
+        best = np.zeros((size, size), dtype=np.int64)
+        if size < 2:
+            return names, corr, best
+        levels = [np.asarray(list(series_by_agent[name]), dtype=float) for name in names]
+        lengths = np.asarray([len(values) for values in levels])
+
+        for length in np.unique(lengths):
+            members = np.nonzero(lengths == length)[0]
+            if len(members) < 2:
+                continue
+            block = np.ix_(members, members)
+            corr[block], best[block] = self._peaks(self._returns(np.stack([levels[i] for i in members])))
+
+        for i in range(size):
+            for j in range(i + 1, size):
+                if lengths[i] == lengths[j]:
+                    continue
+                n = min(lengths[i], lengths[j])
+                pair_corr, pair_best = self._peaks(self._returns(np.stack([levels[i][-n:], levels[j][-n:]])))
+                corr[[i, j], [j, i]] = pair_corr[[0, 1], [1, 0]]
+                best[[i, j], [j, i]] = pair_best[[0, 1], [1, 0]]
+        np.fill_diagonal(corr, 0.0)
+        np.fill_diagonal(best, 0)
+        return names, corr, best
+
+    def edges(self, series_by_agent: dict[str, list[float]], min_abs_corr: float = 0.0) -> dict[str, dict[str, float | int]]:
+        """One ``"leader->follower"`` entry per pair with ``|corr| >= min_abs_corr`` (lag >= 0 ticks)."""
+        names, corr, lag = self.matrix(series_by_agent)
+        out: dict[str, dict[str, float | int]] = {}
+        for i in range(len(names)):
+            for j in range(i + 1, len(names)):
+                if abs(corr[i, j]) < min_abs_corr:
+                    continue
+                src, dst, k = (names[i], names[j], int(lag[i, j])) if lag[i, j] >= 0 else (names[j], names[i], -int(lag[i, j]))
+                out[f"{src}->{dst}"] = {"corr": round(float(corr[i, j]), 6), "lag": k}
+        return out
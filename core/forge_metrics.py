@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from contextlib import contextmanager
+import threading
+import time
+from typing import Iterator
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _labels(labels: tuple[tuple[str, str], ...], extra: str = "") -> str:
+    parts = [f'{k}="{v}"' for k, v in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (seconds); ``observe`` is a bisect plus two adds under a lock."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self.counts[bisect_left(self.buckets, seconds)] += 1
+            self.total += seconds
+
+    def snapshot(self) -> tuple[list[int], float]:
+        with self._lock:
+            return list(self.counts), self.total
+
+
+class MetricsRegistry:
+    """In-process metrics (histograms, counters, gauges) rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self._help: dict[str, tuple[str, str]] = {}
+        self._histograms: dict[str, dict[tuple[tuple[str, str], ...], Histogram]] = {}
+        self._values: dict[str, dict[tuple[tuple[str, str], ...], float]] = {}
+        self._lock = threading.Lock()
+
+    def _declare(self, name: str, kind: str, help_text: str) -> None:
+        if name not in self._help:
+            self._help[name] = (kind, help_text)
+
+    def observe(self, name: str, seconds: float, help_text: str = "", **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._declare(name, "histogram", help_text)
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+        histogram.observe(seconds)
+
+    def inc(self, name: str, amount: float = 1.0, help_text: str = "", **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._declare(name, "counter", help_text)
+            series = self._values.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + amount
+
+    def set(self, name: str, value: float, help_text: str = "", **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._declare(name, "gauge", help_text)
+            self._values.setdefault(name, {})[key] = float(value)
+
+    @contextmanager
+    def timer(self, name: str, help_text: str = "", **labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, help_text, **labels)
+
+    def render(self) -> str:
+        with self._lock:
+            declared = dict(self._help)
+            histograms = {name: dict(series) for name, series in self._histograms.items()}
+            values = {name: dict(series) for name, series in self._values.items()}
+        lines: list[str] = []
+        for name in sorted(declared):
+            kind, help_text = declared[name]
+            if help_text:
+                lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == "histogram":
+                for key, histogram in sorted(histograms.get(name, {}).items()):
+                    counts, total = histogram.snapshot()
+                    cumulative = 0
+                    for bound, count in zip((*histogram.buckets, "+Inf"), counts):
+                        cumulative += count
+                        le = _labels(key, f'le="{bound}"')
+                        lines.append(f"{name}_bucket{le} {cumulative}")
+                    lines.append(f"{name}_sum{_labels(key)} {total}")
+                    lines.append(f"{name}_count{_labels(key)} {cumulative}")
+            else:
+                for key, value in sorted(values.get(name, {}).items()):
+                    lines.append(f"{name}{_labels(key)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+class PhaseTimer:
+    """Wall-clock split of one tick into named phases, mirrored into ``registry`` as a histogram."""
+
+    def __init__(self, registry: MetricsRegistry | None = None, metric: str = "forge_tick_phase_seconds"):
+        self.registry = registry
+        self.metric = metric
+        self.phases: dict[str, float] = {}
+        self._start = self._mark = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def lap(self, name: str) -> None:
+        """Attribute the time since the previous lap (or the start) to ``name``."""
+        now = time.perf_counter()
+        self.record(name, now - self._mark)
+
+    def record(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+        self._mark = time.perf_counter()
+        if self.registry is not None:
+            self.registry.observe(self.metric, seconds, "Duration of one ForgeOrchestrator.tick phase", phase=name)
+
+    def as_dict(self) -> dict[str, float]:
+        out = {f"{name}_ms": round(seconds * 1000.0, 3) for name, seconds in self.phases.items()}
+        out["total_ms"] = round((time.perf_counter() - self._start) * 1000.0, 3)
+        return out
+
+
+METRICS = MetricsRegistry()
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import json
+import re
+from typing import Any, BinaryIO
+
+DEFAULT_MAX_BODY_BYTES = 4 * 1024 * 1024
+_KRAKEN_HEAD = re.compile(rb'^\s*\{\s*"error"\s*:\s*\[\s*\]\s*,\s*"result"\s*:\s*\{\s*"([^"]+)"\s*:\s*\[')
+
+
+class BodyTooLarge(ValueError):
+    pass
+
+
+def read_limited(stream: BinaryIO, max_bytes: int, chunk_size: int = 64 * 1024) -> bytes:
+    """Stream a response body in chunks and abort once it exceeds ``max_bytes``."""
+    chunks: list[bytes] = []
+    total = 0
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return b"".join(chunks)
+        total += len(chunk)
+        if total > max_bytes:
+            raise BodyTooLarge(f"response body exceeds {max_bytes} bytes")
+        chunks.append(chunk)
+
+
+def _kraken_tail(body: bytes) -> Any:
+    """Decode only the newest OHLC candle instead of the full 720-candle array.
+
+    Kraken bodies look like ``{"error":[],"result":{"XXBTZUSD":[[...],...,[...]],"last":N}}``; the last
+    candle is the final ``[...]`` before the closing ``]]``. Returns ``None`` when the shape does not match.
+    """
+    head = _KRAKEN_HEAD.match(body[:256])
+    end = body.rfind(b"]]")
+    if head is None or end < 0:
+        return None
+    start = body.rfind(b"[", 0, end)
+    if start < head.end():
+        return None
+    candle = json.loads(body[start : end + 1])
+    return {"error": [], "result": {head.group(1).decode("utf-8"): [candle]}}
+
+
+_STRATEGIES = {"tail_kraken_ohlc": _kraken_tail}
+
+
+@dataclass(frozen=True)
+class SourceParser:
+    """Extraction path plus decode strategy for one ``source_type``.
+
+    ``path`` walks dict keys and list indexes; ``"*"`` selects the first key that is not ``"last"`` (Kraken
+    pair names differ per market). ``strategy`` names a targeted decoder that returns a reduced payload
+    with the same shape; it falls back to a full ``json.loads`` whenever the body does not match.
+    """
+
+    path: tuple[str | int, ...] = ()
+    strategy: str = "full"
+    max_body_bytes: int = DEFAULT_MAX_BODY_BYTES
+
+    def decode(self, body: bytes) -> Any:
+        if len(body) > self.max_body_bytes:
+            raise BodyTooLarge(f"response body exceeds {self.max_body_bytes} bytes")
+        targeted = _STRATEGIES.get(self.strategy)
+        if targeted is not None:
+            try:
+                reduced = targeted(body)
+            except ValueError:
+                reduced = None
+            if reduced is not None:
+                return reduced
+        return json.loads(body.decode("utf-8"))
+
+    def extract(self, payload: Any) -> Any:
+        node = payload
+        for step in self.path:
+            if step == "*" and isinstance(node, dict):
+                step = next((k for k in node if k != "last"), "*")
+            try:
+                node = node[step]
+            except (KeyError, IndexError, TypeError) as exc:
+                raise ValueError(f"payload has no {'/'.join(str(p) for p in self.path)}") from exc
+        return node
+
+
+PARSERS: dict[str, SourceParser] = {
+    "kraken": SourceParser(path=("result", "*", -1, 4), strategy="tail_kraken_ohlc"),
+    "binance": SourceParser(path=("price",), max_body_bytes=256 * 1024),
+    "open_meteo": SourceParser(path=("current", "temperature_2m")),
+    "alphavantage_commodity": SourceParser(path=("data", 0, "value")),
+    "coingecko": SourceParser(max_body_bytes=256 * 1024),
+}
+FULL_JSON = SourceParser()
+
+
+def register_parser(source_type: str, parser: SourceParser) -> None:
+    PARSERS[source_type] = parser
+
+
+def parser_for(source_type: str) -> SourceParser:
+    return PARSERS.get(source_type, FULL_JSON)
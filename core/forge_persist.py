@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+from pathlib import Path
+import tempfile
+import threading
+import time
+from typing import Any
+
+from core.forge_metrics import METRICS
+
+
+# frame fields that move on every tick without the frame's outputs changing; dotted paths, "*" matches any key
+# or list item. They are still written, but a frame that differs only in them is not written again until
+# ``max_age_s`` has passed, so ``ts`` in the file never lags by more than that.
+VOLATILE_FIELDS = (
+    "ts",
+    "timings",
+    "signals.*.freshness_s",
+    "source_resilience.agents.*.next_fetch_in_s",
+    "source_resilience.http_pool",
+    "source_resilience.http_cache",
+    "source_resilience.streams",
+)
+
+
+def _without(value: Any, path: list[str]) -> Any:
+    """``value`` minus the field at ``path``; containers along the path are shallow-copied, never mutated."""
+    head, rest = path[0], path[1:]
+    if isinstance(value, dict):
+        keys = list(value) if head == "*" else [head] if head in value else []
+        if not keys:
+            return value
+        if not rest:
+            return {k: v for k, v in value.items() if k not in keys}
+        return {**value, **{k: _without(value[k], rest) for k in keys}}
+    if isinstance(value, list) and head == "*":
+        return [_without(item, rest) for item in value] if rest else []
+    return value
+
+
+class FramePersister:
+    """Write-behind persistence of the latest frame to a JSON file.
+
+    ``submit`` only swaps the pending frame under a lock; a background thread serializes compact JSON and
+    writes it atomically (unique temp file in the same directory + ``os.replace``), so readers never see a
+    partial file. The frame is held by reference, so callers must not mutate it after submitting. Frames
+    submitted faster than ``min_interval_s`` are coalesced (latest wins), and a write is skipped when the
+    content hash, which ignores ``volatile_keys`` (see :data:`VOLATILE_FIELDS`), matches the last written frame
+    and that write is younger than ``max_age_s``.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        min_interval_s: float = 2.0,
+        volatile_keys: tuple[str, ...] = VOLATILE_FIELDS,
+        max_age_s: float = 30.0,
+    ):
+        self.path = Path(path)
+        self.min_interval_s = max(0.0, min_interval_s)
+        self.max_age_s = max(0.0, max_age_s)
+        self.volatile_keys = tuple(volatile_keys)
+        self._volatile_paths = [key.split(".") for key in self.volatile_keys]
+        self.stats: dict[str, Any] = {
+            "submitted": 0,
+            "writes": 0,
+            "coalesced": 0,
+            "skipped_unchanged": 0,
+            "errors": 0,
+            "bytes_written": 0,
+            "last_write_ms": 0.0,
+            "last_bytes": 0,
+            "last_error": "",
+        }
+        self._cond = threading.Condition()
+        self._pending: dict[str, Any] | None = None
+        self._busy = False
+        self._closed = False
+        self._last_hash: bytes | None = None
+        self._last_write = float("-inf")
+        # unlike _last_write, never reset by flush(): the age of the file's content
+        self._written_at = float("-inf")
+        self._thread: threading.Thread | None = None
+
+    def submit(self, frame: dict[str, Any]) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            if self._pending is not None:
+                self.stats["coalesced"] += 1
+            self._pending = frame
+            self.stats["submitted"] += 1
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True, name="forge-persist")
+                self._thread.start()
+            self._cond.notify_all()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until the pending frame (if any) has been handled; ignores the rate cap."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._last_write = float("-inf")
+            self._cond.notify_all()
+            while self._pending is not None or self._busy:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: float = 5.0) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._pending is None:
+                    return
+                delay = self._last_write + self.min_interval_s - time.monotonic()
+                if delay > 0 and not self._closed:
+                    # newer frames may replace the pending one while the rate cap runs out
+                    self._cond.wait(delay)
+                    continue
+                frame, self._pending = self._pending, None
+                self._busy = True
+            try:
+                self._write(frame)
+            except Exception as exc:
+                # never let one bad frame stop persistence for the rest of the process
+                self.stats["errors"] += 1
+                self.stats["last_error"] = f"{type(exc).__name__}: {exc}"
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _write(self, frame: dict[str, Any]) -> None:
+        start = time.perf_counter()
+        try:
+            content: Any = frame
+            for path in self._volatile_paths:
+                content = _without(content, path)
+            digest = hashlib.blake2b(json.dumps(content, separators=(",", ":")).encode("utf-8"), digest_size=16).digest()
+            if digest == self._last_hash and time.monotonic() - self._written_at < self.max_age_s:
+                self.stats["skipped_unchanged"] += 1
+                METRICS.inc("forge_persist_skipped_total", help_text="Frame writes skipped as unchanged")
+                return
+            data = json.dumps(frame, separators=(",", ":")).encode("utf-8")
+            # a unique temp file per write: other persisters (a replaced orchestrator, the CLI) may target the same path
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as handle:
+                    handle.write(data)
+                os.replace(tmp, self.path)
+            except BaseException:
+                with contextlib.suppress(OSError):
+                    os.unlink(tmp)
+                raise
+        except (OSError, TypeError, ValueError) as exc:
+            self.stats["errors"] += 1
+            self.stats["last_error"] = f"{type(exc).__name__}: {exc}"
+            return
+        elapsed = time.perf_counter() - start
+        self._last_hash = digest
+        self._last_write = self._written_at = time.monotonic()
+        self.stats["writes"] += 1
+        self.stats["bytes_written"] += len(data)
+        self.stats["last_bytes"] = len(data)
+        self.stats["last_write_ms"] = round(elapsed * 1000.0, 3)
+        METRICS.observe("forge_persist_seconds", elapsed, "Frame serialization + atomic write latency")
+        METRICS.inc("forge_persist_bytes_total", len(data), help_text="Bytes written by the frame persister")
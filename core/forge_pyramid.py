@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from collections import deque
+import threading
+from typing import Iterator
+
+import numpy as np
+
+
+class SeriesPyramid:
+    """Rolling per-agent series that serves bucket-mean views at any resolution.
+
+    Behaves like the ``deque(maxlen=lookback_window)`` it replaces (append, len, index, iterate) and keeps
+    running prefix sums next to the values, so a ``points``-bucket view costs O(points) instead of a pass
+    over the whole window. Buckets follow ``np.array_split`` (the first ``n % points`` buckets hold one extra
+    value), matching ``EntropySignalEngine.bottleneck_compress``. Views are cached until the next append;
+    ``version`` counts appends so callers can cache anything derived from the series.
+    """
+
+    def __init__(self, maxlen: int, levels: tuple[int, ...] = (20, 100, 500)):
+        self.maxlen = max(1, maxlen)
+        self.levels = tuple(sorted({int(level) for level in levels if int(level) > 0}))
+        self.version = 0
+        self._values: deque[float] = deque(maxlen=self.maxlen)
+        # _prefix[i] = sum of the first i retained values, relative to a base that moves on eviction
+        self._prefix: deque[float] = deque([0.0], maxlen=self.maxlen + 1)
+        self._since_rebase = 0
+        self._views: dict[int, list[float]] = {}
+        self._lock = threading.Lock()
+
+    def append(self, value: float) -> None:
+        value = float(value)
+        with self._lock:
+            self._values.append(value)
+            self._prefix.append(self._prefix[-1] + value)
+            self._since_rebase += 1
+            if self._since_rebase >= self.maxlen:
+                # re-anchor once per window so the running sums never drift far from the retained values
+                self._prefix = deque(np.concatenate(([0.0], np.cumsum(self._values))).tolist(), maxlen=self.maxlen + 1)
+                self._since_rebase = 0
+            self.version += 1
+            self._views.clear()
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __bool__(self) -> bool:
+        return bool(self._values)
+
+    def __getitem__(self, index: int) -> float:
+        return self._values[index]
+
+    def __iter__(self) -> Iterator[float]:
+        with self._lock:
+            return iter(list(self._values))
+
+    def level(self, points: int) -> list[float]:
+        """Bucket means over the retained window; the raw values when the window holds ``points`` or fewer."""
+        points = max(1, int(points))
+        with self._lock:
+            cached = self._views.get(points)
+            if cached is not None:
+                return cached
+            size = len(self._values)
+            if size <= points:
+                view = list(self._values)
+            else:
+                prefix = np.fromiter(self._prefix, dtype=float, count=size + 1)
+                base, extra = divmod(size, points)
+                ends = np.arange(1, points + 1) * base + np.minimum(np.arange(1, points + 1), extra)
+                starts = np.concatenate(([0], ends[:-1]))
+                view = ((prefix[ends] - prefix[starts]) / (ends - starts)).tolist()
+            self._views[points] = view
+            return view
+
+    def pyramid(self) -> dict[int, list[float]]:
+        return {level: self.level(level) for level in self.levels}
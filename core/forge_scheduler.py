@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import time
+
+
+class AgentScheduler:
+    """Min-heap of next fetch times for agents that declare their own ``interval_seconds``.
+
+    Agents without an interval are due on every tick, so the global cadence stays the default. The heap is
+    only checked once per engine tick, so intervals are clamped to ``min_interval_s`` (the engine's
+    ``interval_seconds``). Entries are invalidated lazily: a heap item only counts if it matches the
+    agent's current due time.
+    """
+
+    def __init__(self, slack_s: float = 0.5, min_interval_s: float = 0.0):
+        self.slack_s = slack_s
+        self.min_interval_s = max(0.0, min_interval_s)
+        self._heap: list[tuple[float, int, str]] = []
+        self._due: dict[str, float] = {}
+        self._intervals: dict[str, float] = {}
+        self._seq = itertools.count()
+
+    def sync(self, intervals: dict[str, float | None], now: float | None = None) -> None:
+        """Register the current agent set; new scheduled agents are due immediately."""
+        now = now or time.time()
+        self._intervals = {name: max(float(iv), self.min_interval_s) for name, iv in intervals.items() if iv}
+        for name in list(self._due):
+            if name not in self._intervals:
+                del self._due[name]
+        for name in self._intervals:
+            if name not in self._due:
+                self._push(name, now)
+
+    def _push(self, name: str, due: float) -> None:
+        self._due[name] = due
+        heapq.heappush(self._heap, (due, next(self._seq), name))
+
+    def is_scheduled(self, name: str) -> bool:
+        return name in self._intervals
+
+    def pop_due(self, now: float | None = None) -> set[str]:
+        """Scheduled agents whose next fetch time has come (within ``slack_s``)."""
+        now = now or time.time()
+        due: set[str] = set()
+        while self._heap and self._heap[0][0] <= now + self.slack_s:
+            when, _, name = heapq.heappop(self._heap)
+            if self._due.get(name) == when:
+                due.add(name)
+        return due
+
+    def reschedule(self, name: str, now: float | None = None, delay_s: float | None = None) -> None:
+        if name not in self._intervals:
+            return
+        now = now or time.time()
+        self._push(name, now + (self._intervals[name] if delay_s is None else delay_s))
+
+    def next_due_in(self, name: str, now: float | None = None) -> float | None:
+        if name not in self._due:
+            return None
+        return max(0.0, self._due[name] - (now or time.time()))
@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+import base64
+import contextlib
+from dataclasses import dataclass
+import hashlib
+import json
+import os
+import random
+import socket
+import ssl
+import struct
+import threading
+import time
+from typing import Any, Callable
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+_WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+OP_CONT, OP_TEXT, OP_BINARY, OP_CLOSE, OP_PING, OP_PONG = 0x0, 0x1, 0x2, 0x8, 0x9, 0xA
+
+
+class WebSocketConnection:
+    """Minimal RFC 6455 client (text frames, ping/pong, close) on top of the standard library."""
+
+    def __init__(self, url: str, timeout: float = 10.0):
+        parts = urlsplit(url)
+        secure = parts.scheme == "wss"
+        host = parts.hostname or ""
+        port = parts.port or (443 if secure else 80)
+        sock = socket.create_connection((host, port), timeout=timeout)
+        if secure:
+            sock = ssl.create_default_context().wrap_socket(sock, server_hostname=host)
+        self.sock = sock
+        self._buffer = b""
+
+        key = base64.b64encode(os.urandom(16)).decode("ascii")
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        handshake = (
+            f"GET {path} HTTP/1.1\r\n"
+            f"Host: {host}:{port}\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\n"
+            "Sec-WebSocket-Version: 13\r\n"
+            "User-Agent: IrsanAI-TPM/Forge\r\n\r\n"
+        )
+        sock.sendall(handshake.encode("ascii"))
+        while b"\r\n\r\n" not in self._buffer:
+            chunk = sock.recv(4096)
+            if not chunk:
+                raise ConnectionError("websocket handshake closed by peer")
+            self._buffer += chunk
+        head, self._buffer = self._buffer.split(b"\r\n\r\n", 1)
+        lines = head.decode("latin-1").split("\r\n")
+        if " 101 " not in f"{lines[0]} ":
+            raise ConnectionError(f"websocket upgrade refused: {lines[0]}")
+        headers = {k.strip().lower(): v.strip() for k, _, v in (line.partition(":") for line in lines[1:])}
+        expected = base64.b64encode(hashlib.sha1((key + _WS_GUID).encode("ascii")).digest()).decode("ascii")
+        if headers.get("sec-websocket-accept") != expected:
+            raise ConnectionError("websocket handshake accept mismatch")
+
+    def settimeout(self, timeout: float | None) -> None:
+        self.sock.settimeout(timeout)
+
+    def _recv_exact(self, n: int) -> bytes:
+        while len(self._buffer) < n:
+            chunk = self.sock.recv(max(4096, n - len(self._buffer)))
+            if not chunk:
+                raise ConnectionError("websocket closed by peer")
+            self._buffer += chunk
+        data, self._buffer = self._buffer[:n], self._buffer[n:]
+        return data
+
+    def send(self, opcode: int, payload: bytes = b"") -> None:
+        header = bytes([0x80 | opcode])
+        length = len(payload)
+        if length < 126:
+            header += bytes([0x80 | length])
+        elif length < 1 << 16:
+            header += bytes([0x80 | 126]) + struct.pack("!H", length)
+        else:
+            header += bytes([0x80 | 127]) + struct.pack("!Q", length)
+        mask = os.urandom(4)
+        masked = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+        self.sock.sendall(header + mask + masked)
+
+    def send_text(self, text: str) -> None:
+        self.send(OP_TEXT, text.encode("utf-8"))
+
+    def ping(self) -> None:
+        self.send(OP_PING, b"tpm")
+
+    def recv_message(self) -> str:
+        """Return the next complete text/binary message; control frames are handled inline.
+
+        A timeout before a message starts is re-raised as ``socket.timeout`` (the connection is idle). A timeout
+        after part of a message was consumed raises ``ConnectionError``: the stream position is lost, so the
+        connection must be re-established instead of being parsed from the middle of a frame.
+        """
+        fragments: list[bytes] = []
+        while True:
+            try:
+                # _recv_exact keeps partial reads buffered, so a timeout on the header alone loses nothing
+                b0, b1 = self._recv_exact(2)
+            except socket.timeout:
+                if fragments:
+                    raise ConnectionError("websocket timed out inside a fragmented message") from None
+                raise
+            try:
+                opcode, payload = self._recv_frame(b0, b1)
+            except socket.timeout:
+                raise ConnectionError("websocket timed out mid-frame") from None
+            if opcode == OP_PING:
+                self.send(OP_PONG, payload)
+                continue
+            if opcode == OP_PONG:
+                continue
+            if opcode == OP_CLOSE:
+                with contextlib.suppress(OSError):
+                    self.send(OP_CLOSE, payload[:2])
+                raise ConnectionError("websocket closed by server")
+            fragments.append(payload)
+            if b0 & 0x80:
+                return b"".join(fragments).decode("utf-8")
+
+    def _recv_frame(self, b0: int, b1: int) -> tuple[int, bytes]:
+        length = b1 & 0x7F
+        if length == 126:
+            length = struct.unpack("!H", self._recv_exact(2))[0]
+        elif length == 127:
+            length = struct.unpack("!Q", self._recv_exact(8))[0]
+        mask = self._recv_exact(4) if b1 & 0x80 else b""
+        payload = self._recv_exact(length)
+        if mask:
+            payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+        return b0 & 0x0F, payload
+
+    def close(self) -> None:
+        with contextlib.suppress(OSError):
+            self.send(OP_CLOSE, struct.pack("!H", 1000))
+        self.sock.close()
+
+
+@dataclass(frozen=True)
+class StreamProvider:
+    """How one exchange names its stream URL, subscribes symbols and reports last prices."""
+
+    connect_url: Callable[[str, list[str]], str]
+    subscribe: Callable[[list[str]], list[str]]
+    parse: Callable[[Any], list[tuple[str, float]]]
+
+
+def _binance_connect(endpoint: str, symbols: list[str]) -> str:
+    parts = urlsplit(endpoint)
+    streams = "/".join(f"{s.lower()}@trade" for s in symbols)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path or "/stream", f"streams={streams}", ""))
+
+
+def _binance_parse(msg: Any) -> list[tuple[str, float]]:
+    data = msg.get("data", msg) if isinstance(msg, dict) else {}
+    if not isinstance(data, dict) or "p" not in data or "s" not in data:
+        return []
+    return [(str(data["s"]).lower(), float(data["p"]))]
+
+
+def _kraken_subscribe(symbols: list[str]) -> list[str]:
+    return [json.dumps({"method": "subscribe", "params": {"channel": "ticker", "symbol": symbols}})]
+
+
+def _kraken_parse(msg: Any) -> list[tuple[str, float]]:
+    if not isinstance(msg, dict) or msg.get("channel") != "ticker":
+        return []
+    return [(str(row["symbol"]), float(row["last"])) for row in msg.get("data", []) if "symbol" in row and "last" in row]
+
+
+STREAM_PROVIDERS: dict[str, StreamProvider] = {
+    "binance_ws": StreamProvider(connect_url=_binance_connect, subscribe=lambda symbols: [], parse=_binance_parse),
+    "kraken_ws": StreamProvider(connect_url=lambda endpoint, symbols: endpoint, subscribe=_kraken_subscribe, parse=_kraken_parse),
+}
+
+
+def split_stream_url(url: str) -> tuple[str, str]:
+    """``wss://host/path?symbol=BTC/USD`` -> (endpoint without ``symbol``, symbol)."""
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    symbol = next((v for k, v in query if k == "symbol"), "")
+    rest = urlencode([(k, v) for k, v in query if k != "symbol"])
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, rest, "")), symbol
+
+
+class StreamHub:
+    """One persistent WebSocket subscription per provider endpoint, shared by all its agents.
+
+    A background thread keeps the newest price per symbol in memory, reconnects with jittered
+    exponential backoff and pings idle connections; a connection silent for two idle periods is
+    treated as dead and re-established.
+    """
+
+    def __init__(self, provider: StreamProvider, endpoint: str, idle_timeout_s: float = 15.0, max_backoff_s: float = 60.0):
+        self.provider = provider
+        self.endpoint = endpoint
+        self.idle_timeout_s = idle_timeout_s
+        self.max_backoff_s = max_backoff_s
+        self.latest: dict[str, tuple[float, float]] = {}
+        self.stats = {"connects": 0, "reconnects": 0, "messages": 0}
+        self.last_error = ""
+        self._symbols: dict[str, int] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def add_symbol(self, symbol: str) -> None:
+        with self._lock:
+            self._symbols[symbol] = self._symbols.get(symbol, 0) + 1
+            if self._symbols[symbol] == 1:
+                self._generation += 1
+            self._stop.clear()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True, name=f"forge-stream-{self.endpoint}")
+                self._thread.start()
+
+    def remove_symbol(self, symbol: str) -> None:
+        with self._lock:
+            count = self._symbols.get(symbol, 0) - 1
+            if count > 0:
+                self._symbols[symbol] = count
+                return
+            self._symbols.pop(symbol, None)
+            self.latest.pop(symbol, None)
+            self._generation += 1
+            if not self._symbols:
+                self._stop.set()
+
+    def quote(self, symbol: str) -> tuple[float, float] | None:
+        return self.latest.get(symbol)
+
+    def _run(self) -> None:
+        backoff = 1.0
+        while not self._stop.is_set():
+            with self._lock:
+                symbols = sorted(self._symbols)
+                generation = self._generation
+            conn = None
+            try:
+                conn = WebSocketConnection(self.provider.connect_url(self.endpoint, symbols), timeout=self.idle_timeout_s)
+                self.stats["connects"] += 1
+                for message in self.provider.subscribe(symbols):
+                    conn.send_text(message)
+                backoff = 1.0
+                self._consume(conn, generation)
+                continue
+            except Exception as exc:
+                self.last_error = str(exc)
+                self.stats["reconnects"] += 1
+            finally:
+                if conn is not None:
+                    conn.close()
+            self._stop.wait(backoff * (1.0 + random.random() * 0.25))
+            backoff = min(self.max_backoff_s, backoff * 2)
+
+    def _consume(self, conn: WebSocketConnection, generation: int) -> None:
+        conn.settimeout(self.idle_timeout_s)
+        idle_periods = 0
+        while not self._stop.is_set() and generation == self._generation:
+            try:
+                raw = conn.recv_message()
+            except socket.timeout:
+                idle_periods += 1
+                if idle_periods >= 2:
+                    raise TimeoutError("stream silent, reconnecting")
+                conn.ping()
+                continue
+            idle_periods = 0
+            self.stats["messages"] += 1
+            try:
+                updates = self.provider.parse(json.loads(raw))
+            except (ValueError, TypeError, KeyError):
+                continue
+            now = time.time()
+            for symbol, price in updates:
+                self.latest[symbol] = (price, now)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "endpoint": self.endpoint,
+            "symbols": sorted(self._symbols),
+            "connected": bool(self._thread and self._thread.is_alive()),
+            "last_error": self.last_error,
+            **self.stats,
+        }
+
+
+STREAM_HUBS: dict[tuple[str, str], StreamHub] = {}
+_HUBS_LOCK = threading.Lock()
+
+
+def stream_hub(source_type: str, endpoint: str) -> StreamHub:
+    with _HUBS_LOCK:
+        key = (source_type, endpoint)
+        if key not in STREAM_HUBS:
+            STREAM_HUBS[key] = StreamHub(STREAM_PROVIDERS[source_type], endpoint)
+        return STREAM_HUBS[key]
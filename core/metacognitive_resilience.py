@@ -2,20 +2,49 @@ from __future__ import annotations
 
 import json
 import sqlite3
+import threading
 import time
 from pathlib import Path
 from typing import Any, Callable
 
+_METRIC_COLUMNS = (
+    "source_id",
+    "ok_count",
+    "fail_count",
+    "consecutive_failures",
+    "avg_latency_ms",
+    "ewma_fail",
+    "last_error",
+    "last_checked_ts",
+)
+
 
 class MetacognitiveResilienceOrchestrator:
-    """Lightweight runtime resilience brain for source health + predictive cooldowns."""
+    """Lightweight runtime resilience brain for source health + predictive cooldowns.
+
+    Source metrics are held in memory (loaded from SQLite on start), so ``record_result`` and ``predict``
+    never touch the database on the fetch path. Updates are queued and written by a background thread in
+    one transaction per ``flush_interval_s`` or per ``request_flush()``; ``source_events`` keeps only the
+    newest ``max_events`` rows.
+    """
 
-    def __init__(self, db_path: Path):
+    def __init__(self, db_path: Path, flush_interval_s: float = 5.0, max_events: int = 20000):
         self.db_path = db_path
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_interval_s = max(0.1, flush_interval_s)
+        self.max_events = max(1, max_events)
         self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
         self.conn.row_factory = sqlite3.Row
+        self._db_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._metrics: dict[str, dict[str, Any]] = {}
+        self._pending_metrics: dict[str, tuple] = {}
+        self._pending_events: list[tuple] = []
+        self._wake = threading.Event()
+        self._closed = False
+        self._writer: threading.Thread | None = None
         self._ensure_tables()
+        self._load()
 
     def _ensure_tables(self) -> None:
         cur = self.conn.cursor()
@@ -47,50 +76,97 @@ class MetacognitiveResilienceOrchestrator:
         )
         self.conn.commit()
 
+    def _load(self) -> None:
+        with self._db_lock:
+            rows = self.conn.execute("SELECT * FROM source_metrics").fetchall()
+        self._metrics = {row["source_id"]: dict(row) for row in rows}
+
     def record_result(self, source_id: str, success: bool, latency_ms: float | None, error: str = "") -> None:
-        cur = self.conn.cursor()
-        row = cur.execute("SELECT * FROM source_metrics WHERE source_id=?", (source_id,)).fetchone()
-        if row is None:
-            row = {
+        now = int(time.time())
+        with self._lock:
+            row = self._metrics.get(source_id) or {
                 "ok_count": 0,
                 "fail_count": 0,
                 "consecutive_failures": 0,
                 "avg_latency_ms": 0.0,
                 "ewma_fail": 0.0,
             }
-        ok = int(row["ok_count"]) + (1 if success else 0)
-        fail = int(row["fail_count"]) + (0 if success else 1)
-        consecutive = 0 if success else int(row["consecutive_failures"]) + 1
-        prev_lat = float(row["avg_latency_ms"]) if row else 0.0
-        new_lat = prev_lat if latency_ms is None else ((prev_lat * 0.8) + (float(latency_ms) * 0.2))
-        prev_ewma = float(row["ewma_fail"]) if row else 0.0
-        obs = 0.0 if success else 1.0
-        ewma = (prev_ewma * 0.8) + (obs * 0.2)
+            prev_lat = float(row["avg_latency_ms"])
+            obs = 0.0 if success else 1.0
+            updated = {
+                "source_id": source_id,
+                "ok_count": int(row["ok_count"]) + (1 if success else 0),
+                "fail_count": int(row["fail_count"]) + (0 if success else 1),
+                "consecutive_failures": 0 if success else int(row["consecutive_failures"]) + 1,
+                "avg_latency_ms": prev_lat if latency_ms is None else ((prev_lat * 0.8) + (float(latency_ms) * 0.2)),
+                "ewma_fail": (float(row["ewma_fail"]) * 0.8) + (obs * 0.2),
+                "last_error": "" if success else error,
+                "last_checked_ts": now,
+            }
+            self._metrics[source_id] = updated
+            self._pending_metrics[source_id] = tuple(updated[k] for k in _METRIC_COLUMNS)
+            self._pending_events.append((source_id, now, 1 if success else 0, latency_ms, error))
+            if self._writer is None and not self._closed:
+                self._writer = threading.Thread(target=self._write_loop, daemon=True, name="mro-writer")
+                self._writer.start()
 
-        cur.execute(
-            """
-            INSERT INTO source_metrics(source_id, ok_count, fail_count, consecutive_failures, avg_latency_ms, ewma_fail, last_error, last_checked_ts)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(source_id) DO UPDATE SET
-              ok_count=excluded.ok_count,
-              fail_count=excluded.fail_count,
-              consecutive_failures=excluded.consecutive_failures,
-              avg_latency_ms=excluded.avg_latency_ms,
-              ewma_fail=excluded.ewma_fail,
-              last_error=excluded.last_error,
-              last_checked_ts=excluded.last_checked_ts
-            """,
-            (source_id, ok, fail, consecutive, new_lat, ewma, ("" if success else error), int(time.time())),
-        )
-        cur.execute(
-            "INSERT INTO source_events(source_id, ts, success, latency_ms, error) VALUES (?, ?, ?, ?, ?)",
-            (source_id, int(time.time()), 1 if success else 0, latency_ms, error),
-        )
-        self.conn.commit()
+    def request_flush(self) -> None:
+        """Ask the writer to persist queued updates now (e.g. once per tick) without waiting for it."""
+        self._wake.set()
+
+    def flush(self) -> None:
+        # batches are taken and written under the same lock so an older batch never commits after a newer one
+        with self._db_lock:
+            with self._lock:
+                metrics = list(self._pending_metrics.values())
+                events = self._pending_events
+                self._pending_metrics = {}
+                self._pending_events = []
+            if not metrics and not events:
+                return
+            cur = self.conn.cursor()
+            cur.executemany(
+                f"""
+                INSERT INTO source_metrics({", ".join(_METRIC_COLUMNS)})
+                VALUES ({", ".join("?" for _ in _METRIC_COLUMNS)})
+                ON CONFLICT(source_id) DO UPDATE SET
+                  ok_count=excluded.ok_count,
+                  fail_count=excluded.fail_count,
+                  consecutive_failures=excluded.consecutive_failures,
+                  avg_latency_ms=excluded.avg_latency_ms,
+                  ewma_fail=excluded.ewma_fail,
+                  last_error=excluded.last_error,
+                  last_checked_ts=excluded.last_checked_ts
+                """,
+                metrics,
+            )
+            cur.executemany(
+                "INSERT INTO source_events(source_id, ts, success, latency_ms, error) VALUES (?, ?, ?, ?, ?)",
+                events,
+            )
+            cur.execute("DELETE FROM source_events WHERE id <= (SELECT MAX(id) FROM source_events) - ?", (self.max_events,))
+            self.conn.commit()
+
+    def _write_loop(self) -> None:
+        while not self._closed:
+            self._wake.wait(self.flush_interval_s)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                # keep the writer alive; the rows of a failed batch are lost, the in-memory metrics are not
+                continue
+
+    def close(self) -> None:
+        self._closed = True
+        self._wake.set()
+        if self._writer is not None:
+            self._writer.join(timeout=5)
+        self.flush()
 
     def predict(self, source_id: str) -> dict[str, Any]:
-        cur = self.conn.cursor()
-        row = cur.execute("SELECT * FROM source_metrics WHERE source_id=?", (source_id,)).fetchone()
+        with self._lock:
+            row = self._metrics.get(source_id)
         if row is None:
             return {"status": "unknown", "predicted_cooldown_s": 0, "fail_ratio": 0.0, "recommended_action": "observe"}
 
@@ -132,6 +208,7 @@ class MetacognitiveResilienceOrchestrator:
             ok, latency_ms, error = probe(item)
             self.record_result(source_id, ok, latency_ms, error)
             rows.append({**item, "source_id": source_id, "health": self.predict(source_id)})
+        self.flush()
         return {
             "generated_at": int(time.time()),
             "total_sources": len(rows),
@@ -140,9 +217,9 @@ class MetacognitiveResilienceOrchestrator:
         }
 
     def status(self) -> dict[str, Any]:
-        cur = self.conn.cursor()
-        rows = cur.execute("SELECT source_id FROM source_metrics ORDER BY source_id ASC").fetchall()
-        payload = [{"source_id": r["source_id"], **self.predict(r["source_id"])} for r in rows]
+        with self._lock:
+            source_ids = sorted(self._metrics)
+        payload = [{"source_id": source_id, **self.predict(source_id)} for source_id in source_ids]
         return {
             "generated_at": int(time.time()),
             "sources": payload,
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import time
 from pathlib import Path
 from typing import Any
 
-from fastapi import FastAPI, WebSocket
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, Query, WebSocket
+from fastapi.responses import FileResponse, Response
 
+from core.forge_broadcast import FrameHub
 from core.forge_config import load_config
 
 app = FastAPI(title="IrsanAI The Forge Dashboard")
@@ -16,6 +18,11 @@ CACHE_FILE = PATHS.state_dir / "latest_prices.json"
 BACKTEST_FILE = PATHS.state_dir / "TPM_test_results.json"
 SOURCE_INDEX_FILE = PATHS.state_dir / "source_index.json"
 HTML_FILE = Path(__file__).resolve().parents[1] / "playground" / "forge_dashboard.html"
+HUB = FrameHub(
+    queue_size=int(CONFIG["engine"].get("ws_queue_size", 4)),
+    heartbeat_s=float(CONFIG["engine"].get("ws_heartbeat_seconds", 20)),
+    history=int(CONFIG["engine"].get("ws_delta_history", 32)),
+)
 
 
 def _source_catalog() -> dict[str, Any]:
@@ -76,13 +83,36 @@ def api_frame() -> dict:
     return json.loads(CACHE_FILE.read_text(encoding="utf-8"))
 
 
+@app.get("/api/frame/stream")
+def api_frame_stream(since: int = Query(default=0, ge=0), stream: str = Query(default="")) -> Response:
+    return Response(HUB.since(since, stream), media_type="application/json")
+
+
 @app.websocket("/ws")
-async def ws_stream(websocket: WebSocket) -> None:
+async def ws_stream(websocket: WebSocket, mode: str = "full") -> None:
+    # mode=delta: one snapshot, then JSON-patch deltas keyed by seq; send {"type": "resync"} after a gap
     await websocket.accept()
+    await HUB.serve(websocket, delta=mode == "delta")
+
+
+async def _watch_cache_file() -> None:
+    # the runtime replaces the cache file atomically; one stat per poll feeds every /ws client
+    poll_s = max(0.1, float(CONFIG["engine"].get("ws_file_poll_seconds", 1.0)))
+    seen: int | None = None
     while True:
-        payload = api_frame()
-        await websocket.send_text(json.dumps(payload))
-        await websocket.receive_text()
+        try:
+            stamp = CACHE_FILE.stat().st_mtime_ns if CACHE_FILE.exists() else 0
+            if stamp != seen:
+                HUB.publish(api_frame())
+                seen = stamp
+        except (OSError, ValueError):
+            pass
+        await asyncio.sleep(poll_s)
+
+
+@app.on_event("startup")
+async def _startup() -> None:
+    app.state.cache_watcher = asyncio.get_running_loop().create_task(_watch_cache_file())
 
 
 @app.get("/api/backtest/summary")
@@ -3,14 +3,27 @@ from __future__ import annotations
 import argparse
 import json
 import time
-from collections import defaultdict, deque
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from pathlib import Path
+from typing import Any
 from urllib import request
+from urllib.error import HTTPError
 
-from core.forge_agents import DynamicAgentFactory
+from core.forge_agents import AgentSignal, BaseAgent, DynamicAgentFactory
+from core.forge_batching import BATCH_REJECT_STATUS, FetchJob, ProviderBatcher
+from core.forge_circuit import CircuitBreaker
 from core.forge_config import load_config
-from core.forge_entropy import EntropySignalEngine, TransferEntropyEngine
+from core.forge_entropy import EntropySignalEngine, OnlineTransferEntropy, TransferEntropyEngine
+from core.forge_http import HTTP_POOL, RESPONSE_CACHE
+from core.forge_leadlag import LeadLagEngine
+from core.forge_metrics import METRICS, PhaseTimer
 from core.forge_optimizer import NeuronalOptimizationEngine
+from core.forge_persist import VOLATILE_FIELDS, FramePersister
+from core.forge_pyramid import SeriesPyramid
+from core.forge_scheduler import AgentScheduler
+from core.forge_stream import STREAM_HUBS
+from core.metacognitive_resilience import MetacognitiveResilienceOrchestrator
 
 
 def _send_webhook(url: str, message: str) -> None:
@@ -21,20 +34,183 @@ def _send_webhook(url: str, message: str) -> None:
 
 
 class ForgeOrchestrator:
-    def __init__(self, config_path: Path | None = None):
+    def __init__(self, config_path: Path | None = None, mro: MetacognitiveResilienceOrchestrator | None = None):
         self.config, self.paths = load_config(config_path)
-        self.agents = DynamicAgentFactory.build(self.config["agents"])
         engine_cfg = self.config["engine"]
-        self.entropy = TransferEntropyEngine(bins=int(engine_cfg["entropy_bins"]), lag=int(engine_cfg["transfer_lag"]))
+        self.agents = DynamicAgentFactory.build(
+            self.config["agents"], stream_staleness_s=float(engine_cfg.get("stream_staleness_seconds", 30))
+        )
+        self.entropy = TransferEntropyEngine(
+            bins=int(engine_cfg["entropy_bins"]),
+            lag=int(engine_cfg["transfer_lag"]),
+            workers=int(engine_cfg.get("te_workers", 0)),
+            parallel_min_agents=int(engine_cfg.get("te_parallel_min_agents", 48)),
+        )
+        # opt-in two-stage sparse TE (MI screen + top-k) from this agent count on; 0 keeps the dense N² graph.
+        # predictive_power then averages only the retained top-k edges, so it reads higher than in dense mode
+        self.te_sparse_min_agents = int(engine_cfg.get("te_sparse_min_agents", 0))
+        self.te_top_k = int(engine_cfg.get("te_top_k", 5))
+        self.te_mi_threshold = float(engine_cfg.get("te_mi_threshold", 0.0))
+        self.te_candidates = int(engine_cfg.get("te_candidates_per_agent", 16))
+        self.te_max_lag = int(engine_cfg.get("te_max_lag", 1))
+        # linear lead-lag screen over raw returns, reported next to the TE graph
+        self.lead_lag = LeadLagEngine(max_lag=max(1, int(engine_cfg.get("lead_lag_max_lag", 10))))
+        self.lead_lag_enabled = int(engine_cfg.get("lead_lag_max_lag", 10)) > 0
+        self.lead_lag_min_corr = float(engine_cfg.get("lead_lag_min_corr", 0.3))
+        # surrogate significance is refreshed every N ticks; between runs the cached p-values are reused
+        self.te_surrogates = int(engine_cfg.get("te_surrogates", 0))
+        self.te_surrogate_every = max(1, int(engine_cfg.get("te_surrogate_every_ticks", 10)))
+        self.te_alpha = float(engine_cfg.get("te_significance_alpha", 0.05))
+        self._tick_count = 0
+        self._significance: dict[str, Any] = {}
+        # "online": pairwise count tables updated per tick instead of re-estimating over the whole lookback window;
+        # it has no lag scan or surrogate significance, both are skipped and listed in transfer_entropy_stats
+        self.online_te: OnlineTransferEntropy | None = None
+        if engine_cfg.get("te_estimator", "batch") == "online":
+            self.online_te = OnlineTransferEntropy(
+                bins=int(engine_cfg["entropy_bins"]),
+                lag=int(engine_cfg["transfer_lag"]),
+                window=int(engine_cfg["lookback_window"]),
+                decay=float(engine_cfg.get("te_decay", 0.0)),
+            )
         self.signal_entropy = EntropySignalEngine(bins=int(engine_cfg["entropy_bins"]))
         self.optimizer = NeuronalOptimizationEngine(lr=float(engine_cfg["reward_learning_rate"]))
+        self._last_fitness: dict[str, float] = {}
         self.cache_file = self.paths.state_dir / "latest_prices.json"
-        self.series = defaultdict(lambda: deque(maxlen=int(engine_cfg["lookback_window"])))
+        # write-behind: the tick only hands the frame over; serialization and the atomic write run off-thread
+        self.persister = FramePersister(
+            self.cache_file,
+            min_interval_s=float(engine_cfg.get("persist_min_interval_seconds", 2.0)),
+            # VOLATILE_FIELDS is the list; persist_volatile_keys only exists to replace it for custom frames
+            volatile_keys=tuple(engine_cfg.get("persist_volatile_keys", VOLATILE_FIELDS)),
+            max_age_s=float(engine_cfg.get("persist_max_age_seconds", 30.0)),
+        )
+        # per-agent series with cached bucket-mean levels; the entropy gate result is reused until a new point lands
+        self.series_levels = tuple(sorted(int(level) for level in engine_cfg.get("pyramid_levels", [20, 100, 500])))
+        self.series = defaultdict(lambda: SeriesPyramid(int(engine_cfg["lookback_window"]), self.series_levels))
+        self.entropy_gate_points = max(8, int(engine_cfg.get("entropy_gate_points", 500)))
+        self.te_resolution = engine_cfg.get("te_resolution", "compressed")
+        self._gate_cache: dict[str, tuple[int, dict]] = {}
+        # per-window entropies of each raw series, kept across appends so a new point only costs its new windows
+        self._window_entropies: dict[str, dict[tuple[int, int], float]] = defaultdict(dict)
         self.fail_state = defaultdict(int)
         self.source_health: dict[str, dict] = {}
+        # bounded fetch stage: tick wall time follows the slowest source instead of the sum
+        self.max_inflight_fetches = max(1, int(engine_cfg.get("max_inflight_fetches", 8)))
+        self._fetch_pool = ThreadPoolExecutor(max_workers=self.max_inflight_fetches, thread_name_prefix="forge-fetch")
+        # per-tick deadline: late agents carry their last good value, their fetch is folded into the next tick
+        self.tick_deadline_s = max(0.0, float(engine_cfg.get("tick_deadline_seconds", 0.0)))
+        # every fetch job still running (or finished but not yet folded), whatever tick planned it
+        self._inflight: list[tuple[FetchJob, Future]] = []
+        self.batcher = ProviderBatcher(
+            max_batch=int(engine_cfg.get("batch_max_symbols", 50)),
+            enabled=bool(engine_cfg.get("batch_requests", True)),
+        )
+        self.fetch_stats: dict[str, int] = {}
+        self.scheduler = AgentScheduler(min_interval_s=float(self.config["engine"].get("interval_seconds", 0)))
+        self.scheduler.sync({agent.name: agent.spec.get("interval_seconds") for agent in self.agents})
+        # a shared MRO (the runtime's) outlives this orchestrator; one created here is closed with it
+        self._owns_mro = mro is None
+        self.mro = mro or MetacognitiveResilienceOrchestrator(
+            self.paths.state_dir / "resilience.db",
+            flush_interval_s=float(engine_cfg.get("mro_flush_interval_seconds", 5.0)),
+            max_events=int(engine_cfg.get("mro_max_events", 20000)),
+        )
+        self.breaker = CircuitBreaker(
+            failure_threshold=int(engine_cfg.get("circuit_breaker_failures", 3)),
+            cooldown_s=float(engine_cfg.get("cooldown_seconds", 45)),
+            max_cooldown_s=float(engine_cfg.get("max_cooldown_seconds", 300)),
+            predictor=self.mro.predict,
+        )
+        HTTP_POOL.configure(
+            max_per_host=int(engine_cfg.get("http_max_connections_per_host", 4)),
+            idle_timeout_s=float(engine_cfg.get("http_idle_seconds", 90)),
+        )
+        RESPONSE_CACHE.configure(
+            max_entries=int(engine_cfg.get("http_cache_max_entries", 256)),
+            ttl_by_source=engine_cfg.get("http_cache_ttl_seconds", {}),
+        )
+
+    def close(self) -> None:
+        self._fetch_pool.shutdown(wait=False, cancel_futures=True)
+        self.entropy.close()
+        self.persister.close()
+        if self._owns_mro:
+            self.mro.close()
+        for agent in self.agents:
+            agent.close()
+
+    @staticmethod
+    def _source_id(agent: BaseAgent) -> str:
+        # same key the startup source index uses, so both share resilience history
+        return f"{agent.market}::{agent.spec.get('source_type', '')}::{agent.spec.get('url', '')}"
+
+    def series_view(self, points: int) -> dict[str, list[float]]:
+        """Every agent's series as ``points`` bucket means, served from the per-agent pyramid."""
+        return {name: values.level(points) for name, values in list(self.series.items()) if values}
+
+    def _fetch_all(self, agents: list[BaseAgent]) -> list[tuple[BaseAgent, AgentSignal | None, Exception | None, bool]]:
+        """Run the tick's fetch jobs concurrently within the tick deadline.
+
+        Returns ``(agent, signal, error, late)`` in declaration order. In-flight work is tracked per agent:
+        an agent whose previous job is still running is not planned again, even if the batch it would join
+        now has a different composition, so a hung source never piles up. Jobs finishing after their tick are
+        folded in when they complete, also for agents that are not due this tick (appended after the rest).
+        """
+        inflight = list(self._inflight)
+        busy = {agent.name for job, _ in inflight for agent in job.agents}
+        for job in self.batcher.plan([agent for agent in agents if not agent.streaming and agent.name not in busy]):
+            inflight.append((job, self._fetch_pool.submit(job.run)))
+        wanted = {agent.name for agent in agents}
+        relevant = [future for job, future in inflight if any(agent.name in wanted for agent in job.agents)]
+        wait(relevant, timeout=self.tick_deadline_s or None)
+
+        now = time.time()
+        outcome: dict[str, tuple[AgentSignal | None, Exception | None, bool]] = {}
+        for agent in agents:
+            if agent.streaming:
+                try:
+                    outcome[agent.name] = (agent.fetch(), None, False)
+                except Exception as exc:
+                    outcome[agent.name] = (None, exc, False)
+        self._inflight = []
+        self.fetch_stats = {"requests": 0, "batched_requests": 0, "batched_agents": 0, "coalesced_hits": 0}
+        extra: list[BaseAgent] = []
+        for job, future in inflight:
+            if not future.done():
+                self._inflight.append((job, future))
+                for agent in job.agents:
+                    if agent.name not in wanted:
+                        continue
+                    history = self.series.get(agent.name)
+                    carried = agent.carry_forward(history[-1], now) if history else None
+                    outcome[agent.name] = (carried, None, True)
+                continue
+            extra.extend(agent for agent in job.agents if agent.name not in wanted)
+            self.fetch_stats["requests"] += 1
+            self.fetch_stats["coalesced_hits"] += job.coalesced
+            if job.batch_key is not None:
+                self.fetch_stats["batched_requests"] += 1
+                self.fetch_stats["batched_agents"] += len(job.agents)
+            try:
+                per_agent = future.result()
+            except Exception as exc:
+                if isinstance(exc, HTTPError) and exc.code in BATCH_REJECT_STATUS:
+                    self.batcher.reject(job)
+                for agent in job.agents:
+                    outcome[agent.name] = (None, exc, False)
+                continue
+            for agent in job.agents:
+                result = per_agent[agent.name]
+                if isinstance(result, Exception):
+                    outcome[agent.name] = (None, result, False)
+                else:
+                    result.freshness_s = agent.freshness_s(now)
+                    outcome[agent.name] = (result, None, False)
+        return [(agent, *outcome[agent.name]) for agent in [*agents, *extra] if agent.name in outcome]
 
     def _store_cache(self, frame: dict) -> None:
-        self.cache_file.write_text(json.dumps(frame, indent=2), encoding="utf-8")
+        self.persister.submit(frame)
 
     def _broadcast_alert(self, message: str) -> None:
         telegram = self.config["alerts"]["telegram"]
@@ -58,82 +234,199 @@ class ForgeOrchestrator:
         return grouped
 
     def tick(self) -> dict:
+        timer = PhaseTimer(METRICS)
         signals = []
-        now = int(time.time())
+        fresh_values: dict[str, float] = {}
+        late_agents: list[str] = []
+        open_circuits: list[str] = []
+        deferred_agents: list[str] = []
+        # float: the scheduler registers due times with time.time(); truncating would defer agents due this second
+        now = time.time()
+        due = self.scheduler.pop_due(now)
+        allowed: list[BaseAgent] = []
+        held: list[BaseAgent] = []
         for agent in self.agents:
+            if self.scheduler.is_scheduled(agent.name) and agent.name not in due:
+                # own cadence not reached yet: the frame still carries its latest value
+                deferred_agents.append(agent.name)
+            elif self.breaker.allow(agent.name, now):
+                allowed.append(agent)
+                continue
+            else:
+                open_circuits.append(agent.name)
+                self.scheduler.reschedule(agent.name, now, delay_s=0.0)
+            held.append(agent)
+
+        fetched = self._fetch_all(allowed)
+        # a held agent whose earlier job completed this tick already has its fresh signal; carry the rest
+        completed = {agent.name for agent, signal, _, late in fetched if signal is not None and not late}
+        for agent in held:
+            history = self.series.get(agent.name)
+            if history and agent.name not in completed:
+                signals.append(agent.carry_forward(history[-1], now))
+
+        for agent, signal, error, late in fetched:
             health = self.source_health.setdefault(agent.name, {
                 "source_type": agent.spec.get("source_type", "unknown"),
                 "url": agent.spec.get("url", ""),
                 "ok_count": 0,
                 "fail_count": 0,
                 "consecutive_failures": 0,
+                "late_count": 0,
                 "avg_latency_ms": 0.0,
                 "last_ok_ts": None,
                 "last_error": "",
             })
-            try:
-                signal = agent.fetch()
+            # late or failed: due again next tick; the circuit breaker, not the interval, backs off a failing source
+            self.scheduler.reschedule(agent.name, now, delay_s=0.0 if late or signal is None else None)
+            if late:
+                late_agents.append(agent.name)
+                health["late_count"] += 1
+                if signal is not None:
+                    signals.append(signal)
+            elif signal is not None:
                 self.series[agent.name].append(signal.value)
+                fresh_values[agent.name] = signal.value
                 self.fail_state[agent.name] = 0
                 signals.append(signal)
                 health["ok_count"] += 1
                 health["consecutive_failures"] = 0
                 prev = float(health.get("avg_latency_ms", 0.0))
                 health["avg_latency_ms"] = (prev * 0.8) + (float(signal.latency_ms) * 0.2)
-                health["last_ok_ts"] = now
+                health["last_ok_ts"] = int(now)
                 health["last_error"] = ""
-            except Exception as exc:
+                self.mro.record_result(self._source_id(agent), True, signal.latency_ms)
+                self.breaker.record_success(agent.name)
+            else:
                 agent.failures += 1
                 self.fail_state[agent.name] += 1
                 health["fail_count"] += 1
                 health["consecutive_failures"] += 1
-                health["last_error"] = str(exc)
+                health["last_error"] = str(error)
+                self.mro.record_result(self._source_id(agent), False, None, str(error))
+                self.breaker.record_failure(agent.name, self._source_id(agent), now)
+        # the MRO writer persists this tick's source results in one transaction, off the tick thread
+        self.mro.request_flush()
+        order = {agent.name: idx for idx, agent in enumerate(self.agents)}
+        signals.sort(key=lambda item: order.get(item.name, len(order)))
+        timer.lap("fetch")
 
         series_payload = {name: list(values) for name, values in self.series.items()}
         entropy_summary: dict[str, dict] = {}
         compressed_series: dict[str, list[float]] = {}
-        for name, values in series_payload.items():
+        for name, values in self.series.items():
             if not values:
                 continue
-            bh = self.signal_entropy.black_hole_filter(values, window=min(40, max(8, len(values) // 3)), stride=5, out_points=20)
-            compressed = list(bh.get("compressed", []))
-            filtered = list(bh.get("filtered", []))
-            compressed_series[name] = compressed
-            entropy_summary[name] = {
-                "window_entropy": self.signal_entropy.shannon_entropy(values),
-                "black_hole_entropy_threshold": float(bh.get("threshold", 0.0)),
-                "raw_points": len(values),
-                "filtered_points": len(filtered),
-                "compressed_points": len(compressed),
-                "compressed": compressed,
-            }
+            cached = self._gate_cache.get(name)
+            if cached is None or cached[0] != values.version:
+                raw = len(values) <= self.entropy_gate_points
+                gate_input = list(values) if raw else values.level(self.entropy_gate_points)
+                bh = self.signal_entropy.black_hole_filter(
+                    gate_input,
+                    window=min(40, max(8, len(gate_input) // 3)),
+                    stride=5,
+                    out_points=20,
+                    # bucket means move on every append, so only the raw window has entropies to reuse
+                    offset=values.version - len(values),
+                    cache=self._window_entropies[name] if raw else None,
+                )
+                compressed = list(bh.get("compressed", []))
+                summary = {
+                    "window_entropy": self.signal_entropy.shannon_entropy(list(values)),
+                    "black_hole_entropy_threshold": float(bh.get("threshold", 0.0)),
+                    "raw_points": len(values),
+                    "filtered_points": len(bh.get("filtered", [])),
+                    "compressed_points": len(compressed),
+                    "compressed": compressed,
+                }
+                cached = (values.version, summary)
+                self._gate_cache[name] = cached
+            compressed_series[name] = cached[1]["compressed"]
+            entropy_summary[name] = cached[1]
 
-        graph = self.entropy.correlation_graph(compressed_series if compressed_series else series_payload)
-        predictive_power = (sum(graph.values()) / max(1, len(graph))) if graph else 0.0
+        timer.lap("entropy_gate")
+        if self.te_resolution == "compressed":
+            te_input = compressed_series if compressed_series else series_payload
+        else:
+            te_input = self.series_view(int(self.te_resolution))
+        te_edges: list[dict] = []
+        if self.online_te is not None:
+            self.online_te.update(fresh_values)
+            names, matrix = self.online_te.matrix()
+            graph = self.entropy.graph_from_matrix(names, matrix)
+            te_stats = {"mode": "online", **self.online_te.snapshot()}
+            # lag scan and surrogates re-bin te_input, not the online window, so they would describe another series
+            skipped = [stage for stage, on in (("lag_scan", self.te_max_lag > 1), ("surrogate_test", self.te_surrogates > 0)) if on]
+            if skipped:
+                te_stats["skipped"] = skipped
+        elif self.te_sparse_min_agents and len(te_input) >= self.te_sparse_min_agents:
+            sparse = self.entropy.sparse_transfer_entropy(
+                te_input, top_k=self.te_top_k, mi_threshold=self.te_mi_threshold, candidates=self.te_candidates
+            )
+            te_edges = sparse.pop("edges")
+            graph = {f"{edge['src']}->{edge['dst']}": edge["te"] for edge in te_edges}
+            te_stats = {"mode": "sparse", "top_k": self.te_top_k, **sparse}
+        else:
+            graph = self.entropy.correlation_graph(te_input)
+            pairs = len(te_input) * (len(te_input) - 1)
+            te_stats = {"mode": "dense", "pairs_total": pairs, "pairs_evaluated": pairs, "pairs_pruned": 0}
+        te_lags: dict[str, dict] = {}
+        if self.te_max_lag > 1 and self.online_te is None:
+            scanned = {tuple(edge.split("->", 1)) for edge in graph} if te_stats["mode"] == "sparse" else None
+            te_lags = self.entropy.lag_scan(te_input, self.te_max_lag, pairs=scanned)
+        timer.lap("transfer_entropy")
+        lead_lag = self.lead_lag.edges(series_payload, self.lead_lag_min_corr) if self.lead_lag_enabled else {}
+        timer.lap("lead_lag")
+        self._tick_count += 1
+        if self.te_surrogates > 0 and self.online_te is None and (not self._significance or self._tick_count % self.te_surrogate_every == 0):
+            tested = {tuple(edge.split("->", 1)) for edge in graph} if te_stats["mode"] == "sparse" else None
+            self._significance = {
+                "computed_at_tick": self._tick_count,
+                "surrogates": self.te_surrogates,
+                "alpha": self.te_alpha,
+                "edges": self.entropy.surrogate_test(te_input, pairs=tested, surrogates=self.te_surrogates),
+            }
+        if self._significance:
+            significant = [
+                graph[edge] for edge, test in self._significance["edges"].items() if test["p_value"] <= self.te_alpha and edge in graph
+            ]
+            predictive_power = sum(significant) / max(1, len(significant))
+        else:
+            predictive_power = (sum(graph.values()) / max(1, len(graph))) if graph else 0.0
+        timer.lap("significance")
 
         scored = []
         for signal in signals:
-            redundancy = sum(1 for edge, score in graph.items() if signal.name in edge and score > 0.8)
-            fitness = self.optimizer.fitness_score(
-                success_rate=1.0,
-                latency_ms=signal.latency_ms,
-                freshness_s=signal.freshness_s,
-                uptime=signal.uptime,
-                predictive_power=predictive_power,
-                redundancy_penalty=float(redundancy),
-            )
-            reward = self.optimizer.update_reward(signal.name, fitness)
+            if signal.source_ok:
+                redundancy = sum(1 for edge, score in graph.items() if signal.name in edge and score > 0.8)
+                fitness = self.optimizer.fitness_score(
+                    success_rate=1.0,
+                    latency_ms=signal.latency_ms,
+                    freshness_s=signal.freshness_s,
+                    uptime=signal.uptime,
+                    predictive_power=predictive_power,
+                    redundancy_penalty=float(redundancy),
+                )
+                reward = self.optimizer.update_reward(signal.name, fitness)
+                self._last_fitness[signal.name] = fitness
+            else:
+                # carried forward (late, deferred or open circuit): nothing was fetched, so nothing is rewarded
+                fitness = self._last_fitness.get(signal.name, 0.0)
+                reward = self.optimizer.rewards.get(signal.name, 0.5)
             scored.append(
                 {
                     "agent": signal.name,
                     "domain": signal.domain,
                     "market": signal.market,
                     "value": signal.value,
+                    "freshness_s": round(signal.freshness_s, 3),
                     "fitness": fitness,
                     "reward": reward,
+                    "carried": not signal.source_ok,
                 }
             )
 
+        timer.lap("scoring")
         cull = self.optimizer.cull_candidates()
         detected_issues = []
         health_snapshot: dict[str, dict] = {}
@@ -143,7 +436,8 @@ class ForgeOrchestrator:
             total = max(1, ok + fail)
             fail_ratio = fail / total
             consecutive = int(h.get("consecutive_failures", 0))
-            cooldown_s = min(300, 5 * (2 ** min(6, consecutive))) if consecutive else 0
+            circuit = self.breaker.snapshot(name, now)
+            cooldown_s = circuit["retry_in_s"]
             status = "healthy"
             if consecutive >= 3 or fail_ratio > 0.4:
                 status = "degraded"
@@ -162,8 +456,11 @@ class ForgeOrchestrator:
                 "status": status,
                 "fail_ratio": round(fail_ratio, 3),
                 "predicted_cooldown_s": cooldown_s,
+                "circuit": circuit,
+                "next_fetch_in_s": self.scheduler.next_due_in(name, now),
             }
 
+        timer.lap("health")
         frame = {
             "ts": int(time.time()),
             "runtime": self.config["runtime"],
@@ -171,16 +468,46 @@ class ForgeOrchestrator:
             "domain_summary": self._domain_summary(scored),
             "ui_profile": self.config.get("ui", {}),
             "transfer_entropy_graph": graph,
+            "transfer_entropy_edges": te_edges,
+            "transfer_entropy_stats": te_stats,
+            "transfer_entropy_lags": te_lags,
+            "lead_lag": lead_lag,
+            "transfer_entropy_significance": self._significance,
             "entropy_summary": entropy_summary,
-            "source_resilience": {"agents": health_snapshot, "detected_issues": detected_issues},
+            "source_resilience": {
+                "agents": health_snapshot,
+                "detected_issues": detected_issues,
+                "http_pool": HTTP_POOL.stats(),
+                "http_cache": RESPONSE_CACHE.stats(),
+                "streams": [hub.snapshot() for hub in STREAM_HUBS.values()],
+            },
+            "fetch_stage": {
+                "max_inflight": self.max_inflight_fetches,
+                "deadline_s": self.tick_deadline_s,
+                "late_agents": late_agents,
+                "open_circuits": open_circuits,
+                "deferred_agents": deferred_agents,
+                **self.fetch_stats,
+            },
             "engine_transparency": {
                 "transfer_entropy_formula": "TE(X→Y)=Σ p(y_t+1,y_t,x_t) log2(p(y_t+1|y_t,x_t)/p(y_t+1|y_t))",
                 "black_hole_pipeline": "sliding_entropy -> quantile_gate -> bottleneck_compress(20)",
-                "series_used_for_te": "compressed" if compressed_series else "raw",
+                "series_used_for_te": "raw_online" if self.online_te else ("compressed" if compressed_series else "raw"),
+                "te_resolution": self.te_resolution,
+                "series_levels": list(self.series_levels),
             },
             "cull_candidates": cull,
+            # persist_ms is the latest completed background write; this frame is handed over after it is built
+            "timings": {
+                **timer.as_dict(),
+                "persist_ms": self.persister.stats["last_write_ms"],
+                "persist_bytes": self.persister.stats["last_bytes"],
+            },
         }
-        self._store_cache(frame)
+        with timer.phase("persist"):
+            self._store_cache(frame)
+        METRICS.inc("forge_ticks_total", help_text="Completed ForgeOrchestrator ticks")
+        METRICS.set("forge_agents", len(self.agents), help_text="Configured agents")
         if cull:
             self._broadcast_alert(f"Forge circuit warning: low-reward agents={','.join(cull)}")
         return frame
@@ -197,6 +524,7 @@ def main() -> int:
         frame = orch.tick()
         print(json.dumps(frame, indent=2))
         time.sleep(int(orch.config["engine"]["interval_seconds"]))
+    orch.close()
     return 0
 
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import os
 import re
@@ -13,11 +14,13 @@ from collections import defaultdict, deque
 from pathlib import Path
 from typing import Any
 
-from fastapi import FastAPI, HTTPException, WebSocket
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, HTTPException, Query, Request, WebSocket
+from fastapi.responses import FileResponse, PlainTextResponse, Response
 from pydantic import BaseModel, Field
 
+from core.forge_broadcast import FrameHub
 from core.forge_config import load_config
+from core.forge_metrics import METRICS
 from core.metacognitive_resilience import MetacognitiveResilienceOrchestrator
 from production.forge_orchestrator import ForgeOrchestrator
 
@@ -102,6 +105,12 @@ def _discover_locales() -> list[dict[str, str]]:
     return deduped
 
 
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of ``etag`` against an ``If-None-Match`` list (RFC 9110 §13.1.2)."""
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag.removeprefix("W/") in {tag.removeprefix("W/") for tag in candidates if tag}
+
+
 def _sanitize(value: Any) -> Any:
     if isinstance(value, str):
         return value.encode("utf-8", "replace").decode("utf-8")
@@ -116,9 +125,14 @@ class AgentSpec(BaseModel):
     name: str = Field(..., description="Unique agent name")
     domain: str = Field(..., description="Domain, e.g. finance")
     market: str = Field(..., description="Market identifier, e.g. BTC")
-    source_type: str = Field(..., description="Supported: kraken, binance, open_meteo, alphavantage_commodity")
+    source_type: str = Field(..., description="Supported: kraken, binance, coingecko, open_meteo, alphavantage_commodity, binance_ws, kraken_ws")
     url: str
     weight: float = 1.0
+    interval_seconds: float | None = Field(
+        default=None,
+        gt=0,
+        description="Optional own fetch cadence; defaults to every engine tick and cannot be shorter than engine.interval_seconds",
+    )
     api_key: str | None = Field(default=None, description="Optional API key for protected/external sources")
 
 
@@ -139,6 +153,11 @@ class ForgeRuntime:
         self.base_config, self.paths = load_config(self._config_path)
         self.override_agents_file = self.paths.state_dir / "user_agents.json"
         self.runtime_config_file = self.paths.state_dir / "runtime_config.json"
+        self.mro = MetacognitiveResilienceOrchestrator(
+            self.paths.state_dir / "resilience.db",
+            flush_interval_s=float(self.base_config["engine"].get("mro_flush_interval_seconds", 5.0)),
+            max_events=int(self.base_config["engine"].get("mro_max_events", 20000)),
+        )
         self.orchestrator = self._build_orchestrator()
         self.latest_frame: dict[str, Any] = {
             "signals": [],
@@ -146,6 +165,14 @@ class ForgeRuntime:
             "transfer_entropy_graph": {},
             "runtime": self.base_config.get("runtime", {}),
         }
+        engine_cfg = self.base_config["engine"]
+        # one serialization per tick, shared by every /ws client
+        self.hub = FrameHub(
+            queue_size=int(engine_cfg.get("ws_queue_size", 4)),
+            heartbeat_s=float(engine_cfg.get("ws_heartbeat_seconds", 20)),
+            history=int(engine_cfg.get("ws_delta_history", 32)),
+        )
+        self.hub.publish(self.latest_frame)
         self._worker: threading.Thread | None = None
         self._market_history: dict[str, deque[dict[str, Any]]] = defaultdict(lambda: deque(maxlen=240))
         self._agent_history: dict[str, deque[dict[str, Any]]] = defaultdict(lambda: deque(maxlen=240))
@@ -153,7 +180,8 @@ class ForgeRuntime:
         self._last_alert_ts: dict[str, float] = {}
         self.validation_report_file = self.paths.state_dir / "TPM_test_results.json"
         self.source_index_file = self.paths.state_dir / "source_index.json"
-        self.mro = MetacognitiveResilienceOrchestrator(self.paths.state_dir / "resilience.db")
+        # with/without frame -> (version key, body, etag) of the last /api/dashboard response
+        self._dashboard_cache: dict[bool, tuple[tuple, bytes, str]] = {}
 
     def _load_override_agents(self) -> list[dict]:
         if not self.override_agents_file.exists():
@@ -171,7 +199,7 @@ class ForgeRuntime:
     def _build_orchestrator(self) -> ForgeOrchestrator:
         merged = self._merged_config()
         self.runtime_config_file.write_text(json.dumps(merged, indent=2), encoding="utf-8")
-        return ForgeOrchestrator(self.runtime_config_file)
+        return ForgeOrchestrator(self.runtime_config_file, mro=self.mro)
 
     def list_agents(self) -> list[dict]:
         return self._merged_config().get("agents", [])
@@ -234,7 +262,7 @@ class ForgeRuntime:
     def _validate_spec(self, spec: AgentSpec) -> dict:
         payload = spec.model_dump() if hasattr(spec, "model_dump") else spec.dict()
         source = payload["source_type"]
-        if source not in {"kraken", "binance", "open_meteo", "alphavantage_commodity"}:
+        if source not in {"kraken", "binance", "coingecko", "open_meteo", "alphavantage_commodity", "binance_ws", "kraken_ws"}:
             raise HTTPException(status_code=400, detail=f"unsupported source_type={source}")
 
         url = payload["url"].strip()
@@ -248,6 +276,13 @@ class ForgeRuntime:
                 url = url.replace("apikey=demo", f"apikey={key}")
         payload["url"] = url
         payload.pop("api_key", None)
+        if payload.get("interval_seconds") is None:
+            payload.pop("interval_seconds", None)
+        else:
+            # agents are only scheduled once per engine tick; a shorter interval would silently run at the tick rate
+            tick_s = float(self.base_config["engine"]["interval_seconds"])
+            if payload["interval_seconds"] < tick_s:
+                raise HTTPException(status_code=400, detail=f"interval_seconds must be >= engine interval_seconds ({tick_s:g})")
         return payload
 
     def add_agent(self, spec: AgentSpec) -> None:
@@ -258,21 +293,30 @@ class ForgeRuntime:
             override = self._load_override_agents()
             override.append(self._validate_spec(spec))
             self.override_agents_file.write_text(json.dumps(override, indent=2), encoding="utf-8")
+            previous = self.orchestrator
             self.orchestrator = self._build_orchestrator()
+            previous.close()
 
     def run_tick(self) -> dict:
         with self._lock:
-            self.latest_frame = self.orchestrator.tick()
-            self.latest_frame["agent_count"] = len(self.list_agents())
+            # a new dict: the orchestrator's frame was handed to the write-behind persister and must not change
+            self.latest_frame = {**self.orchestrator.tick(), "agent_count": len(self.list_agents())}
             self._record_live_metrics(self.latest_frame)
+            self.hub.publish(self.latest_frame)
+            return self.latest_frame
+
+    def frame(self, resolution: int | None = None) -> dict[str, Any]:
+        if not resolution:
             return self.latest_frame
+        return {**self.latest_frame, "resolution": resolution, "series": self.orchestrator.series_view(resolution)}
 
     def _record_live_metrics(self, frame: dict[str, Any]) -> None:
         ts = int(frame.get("ts") or time.time())
         for signal in frame.get("signals", []):
             market = str(signal.get("market") or "").upper()
             agent = str(signal.get("agent") or "")
-            if not market or not agent:
+            # a carried-forward value is not a new observation; recording it would flatten outlook and glitch checks
+            if not market or not agent or signal.get("carried"):
                 continue
             point = {
                 "ts": ts,
@@ -446,11 +490,11 @@ class ForgeRuntime:
             "version": 5,
         }
 
-    def source_health(self) -> dict[str, Any]:
+    def source_health(self, mro_status: dict[str, Any] | None = None) -> dict[str, Any]:
         resilience = self.latest_frame.get("source_resilience", {}) if isinstance(self.latest_frame, dict) else {}
         base = resilience if isinstance(resilience, dict) else {"agents": {}, "detected_issues": []}
-        base["mro"] = self.mro.status()
-        return base
+        # a copy: latest_frame is shared with the persister and the broadcast hub
+        return {**base, "mro": mro_status if mro_status is not None else self.mro.status()}
 
 
     def _registration_type(self, source_type: str) -> str:
@@ -570,6 +614,51 @@ class ForgeRuntime:
             })
         return {"generated_at": int(time.time()), "markets": markets}
 
+    @staticmethod
+    def _mtime_ns(path: Path) -> int:
+        try:
+            return path.stat().st_mtime_ns
+        except OSError:
+            return 0
+
+    def dashboard_payload(self, include_frame: bool = True) -> tuple[bytes, str]:
+        """Everything ``refreshAll()`` polls, serialized once per frame version.
+
+        The version is the published frame seq plus the runtime status, the MRO source predictions and the
+        report/index file stamps;
+        until one of them moves, every client gets the same bytes and ETag. Clients that keep the frame in
+        sync through ``/api/frame/stream`` pass ``include_frame=False`` and only get its ``seq``."""
+        # first: a missing index is rebuilt here, which moves its file stamp and the MRO records
+        sources_index = self.source_index()
+        status = self.runtime_status()
+        mro_status = self.mro.status()
+        key = (
+            self.hub.sequence,
+            tuple(sorted(status.items())),
+            # breaker/cooldown predictions move between frames; generated_at alone would defeat the cache
+            json.dumps(mro_status["sources"], sort_keys=True),
+            self._mtime_ns(self.validation_report_file),
+            self._mtime_ns(self.source_index_file),
+        )
+        cached = self._dashboard_cache.get(include_frame)
+        if cached is not None and cached[0] == key:
+            return cached[1], cached[2]
+        payload = {
+            "seq": key[0],
+            "frame": self.latest_frame if include_frame else None,
+            "runtime": status,
+            "markets": self.live_market_snapshot(),
+            "backtest": self.backtest_summary(),
+            "sources_health": self.source_health(mro_status),
+            "sources_index": sources_index,
+            "predictions": self.aggregated_predictions(),
+            "sources_catalog": self._source_catalog(),
+        }
+        body = json.dumps(_sanitize(payload), separators=(",", ":")).encode("utf-8")
+        etag = f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+        self._dashboard_cache[include_frame] = (key, body, etag)
+        return body, etag
+
     def _loop(self) -> None:
         while not self._stop_event.is_set():
             try:
@@ -581,6 +670,7 @@ class ForgeRuntime:
                     interval = 1
             except Exception as exc:
                 self.latest_frame = {"error": str(exc), "ts": int(time.time()), "signals": []}
+                self.hub.publish(self.latest_frame)
                 interval = 5
             self._stop_event.wait(max(1, interval))
 
@@ -594,6 +684,8 @@ class ForgeRuntime:
         self._stop_event.set()
         if self._worker:
             self._worker.join(timeout=2)
+        self.orchestrator.close()
+        self.mro.close()
 
 
 app = FastAPI(title="IrsanAI TPM Forge Runtime")
@@ -601,6 +693,23 @@ runtime = ForgeRuntime()
 HTML_FILE = Path(__file__).resolve().parents[1] / "playground" / "forge_dashboard.html"
 
 
+@app.middleware("http")
+async def _observe_latency(request: Request, call_next):
+    start = time.perf_counter()
+    response = await call_next(request)
+    # label by route template, not raw path, to keep the series count bounded
+    route = getattr(request.scope.get("route"), "path", "unmatched")
+    METRICS.observe(
+        "forge_http_request_duration_seconds",
+        time.perf_counter() - start,
+        "HTTP request latency by endpoint",
+        method=request.method,
+        path=route,
+        status=str(response.status_code),
+    )
+    return response
+
+
 @app.on_event("startup")
 def _startup() -> None:
     runtime.start()
@@ -627,8 +736,29 @@ def index() -> FileResponse:
 
 
 @app.get("/api/frame")
-def api_frame() -> dict:
-    return _sanitize(runtime.latest_frame)
+def api_frame(resolution: int | None = Query(default=None, ge=1, le=10000)) -> dict:
+    return _sanitize(runtime.frame(resolution))
+
+
+@app.get("/api/frame/stream")
+def api_frame_stream(since: int = Query(default=0, ge=0), stream: str = Query(default="")) -> Response:
+    # stream: the id from the client's last message; seq restarts with the process, so a stale id gets a snapshot
+    return Response(runtime.hub.since(since, stream), media_type="application/json")
+
+
+@app.get("/api/dashboard")
+def api_dashboard(request: Request, frame: bool = Query(default=True)) -> Response:
+    body, etag = runtime.dashboard_payload(include_frame=frame)
+    # no-cache: browsers revalidate with If-None-Match and reuse their copy on 304
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+@app.get("/api/metrics")
+def api_metrics() -> PlainTextResponse:
+    return PlainTextResponse(METRICS.render(), media_type="text/plain; version=0.0.4")
 
 
 @app.post("/api/tick")
@@ -723,8 +853,7 @@ def api_add_agent(spec: AgentSpec) -> dict:
 
 
 @app.websocket("/ws")
-async def ws_stream(websocket: WebSocket) -> None:
+async def ws_stream(websocket: WebSocket, mode: str = "full") -> None:
+    # mode=delta: one snapshot, then JSON-patch deltas keyed by seq; send {"type": "resync"} after a gap
     await websocket.accept()
-    while True:
-        await websocket.send_text(json.dumps(runtime.latest_frame))
-        await websocket.receive_text()
+    await runtime.hub.serve(websocket, delta=mode == "delta")
@@ -11,11 +11,13 @@ from pathlib import Path
 from typing import Optional
 
 try:
+    from core.forge_parsers import parser_for, read_limited
     from core.init_db_v2 import init_db_v2
 except ModuleNotFoundError:
     import sys
 
     sys.path.append(str(Path(__file__).resolve().parents[1]))
+    from core.forge_parsers import parser_for, read_limited
     from core.init_db_v2 import init_db_v2
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -127,12 +129,13 @@ class PreflightManager:
             # Preflight still runs with cache-only mode even if DB init fails.
             pass
 
-    def _get_json(self, url: str):
+    def _get_json(self, url: str, source_type: str = ""):
+        parser = parser_for(source_type)
         req = urllib.request.Request(url, headers=self.headers)
         with urllib.request.urlopen(req, timeout=self.timeout) as response:
             code = response.getcode()
-            body = response.read().decode("utf-8")
-        return code, json.loads(body)
+            body = read_limited(response, parser.max_body_bytes)
+        return code, parser.decode(body)
 
     def _post_json(self, url: str, payload: dict):
         body = json.dumps(payload).encode("utf-8")
@@ -180,7 +183,7 @@ class PreflightManager:
                         return {"source": source.name, "price": float(row[0]["d"][0]), "latency": latency, "status": "OK"}
                 return {"source": source.name, "latency": latency, "status": f"HTTP_{code}"}
 
-            code, data = self._get_json(source.url)
+            code, data = self._get_json(source.url, source.type)
             latency = (time.time() - t0) * 1000
             if code != 200:
                 return {"source": source.name, "latency": latency, "status": f"HTTP_{code}"}
@@ -195,9 +198,13 @@ class PreflightManager:
             elif source.type == "binance":
                 price = float(data.get("price", 0) or 0)
             elif source.type == "kraken":
-                pair_data = data.get("result", {}).get("XXBTZUSD", [])
-                if pair_data:
-                    price = float(pair_data[-1][4])
+                # a missing pair or empty candle list is a PARSE_ERROR, as before the parser registry
+                try:
+                    close = parser_for("kraken").extract(data)
+                except ValueError:
+                    close = None
+                if close is not None:
+                    price = float(close)
             elif source.type == "coingecko":
                 price = float(data.get("bitcoin", {}).get("usd", 0) or 0)
 
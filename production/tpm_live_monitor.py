@@ -19,6 +19,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Deque, List, Optional, Tuple
 
+from core.forge_parsers import parser_for
 from core.prediction_oracle import PredictionOracle
 
 
@@ -97,12 +98,9 @@ class TPMEngineAdaptive:
 def get_latest_btc_price(interval_min: int = 60) -> Optional[float]:
     url = f"https://api.kraken.com/0/public/OHLC?pair=XBTUSD&interval={interval_min}"
     try:
-        res = subprocess.run(["curl", "-s", url], capture_output=True, text=True, check=False)
-        data = json.loads(res.stdout)
-        candles = data.get("result", {}).get("XXBTZUSD")
-        if not candles:
-            return None
-        return float(candles[-1][4])
+        res = subprocess.run(["curl", "-s", url], capture_output=True, check=False)
+        parser = parser_for("kraken")
+        return float(parser.extract(parser.decode(res.stdout)))
     except Exception:
         return None
 
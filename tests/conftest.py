@@ -0,0 +1,98 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+ROOT_CONFIG = json.loads((ROOT / "config" / "config.yaml").read_text())
+
+
+class _PriceHandler(BaseHTTPRequestHandler):
+    """Binance-shaped prices from ``server.prices`` (default 100.0); ``server.batch_status`` /
+    ``server.single_status`` force an error status and ``server.delay_s`` holds every response back.
+    Every request is logged in ``server.requests``."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _row(self, symbol):
+        return {"symbol": symbol, "price": str(self.server.prices.get(symbol, 100.0))}
+
+    def do_GET(self):
+        time.sleep(self.server.delay_s)
+        query = parse_qs(urlparse(self.path).query)
+        batched = "symbols" in query
+        status = self.server.batch_status if batched else self.server.single_status
+        self.server.requests.append("batch" if batched else "single")
+        if status != 200:
+            body = {"code": status}
+        elif batched:
+            body = [self._row(symbol) for symbol in json.loads(query["symbols"][0])]
+        else:
+            body = self._row(query["symbol"][0])
+        raw = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+
+@pytest.fixture
+def price_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _PriceHandler)
+    server.batch_status = 200
+    server.single_status = 200
+    server.prices = {}
+    server.delay_s = 0.0
+    server.requests = []
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def make_orchestrator(tmp_path, price_server):
+    """Factory for orchestrators over ``agents`` Binance agents ``A0..`` (symbols ``S0..``) on ``price_server``.
+
+    ``engine`` entries override the root config; extra keyword arguments go into every agent spec."""
+    from production.forge_orchestrator import ForgeOrchestrator
+
+    built = []
+
+    def factory(agents: int = 3, engine: dict | None = None, **agent_spec):
+        config = json.loads(json.dumps(ROOT_CONFIG))
+        config["platform"].update(cache_dir=str(tmp_path / "state"), data_dir=str(tmp_path / "data"), logs_dir=str(tmp_path / "logs"))
+        config["engine"]["http_cache_ttl_seconds"] = {}
+        config["engine"].update(engine or {})
+        config["agents"] = [
+            {
+                "name": f"A{i}",
+                "domain": "finance",
+                "market": f"M{i}",
+                "source_type": "binance",
+                "url": f"{price_server.url}/api/v3/ticker/price?symbol=S{i}",
+                **agent_spec,
+            }
+            for i in range(agents)
+        ]
+        config_path = tmp_path / f"config{len(built)}.json"
+        config_path.write_text(json.dumps(config))
+        built.append(ForgeOrchestrator(config_path))
+        return built[-1]
+
+    yield factory
+    for orchestrator in built:
+        orchestrator.close()
@@ -0,0 +1,55 @@
+import json
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from core.forge_agents import DynamicAgentFactory
+from core.forge_batching import PROVIDER_BATCHES, ProviderBatcher
+
+
+def _agents(source_type, urls):
+    return DynamicAgentFactory.build(
+        [{"name": f"A{i}", "domain": "d", "market": f"M{i}", "source_type": source_type, "url": url} for i, url in enumerate(urls)]
+    )
+
+
+def _meteo(lat, lon):
+    return f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={lon}&current=temperature_2m"
+
+
+def test_same_provider_agents_share_one_request_per_chunk():
+    agents = _agents("binance", [f"https://api.binance.com/api/v3/ticker/price?symbol=S{i}" for i in range(5)])
+    jobs = ProviderBatcher(max_batch=2).plan(agents)
+    assert [[agent.name for agent in job.agents] for job in jobs] == [["A0", "A1"], ["A2", "A3"], ["A4"]]
+    assert json.loads(parse_qs(urlsplit(jobs[0].url).query)["symbols"][0]) == ["S0", "S1"]
+    # a chunk of one keeps the agent's own URL
+    assert jobs[2].url == agents[4].spec["url"] and jobs[2].batch_key is None
+
+
+def test_unbatchable_and_rejected_groups_get_single_requests():
+    coingecko = _agents("coingecko", ["https://api.coingecko.com/api/v3/simple/price?ids=a,b&vs_currencies=usd"] * 1)
+    batcher = ProviderBatcher()
+    assert [job.batch_key for job in batcher.plan(coingecko)] == [None]
+    meteo = _agents("open_meteo", [_meteo(52.52, 13.41), _meteo(48.14, 11.58)])
+    (job,) = batcher.plan(meteo)
+    batcher.reject(job)
+    assert [job.url for job in batcher.plan(meteo)] == [agent.spec["url"] for agent in meteo]
+
+
+def test_open_meteo_rows_are_matched_on_location_not_position():
+    meteo = _agents("open_meteo", [_meteo(52.52, 13.41), _meteo(48.14, 11.58), _meteo(40.71, -74.01)])
+    fan_out = PROVIDER_BATCHES["open_meteo"].fan_out
+    # reordered, snapped to grid-cell centres, and New York missing
+    payload = [
+        {"latitude": 48.14, "longitude": 11.575, "current": {"temperature_2m": 9.0}},
+        {"latitude": 52.52, "longitude": 13.419998, "current": {"temperature_2m": 4.0}},
+    ]
+    parts = fan_out(payload, meteo)
+    assert {name: row["current"]["temperature_2m"] for name, row in parts.items()} == {"A0": 4.0, "A1": 9.0}
+
+
+def test_binance_rows_are_matched_on_symbol():
+    agents = _agents("binance", [f"https://api.binance.com/api/v3/ticker/price?symbol=S{i}" for i in range(3)])
+    parts = PROVIDER_BATCHES["binance"].fan_out([{"symbol": "S2", "price": "3"}, {"symbol": "S0", "price": "1"}], agents)
+    assert parts == {"A0": {"symbol": "S0", "price": "1"}, "A2": {"symbol": "S2", "price": "3"}}
+    assert agents[0].signal_from_payload(parts["A0"], 0.0).value == pytest.approx(1.0)
@@ -0,0 +1,64 @@
+import asyncio
+import json
+
+from core.forge_broadcast import FrameHub
+
+
+class _Socket:
+    """Records sent frames; ``send_text`` waits for ``gate`` (a slow client) and ``receive_text`` for close."""
+
+    def __init__(self, gate=None):
+        self.sent = []
+        self.gate = gate
+        self.closed = asyncio.Event()
+
+    async def send_text(self, text):
+        if self.gate is not None:
+            await self.gate.wait()
+        self.sent.append(json.loads(text))
+
+    async def receive_text(self):
+        await self.closed.wait()
+        raise ConnectionError("closed")
+
+
+def test_slow_client_gets_the_newest_frames_without_holding_back_others():
+    async def scenario():
+        hub = FrameHub(queue_size=2)
+        fast, slow = _Socket(), _Socket(gate=asyncio.Event())
+        served = [asyncio.ensure_future(hub.serve(fast)), asyncio.ensure_future(hub.serve(slow))]
+        await asyncio.sleep(0.01)
+        assert hub.clients == 2
+        for i in range(10):
+            hub.publish({"i": i})
+            await asyncio.sleep(0.01)
+        slow.gate.set()
+        await asyncio.sleep(0.05)
+        for socket in (fast, slow):
+            socket.closed.set()
+        await asyncio.gather(*served)
+        return hub, fast, slow
+
+    hub, fast, slow = asyncio.run(scenario())
+    assert [frame["i"] for frame in fast.sent] == list(range(10))
+    # blocked on frame 0 while 1..9 arrived: only the newest queue_size frames are kept
+    assert [frame["i"] for frame in slow.sent] == [0, 8, 9]
+    assert hub.stats["dropped"] == 7
+    assert hub.stats["published"] == 10
+    assert hub.clients == 0
+
+
+def test_client_connecting_late_starts_from_the_latest_frame():
+    async def scenario():
+        hub = FrameHub()
+        for i in range(3):
+            hub.publish({"i": i})
+        socket = _Socket()
+        served = asyncio.ensure_future(hub.serve(socket, delta=True))
+        await asyncio.sleep(0.01)
+        socket.closed.set()
+        await served
+        return hub, socket
+
+    hub, socket = asyncio.run(scenario())
+    assert socket.sent == [{"type": "snapshot", "stream": hub.stream_id, "seq": 3, "frame": {"i": 2}}]
@@ -0,0 +1,52 @@
+from core.forge_circuit import CircuitBreaker
+
+
+def test_circuit_opens_after_threshold_and_waits_out_the_cooldown():
+    breaker = CircuitBreaker(failure_threshold=3, cooldown_s=45.0)
+    for _ in range(2):
+        breaker.record_failure("a", "src", now=100.0)
+    assert breaker.allow("a", 100.0)
+    breaker.record_failure("a", "src", now=100.0)
+    assert breaker.snapshot("a", 110.0)["state"] == "open"
+    assert breaker.snapshot("a", 110.0)["retry_in_s"] == 35.0
+    assert not breaker.allow("a", 144.0)
+    assert breaker.circuits["a"].skipped == 1
+
+
+def test_half_open_allows_a_single_probe():
+    breaker = CircuitBreaker(failure_threshold=1, cooldown_s=10.0)
+    breaker.record_failure("a", "src", now=1000.0)
+    assert breaker.allow("a", 1010.0)
+    assert breaker.circuits["a"].state == "half_open"
+    # the probe is still out: nobody else reaches the failing source
+    assert not breaker.allow("a", 1011.0)
+    assert not breaker.allow("a", 1012.0)
+    breaker.record_success("a")
+    assert breaker.circuits["a"].state == "closed"
+    assert breaker.allow("a", 1013.0)
+    assert breaker.allow("a", 1013.0)
+
+
+def test_failed_probe_reopens_the_circuit():
+    breaker = CircuitBreaker(failure_threshold=3, cooldown_s=10.0)
+    for _ in range(3):
+        breaker.record_failure("a", "src", now=1000.0)
+    assert breaker.allow("a", 1010.0)
+    breaker.record_failure("a", "src", now=1010.0)
+    circuit = breaker.circuits["a"]
+    assert (circuit.state, circuit.trips, circuit.probing) == ("open", 2, False)
+    assert not breaker.allow("a", 1019.0)
+    assert breaker.allow("a", 1020.0)
+
+
+def test_predicted_cooldown_is_clamped():
+    predictions = {"short": 1.0, "long": 9000.0, "mid": 120.0}
+    breaker = CircuitBreaker(
+        failure_threshold=1,
+        cooldown_s=45.0,
+        max_cooldown_s=300.0,
+        predictor=lambda source: {"predicted_cooldown_s": predictions[source]},
+    )
+    for source in predictions:
+        breaker.record_failure(source, source, now=1000.0)
+    assert {name: c.cooldown_s for name, c in breaker.circuits.items()} == {"short": 45.0, "long": 300.0, "mid": 120.0}
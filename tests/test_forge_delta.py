@@ -0,0 +1,85 @@
+import json
+import random
+
+import pytest
+
+from core.forge_broadcast import FrameHub
+from core.forge_delta import apply_patch, frame_diff
+
+_KEYS = ["a", "b", "c/d", "e~f", "", "0"]
+
+
+def _value(rng, depth=0):
+    kind = rng.randrange(7 if depth < 3 else 4)
+    if kind == 0:
+        return rng.choice([None, True, False])
+    if kind == 1:
+        return rng.randint(-3, 3)
+    if kind == 2:
+        return rng.choice([0.5, 1.0, -2.25])
+    if kind == 3:
+        return rng.choice(["", "x", "y/z"])
+    if kind in (4, 5):
+        return {key: _value(rng, depth + 1) for key in rng.sample(_KEYS, rng.randint(0, len(_KEYS)))}
+    return [_value(rng, depth + 1) for _ in range(rng.randint(0, 3))]
+
+
+def _mutate(rng, value, depth=0):
+    if isinstance(value, dict) and rng.random() < 0.8:
+        out = {k: (_mutate(rng, v, depth + 1) if rng.random() < 0.5 else v) for k, v in value.items() if rng.random() < 0.9}
+        if rng.random() < 0.3:
+            out[rng.choice(_KEYS)] = _value(rng, depth + 1)
+        return out
+    if isinstance(value, list) and rng.random() < 0.8:
+        return [_mutate(rng, v, depth + 1) if rng.random() < 0.5 else v for v in value]
+    return _value(rng, depth) if rng.random() < 0.5 else value
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_apply_patch_round_trips_frame_diff(seed):
+    rng = random.Random(seed)
+    prev = _value(rng)
+    cur = _mutate(rng, prev)
+    before = json.dumps(prev, sort_keys=True)
+    patched = apply_patch(prev, frame_diff(prev, cur))
+    assert json.dumps(patched, sort_keys=True) == json.dumps(cur, sort_keys=True)
+    assert json.dumps(prev, sort_keys=True) == before
+
+
+def test_chained_deltas_from_since_rebuild_every_published_frame():
+    rng = random.Random(1)
+    hub = FrameHub(history=4)
+    frame = {"ts": 0, "signals": [{"name": f"a{i}", "p": 0.5} for i in range(20)], "graph": {}}
+    published = []
+    for tick in range(1, 25):
+        frame = json.loads(json.dumps(frame))
+        frame["ts"] = tick
+        frame["signals"][rng.randrange(20)]["p"] = rng.random()
+        if tick % 3 == 0:
+            frame["graph"][f"n/{tick}"] = tick
+        hub.publish(frame)
+        published.append(json.loads(json.dumps(frame)))
+        for base in range(max(1, tick - 5), tick + 1):
+            msg = json.loads(hub.since(base, hub.stream_id))
+            if msg["type"] == "snapshot":
+                assert msg["frame"] == frame
+                continue
+            assert (msg["base"], msg["seq"]) == (base, tick)
+            assert apply_patch(published[base - 1], msg["ops"]) == frame
+
+
+def test_since_from_another_stream_gets_a_snapshot():
+    old, new = FrameHub(), FrameHub()
+    signals = [{"name": f"a{i}", "p": 0.5} for i in range(20)]
+    for tick in range(1, 4):
+        old.publish({"ts": tick, "signals": signals, "value": 1})
+    new.publish({"ts": 1, "signals": signals, "value": 2})
+    new.publish({"ts": 2, "signals": signals, "value": 2})
+    assert old.stream_id != new.stream_id
+    # a client of the previous process still holds seq 1, which is also a valid base in the new one
+    msg = json.loads(new.since(1, old.stream_id))
+    assert (msg["type"], msg["stream"], msg["seq"]) == ("snapshot", new.stream_id, 2)
+    assert msg["frame"] == {"ts": 2, "signals": signals, "value": 2}
+    msg = json.loads(new.since(1, new.stream_id))
+    assert (msg["type"], msg["stream"], msg["base"], msg["seq"]) == ("delta", new.stream_id, 1, 2)
+    assert json.loads(new.since(1))["type"] == "snapshot"
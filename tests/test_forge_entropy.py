@@ -0,0 +1,314 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from core.forge_entropy import EntropySignalEngine, OnlineTransferEntropy, TransferEntropyEngine
+# the per-sample dict estimator the bincount kernel replaced
+from scripts.te_benchmark import reference_te
+
+
+def _series(rng, kind, n):
+    if kind == "walk":
+        return np.cumsum(rng.normal(size=n)).tolist()
+    if kind == "ticks":
+        return (100 + rng.integers(0, 5, size=n) * 0.25).tolist()
+    if kind == "flat":
+        values = np.full(n, 42.0)
+        values[n // 2 :] += rng.normal(size=n - n // 2)
+        return values.tolist()
+    return rng.uniform(-1e6, 1e6, size=n).tolist()
+
+
+def _reference_windows(engine, seq, window, stride):
+    return [engine.shannon_entropy(seq[i : i + window]) for i in range(0, len(seq) - window + 1, stride)]
+
+
+def _reference_black_hole_filter(engine, seq, window, stride, entropy_quantile=0.70, out_points=20):
+    # the per-window gate as it was before vectorization
+    series = [float(v) for v in seq]
+    entropies = []
+    windows = []
+    for i in range(0, len(series) - window + 1, max(1, stride)):
+        chunk = series[i : i + window]
+        windows.append(chunk)
+        entropies.append(engine.shannon_entropy(chunk))
+    threshold = float(np.quantile(np.asarray(entropies, dtype=float), min(1.0, max(0.0, entropy_quantile))))
+    selected = []
+    for chunk, h in zip(windows, entropies):
+        if h >= threshold:
+            selected.extend(chunk)
+    if not selected:
+        selected = series[-window:]
+    compressed = engine.bottleneck_compress(selected, out_points=out_points)
+    return {"filtered": selected, "compressed": compressed, "threshold": threshold}
+
+
+@pytest.mark.parametrize("n", [4, 20, 60, 1000])
+@pytest.mark.parametrize("lag", [1, 2])
+@pytest.mark.parametrize("bins", [4, 12])
+@pytest.mark.parametrize("kind", ["walk", "ticks", "flat", "uniform"])
+def test_te_kernel_matches_reference_estimator(n, lag, bins, kind):
+    rng = np.random.default_rng(n + lag + bins)
+    x = _series(rng, kind, n)
+    y = (np.roll(np.asarray(x), 1) + rng.normal(scale=0.5, size=n)).tolist()
+    engine = TransferEntropyEngine(bins=bins, lag=lag)
+    assert engine.calculate_transfer_entropy(x, y) == pytest.approx(reference_te(x, y, bins, lag), abs=1e-12)
+    assert engine.calculate_transfer_entropy(y, x[: n // 2]) == pytest.approx(reference_te(y, x[: n // 2], bins, lag), abs=1e-12)
+
+
+@pytest.mark.parametrize("bins", [4, 12, 20, 200])
+@pytest.mark.parametrize("kind", ["walk", "ticks", "flat", "uniform"])
+def test_vectorized_sliding_entropy_matches_per_window_reference(bins, kind):
+    rng = np.random.default_rng(bins * 31 + len(kind))
+    engine = EntropySignalEngine(bins=bins)
+    for _ in range(20):
+        seq = _series(rng, kind, int(rng.integers(50, 400)))
+        window = int(rng.integers(8, 49))
+        stride = int(rng.integers(1, 11))
+        got = engine.sliding_entropy(seq, window=window, stride=stride)
+        want = _reference_windows(engine, seq, window, stride)
+        assert got == want
+
+
+@pytest.mark.parametrize("kind", ["walk", "ticks", "flat", "uniform"])
+def test_black_hole_filter_matches_the_per_window_gate(kind):
+    rng = np.random.default_rng(7)
+    for _ in range(300):
+        engine = EntropySignalEngine(bins=int(rng.choice([4, 8, 12, 20, 64, 200])))
+        seq = _series(rng, kind, int(rng.integers(60, 600)))
+        window = int(rng.integers(8, 49))
+        stride = int(rng.integers(1, 11))
+        quantile = float(rng.choice([0.0, 0.5, 0.7, 0.9, 1.0]))
+        got = engine.black_hole_filter(seq, window=window, stride=stride, entropy_quantile=quantile)
+        assert got == _reference_black_hole_filter(engine, seq, window, stride, entropy_quantile=quantile)
+
+
+def test_black_hole_filter_matches_on_orchestrator_shaped_input():
+    # 60 tick-size prices, window 20, stride 5, 12 bins: what ForgeOrchestrator.tick feeds the gate
+    rng = np.random.default_rng(11)
+    engine = EntropySignalEngine(bins=12)
+    for _ in range(2000):
+        seq = (100 + np.cumsum(rng.integers(-2, 3, size=60)) * 0.25).tolist()
+        got = engine.black_hole_filter(seq, window=20, stride=5, out_points=20)
+        assert got == _reference_black_hole_filter(engine, seq, 20, 5)
+
+
+def test_black_hole_filter_reuses_window_entropies_of_a_rolling_series(monkeypatch):
+    rng = np.random.default_rng(8)
+    engine = EntropySignalEngine(bins=12)
+    stream = _series(rng, "walk", 300)
+    computed = []
+    kernel = engine._window_entropies
+    monkeypatch.setattr(engine, "_window_entropies", lambda windows: computed.append(len(windows)) or kernel(windows))
+    cache = {}
+    for end in range(1, len(stream) + 1):
+        start = max(0, end - 60)
+        seq = stream[start:end]
+        window = min(40, max(8, len(seq) // 3))
+        got = engine.black_hole_filter(seq, window=window, stride=5, offset=start, cache=cache)
+        assert got == EntropySignalEngine(bins=12).black_hole_filter(seq, window=window, stride=5)
+    # once the window is full, each new point adds at most one window per stride alignment
+    assert max(computed[-200:]) == 1
+    # one entry per window start still inside the series, across all stride alignments
+    assert len(cache) == 60 - 20 + 1
+
+
+@pytest.mark.parametrize("lag", [1, 2])
+def test_online_te_matrix_equals_batch_on_the_same_window(lag):
+    rng = np.random.default_rng(3 + lag)
+    names = [f"a{i}" for i in range(6)]
+    window, ticks = 30, 150
+    values = rng.uniform(0.0, 1.0, size=(ticks, len(names)))
+    values[1:, 1] = np.clip(values[:-1, 0] + rng.normal(0, 0.05, ticks - 1), 0, 1)
+    # every window holds both ends of the range fitted at warmup, so online and batch bin codes agree
+    values[::7] = 0.0
+    values[3::7] = 1.0
+    online = OnlineTransferEntropy(bins=12, lag=lag, window=window, margin=0.0)
+    batch = TransferEntropyEngine(bins=12, lag=lag)
+    for t in range(ticks):
+        online.update(dict(zip(names, values[t])))
+        if t < window:
+            continue
+        got_names, got = online.matrix()
+        recent = {name: values[t - window + 1 : t + 1, i].tolist() for i, name in enumerate(names)}
+        want_names, want = batch.transfer_entropy_matrix(recent)
+        assert got_names == want_names
+        np.testing.assert_allclose(got, want, rtol=0, atol=1e-9)
+    assert want[0, 1] > 0.1
+    assert online.stats["refits"] == 0
+
+
+def _recounted_te(online, ticks, src, dst):
+    # TE over the states retained in the window, recounted from raw ticks with the online bin edges
+    def code(tick, name):
+        if name not in tick:
+            return None
+        lo, step = online._edges[name]
+        return min(online.bins - 1, max(0, int((tick[name] - lo) / step)))
+
+    states = []
+    for prev, cur in zip(ticks[-online.window : -1], ticks[-online.window + 1 :]):
+        x, y, y1 = code(prev, src), code(prev, dst), code(cur, dst)
+        if None not in (x, y, y1):
+            states.append((y1, y, x))
+    states = states[online.lag :]
+    if len(states) < 2:
+        return 0.0
+    joint = Counter(states)
+    yz = Counter((y, x) for _, y, x in states)
+    xy = Counter((y1, y) for y1, y, _ in states)
+    y_only = Counter(y for _, y, _ in states)
+    te = sum(n / len(states) * np.log2((n / yz[(y, x)]) / (xy[(y1, y)] / y_only[y])) for (y1, y, x), n in joint.items())
+    return max(0.0, te)
+
+
+@pytest.mark.parametrize("lag", [0, 1, 2])
+def test_online_te_with_reporting_gaps_matches_a_recount_of_the_window(lag):
+    rng = np.random.default_rng(20 + lag)
+    names = [f"a{i}" for i in range(5)]
+    online = OnlineTransferEntropy(bins=6, lag=lag, window=25)
+    ticks = []
+    paths = np.cumsum(rng.normal(size=(120, len(names))), axis=0)
+    for t in range(120):
+        ticks.append({name: paths[t, i] for i, name in enumerate(names) if rng.random() < 0.75})
+        online.update(ticks[-1])
+        if t < 30:
+            continue
+        got_names, got = online.matrix()
+        for i, src in enumerate(got_names):
+            for j, dst in enumerate(got_names):
+                want = 0.0 if i == j else _recounted_te(online, ticks, src, dst)
+                assert got[i, j] == pytest.approx(want, abs=1e-9)
+    assert online.stats["refits"] > 0
+
+
+def test_online_te_refits_trending_series_in_batches():
+    rng = np.random.default_rng(0)
+    names = [f"a{i}" for i in range(20)]
+    window, ticks = 60, 200
+    paths = 100 + np.cumsum(rng.normal(0.05, 1.0, size=(ticks, len(names))), axis=0)
+    online = OnlineTransferEntropy(bins=12, window=window)
+    for t in range(ticks):
+        online.update(dict(zip(names, paths[t])))
+    # one full build at warmup, then at most one replay per quarter window
+    assert online.stats["refits"] > 0
+    assert online.stats["rebuilds"] <= 2 + ticks // (window // 4)
+
+
+def _te_series(seed, count=4, n=200):
+    rng = np.random.default_rng(seed)
+    walks = np.cumsum(rng.normal(size=(count, n)), axis=1)
+    walks[1, 1:] = walks[0, :-1] + rng.normal(scale=0.3, size=n - 1)
+    return {f"a{i}": walks[i].tolist() for i in range(count)}
+
+
+def test_parallel_te_matrix_equals_serial_and_frees_shared_memory(monkeypatch):
+    from core import forge_entropy
+
+    created = []
+
+    class _Recording(forge_entropy.shared_memory.SharedMemory):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            created.append(self.name)
+
+    monkeypatch.setattr(forge_entropy.shared_memory, "SharedMemory", _Recording)
+    series = _te_series(11)
+    serial_names, serial = TransferEntropyEngine(bins=12).transfer_entropy_matrix(series)
+    engine = TransferEntropyEngine(bins=12, workers=2, parallel_min_agents=2)
+    try:
+        names, matrix = engine.transfer_entropy_matrix(series)
+        assert engine._pool is not None
+    finally:
+        engine.close()
+    assert names == serial_names
+    assert np.array_equal(matrix, serial)
+    assert serial[0, 1] > 0.1
+    assert len(created) == 1
+    with pytest.raises(FileNotFoundError):
+        forge_entropy.shared_memory.SharedMemory(name=created[0])
+
+
+def test_parallel_te_matrix_falls_back_in_process(monkeypatch):
+    from core import forge_entropy
+
+    series = _te_series(12)
+    _, serial = TransferEntropyEngine(bins=12).transfer_entropy_matrix(series)
+
+    def _no_shm(*args, **kwargs):
+        raise OSError("no /dev/shm")
+
+    monkeypatch.setattr(forge_entropy.shared_memory, "SharedMemory", _no_shm)
+    engine = TransferEntropyEngine(bins=12, workers=2, parallel_min_agents=2)
+    _, matrix = engine.transfer_entropy_matrix(series)
+    assert engine._pool is None
+    assert np.array_equal(matrix, serial)
+
+    class _BrokenPool:
+        def submit(self, *args, **kwargs):
+            raise forge_entropy.BrokenProcessPool("worker died")
+
+        def shutdown(self, **kwargs):
+            pass
+
+    monkeypatch.undo()
+    engine._pool = _BrokenPool()
+    _, matrix = engine.transfer_entropy_matrix(series)
+    assert engine._pool is None
+    assert np.array_equal(matrix, serial)
+
+
+@pytest.mark.parametrize("lengths", [(200, 200, 200, 200), (200, 150, 200, 40), (20, 200, 12, 200)])
+def test_te_matrix_equals_pairwise_estimates(lengths):
+    series = {name: values[:n] for (name, values), n in zip(_te_series(13).items(), lengths)}
+    engine = TransferEntropyEngine(bins=8, lag=1)
+    names, matrix = engine.transfer_entropy_matrix(series)
+    assert names == list(series)
+    for i, src in enumerate(names):
+        for j, dst in enumerate(names):
+            want = 0.0 if i == j else engine.calculate_transfer_entropy(series[src], series[dst])
+            assert matrix[i, j] == pytest.approx(want, abs=1e-12)
+    assert engine.correlation_graph(series) == engine.graph_from_matrix(names, matrix)
+
+
+def test_sparse_te_keeps_the_dense_top_k_sources_per_destination():
+    series = _te_series(14, count=6)
+    engine = TransferEntropyEngine(bins=8)
+    names, dense = engine.transfer_entropy_matrix(series)
+    sparse = engine.sparse_transfer_entropy(series, top_k=2, candidates=5)
+    assert (sparse["pairs_total"], sparse["pairs_evaluated"], sparse["pairs_pruned"]) == (30, 30, 0)
+    assert [edge["te"] for edge in sparse["edges"]] == sorted((edge["te"] for edge in sparse["edges"]), reverse=True)
+    for j, dst in enumerate(names):
+        kept = {edge["src"] for edge in sparse["edges"] if edge["dst"] == dst}
+        ranked = [i for i in np.argsort(-dense[:, j], kind="stable") if i != j]
+        assert kept == {names[i] for i in ranked[:2]}
+    assert ("a0", "a1") in {(edge["src"], edge["dst"]) for edge in sparse["edges"]}
+
+    screened = engine.sparse_transfer_entropy(series, top_k=2, mi_threshold=0.5, candidates=5)
+    assert screened["pairs_evaluated"] < 30
+    assert all(edge["mi"] >= 0.5 for edge in screened["edges"])
+
+
+def test_surrogate_test_gates_the_pool_and_falls_back_in_process():
+    from core import forge_entropy
+
+    series = _te_series(15)
+    serial = TransferEntropyEngine(bins=8).surrogate_test(series, surrogates=20, seed=3)
+    assert serial["a0->a1"]["p_value"] < 0.1
+
+    small = TransferEntropyEngine(bins=8, workers=2)
+    assert small.surrogate_test(series, surrogates=20, seed=3) == serial
+    assert small._pool is None
+
+    class _BrokenPool:
+        def submit(self, *args, **kwargs):
+            raise forge_entropy.BrokenProcessPool("worker died")
+
+        def shutdown(self, **kwargs):
+            pass
+
+    engine = TransferEntropyEngine(bins=8, workers=2, parallel_min_agents=2)
+    engine._pool = _BrokenPool()
+    assert engine.surrogate_test(series, surrogates=20, seed=3) == serial
+    assert engine._pool is None
@@ -0,0 +1,35 @@
+import urllib.error
+
+import pytest
+
+from core.forge_http import HTTPConnectionPool
+
+
+@pytest.fixture(autouse=True)
+def _no_proxy(monkeypatch):
+    for name in ("http_proxy", "HTTP_PROXY", "https_proxy", "HTTPS_PROXY", "no_proxy", "NO_PROXY"):
+        monkeypatch.delenv(name, raising=False)
+
+
+def test_sequential_requests_reuse_one_keep_alive_connection(price_server):
+    pool = HTTPConnectionPool()
+    url = f"{price_server.url}/api/v3/ticker/price?symbol=S0"
+    for _ in range(3):
+        status, _, body = pool.get(url)
+        assert status == 200 and b'"S0"' in body
+    assert pool.stats()["127.0.0.1"] == {"new": 1, "reused": 2, "evicted": 0, "retried": 0, "idle": 1}
+    pool.close()
+
+
+def test_error_status_raises_and_idle_connections_expire(price_server):
+    pool = HTTPConnectionPool(idle_timeout_s=-1.0)
+    url = f"{price_server.url}/api/v3/ticker/price?symbol=S0"
+    price_server.single_status = 503
+    with pytest.raises(urllib.error.HTTPError) as raised:
+        pool.get(url)
+    assert raised.value.code == 503
+    price_server.single_status = 200
+    pool.get(url)
+    stats = pool.stats()["127.0.0.1"]
+    assert (stats["new"], stats["reused"], stats["evicted"]) == (2, 0, 1)
+    pool.close()
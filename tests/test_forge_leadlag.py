@@ -0,0 +1,36 @@
+import numpy as np
+
+from core.forge_leadlag import LeadLagEngine
+
+
+def _leader_follower(seed, n=300, lag=3):
+    rng = np.random.default_rng(seed)
+    moves = rng.normal(size=n + lag)
+    leader = 100 + np.cumsum(moves[lag:])
+    follower = 100 + np.cumsum(moves[:n] + rng.normal(scale=0.2, size=n))
+    return leader.tolist(), follower.tolist()
+
+
+def test_pair_keeps_its_window_when_a_short_series_joins():
+    leader, follower = _leader_follower(0)
+    engine = LeadLagEngine(max_lag=10)
+    alone = {"lead": leader, "follow": follower}
+    names, corr, lag = engine.matrix(alone)
+    rng = np.random.default_rng(1)
+    newcomer = (100 + np.cumsum(rng.normal(size=10))).tolist()
+    got_names, got_corr, got_lag = engine.matrix({**alone, "new": newcomer})
+    assert got_names == ["lead", "follow", "new"]
+    np.testing.assert_array_equal(got_corr[:2, :2], corr)
+    np.testing.assert_array_equal(got_lag[:2, :2], lag)
+    assert engine.edges({**alone, "new": newcomer}, 0.5)["lead->follow"]["lag"] == 3
+
+
+def test_unequal_pair_uses_its_common_overlap():
+    leader, follower = _leader_follower(2)
+    engine = LeadLagEngine(max_lag=10)
+    _, corr, lag = engine.matrix({"lead": leader, "follow": follower[-120:]})
+    _, want_corr, want_lag = engine.matrix({"lead": leader[-120:], "follow": follower[-120:]})
+    np.testing.assert_allclose(corr, want_corr, rtol=0, atol=1e-12)
+    np.testing.assert_array_equal(lag, want_lag)
+    assert lag[0, 1] == 3
+    assert lag[1, 0] == -3
@@ -0,0 +1,35 @@
+from core.forge_metrics import MetricsRegistry, PhaseTimer
+
+
+def test_registry_renders_cumulative_histograms_counters_and_gauges():
+    registry = MetricsRegistry()
+    for seconds in (0.002, 0.002, 0.3, 60.0):
+        registry.observe("req_seconds", seconds, "Request time", source="a")
+    registry.inc("ticks_total", help_text="Ticks")
+    registry.inc("ticks_total", 2)
+    registry.set("agents", 3, help_text="Agents")
+    lines = registry.render().splitlines()
+    assert "# TYPE req_seconds histogram" in lines
+    assert 'req_seconds_bucket{source="a",le="0.001"} 0' in lines
+    assert 'req_seconds_bucket{source="a",le="0.005"} 2' in lines
+    assert 'req_seconds_bucket{source="a",le="30.0"} 3' in lines
+    assert 'req_seconds_bucket{source="a",le="+Inf"} 4' in lines
+    assert 'req_seconds_count{source="a"} 4' in lines
+    assert ["# HELP ticks_total Ticks", "# TYPE ticks_total counter", "ticks_total 3.0"] == lines[lines.index("# HELP ticks_total Ticks") :][:3]
+    assert "agents 3.0" in lines
+
+
+def test_phase_timer_accumulates_laps_and_mirrors_them_into_the_registry():
+    registry = MetricsRegistry()
+    timer = PhaseTimer(registry, metric="phase_seconds")
+    timer.lap("fetch")
+    with timer.phase("persist"):
+        pass
+    with timer.phase("persist"):
+        pass
+    timings = timer.as_dict()
+    assert set(timings) == {"fetch_ms", "persist_ms", "total_ms"}
+    assert timings["total_ms"] >= timings["fetch_ms"] + timings["persist_ms"] - 1e-3
+    rendered = registry.render()
+    assert 'phase_seconds_count{phase="fetch"} 1' in rendered
+    assert 'phase_seconds_count{phase="persist"} 2' in rendered
@@ -0,0 +1,108 @@
+import time
+
+
+def test_rate_limited_batch_is_kept(make_orchestrator, price_server):
+    orchestrator = make_orchestrator()
+    price_server.batch_status = 429
+    orchestrator.tick()
+    assert not orchestrator.batcher.rejected
+    price_server.batch_status = 200
+    price_server.requests.clear()
+    frame = orchestrator.tick()
+    assert price_server.requests == ["batch"]
+    assert frame["fetch_stage"]["batched_agents"] == 3
+
+
+def test_malformed_batch_falls_back_to_single_requests(make_orchestrator, price_server):
+    orchestrator = make_orchestrator()
+    price_server.batch_status = 400
+    orchestrator.tick()
+    assert len(orchestrator.batcher.rejected) == 1
+    price_server.requests.clear()
+    frame = orchestrator.tick()
+    assert price_server.requests == ["single"] * 3
+    assert frame["fetch_stage"]["batched_requests"] == 0
+    assert [signal["value"] for signal in frame["signals"]] == [100.0] * 3
+
+
+def test_carried_signals_are_not_rescored(make_orchestrator, price_server):
+    orchestrator = make_orchestrator(interval_seconds=3600)
+    first = orchestrator.tick()
+    rewards = dict(orchestrator.optimizer.rewards)
+    frame = orchestrator.tick()
+    assert frame["fetch_stage"]["deferred_agents"] == ["A0", "A1", "A2"]
+    assert all(signal["carried"] for signal in frame["signals"])
+    assert not any(signal["carried"] for signal in first["signals"])
+    assert orchestrator.optimizer.rewards == rewards
+    assert [s["fitness"] for s in frame["signals"]] == [s["fitness"] for s in first["signals"]]
+
+
+def test_failed_fetch_of_scheduled_agent_is_retried_next_tick(make_orchestrator, price_server):
+    orchestrator = make_orchestrator(interval_seconds=3600)
+    price_server.batch_status = 500
+    frame = orchestrator.tick()
+    assert frame["signals"] == []
+    assert orchestrator.scheduler.next_due_in("A0") == 0.0
+    price_server.batch_status = 200
+    price_server.requests.clear()
+    frame = orchestrator.tick()
+    assert price_server.requests == ["batch"]
+    assert [signal["value"] for signal in frame["signals"]] == [100.0] * 3
+    assert orchestrator.scheduler.next_due_in("A0") > 3000
+
+
+def test_late_probe_completing_while_circuit_is_held_gives_one_signal(make_orchestrator, price_server):
+    orchestrator = make_orchestrator(
+        agents=1,
+        engine={"circuit_breaker_failures": 1, "cooldown_seconds": 0, "max_cooldown_seconds": 0, "tick_deadline_seconds": 0.2},
+    )
+    orchestrator.tick()
+    price_server.single_status = 500
+    orchestrator.tick()
+    assert orchestrator.breaker.circuits["A0"].state == "open"
+    # the half-open probe misses the deadline and is carried forward
+    price_server.single_status = 200
+    price_server.prices["S0"] = 101.0
+    price_server.delay_s = 0.5
+    frame = orchestrator.tick()
+    assert frame["fetch_stage"]["late_agents"] == ["A0"]
+    time.sleep(0.7)
+    # next tick the circuit still waits for the probe, whose result is folded in instead of a carried value
+    frame = orchestrator.tick()
+    assert frame["fetch_stage"]["open_circuits"] == ["A0"]
+    assert [(signal["agent"], signal["value"], signal["carried"]) for signal in frame["signals"]] == [("A0", 101.0, False)]
+    assert orchestrator.breaker.circuits["A0"].state == "closed"
+
+
+def test_agents_are_fetched_concurrently(make_orchestrator, price_server):
+    orchestrator = make_orchestrator(agents=4, engine={"batch_requests": False})
+    price_server.delay_s = 0.3
+    started = time.perf_counter()
+    frame = orchestrator.tick()
+    elapsed = time.perf_counter() - started
+    assert price_server.requests == ["single"] * 4
+    assert len(frame["signals"]) == 4
+    # four sequential fetches would take 1.2 s
+    assert elapsed < 0.9
+
+
+def test_agents_sharing_a_url_share_one_request(make_orchestrator, price_server):
+    orchestrator = make_orchestrator(engine={"batch_requests": False}, url=f"{price_server.url}/api/v3/ticker/price?symbol=S0")
+    price_server.prices["S0"] = 42.0
+    frame = orchestrator.tick()
+    assert price_server.requests == ["single"]
+    assert frame["fetch_stage"]["coalesced_hits"] == 2
+    assert [(signal["agent"], signal["value"]) for signal in frame["signals"]] == [("A0", 42.0), ("A1", 42.0), ("A2", 42.0)]
+
+
+def test_online_te_skips_lag_scan_and_surrogates(make_orchestrator, price_server):
+    orchestrator = make_orchestrator(engine={"te_estimator": "online", "te_max_lag": 3, "te_surrogates": 10})
+    for tick in range(12):
+        for i in range(3):
+            price_server.prices[f"S{i}"] = 100.0 + (tick * (i + 1)) % 7
+        frame = orchestrator.tick()
+    assert frame["transfer_entropy_stats"]["mode"] == "online"
+    assert frame["transfer_entropy_stats"]["skipped"] == ["lag_scan", "surrogate_test"]
+    assert frame["transfer_entropy_lags"] == {}
+    assert frame["transfer_entropy_significance"] == {}
+    assert set(frame["transfer_entropy_graph"]) == {f"A{i}->A{j}" for i in range(3) for j in range(3) if i != j}
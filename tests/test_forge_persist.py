@@ -0,0 +1,101 @@
+import json
+import threading
+import time
+
+from core.forge_persist import VOLATILE_FIELDS, FramePersister, _without
+
+
+def test_unserializable_frame_does_not_stop_the_writer(tmp_path):
+    persister = FramePersister(tmp_path / "frame.json", min_interval_s=0.0)
+    persister.submit({"ts": 1, "bad": object()})
+    assert persister.flush()
+    persister.submit({"ts": 2, "value": 1})
+    assert persister.flush()
+    persister.close()
+    assert persister.stats["errors"] == 1
+    assert json.loads((tmp_path / "frame.json").read_text()) == {"value": 1, "ts": 2}
+
+
+def test_concurrent_persisters_on_one_path_leave_no_temp_files(tmp_path):
+    path = tmp_path / "frame.json"
+    persisters = [FramePersister(path, min_interval_s=0.0) for _ in range(4)]
+
+    def hammer(index, persister):
+        for i in range(50):
+            persister.submit({"ts": i, "writer": index, "i": i})
+            persister.flush()
+
+    threads = [threading.Thread(target=hammer, args=(i, p)) for i, p in enumerate(persisters)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for persister in persisters:
+        persister.close()
+    assert all(p.stats["errors"] == 0 for p in persisters)
+    assert json.loads(path.read_text())["i"] == 49
+    assert [p.name for p in tmp_path.iterdir()] == ["frame.json"]
+
+
+def test_volatile_fields_are_dropped_without_touching_the_frame():
+    frame = {
+        "ts": 1,
+        "signals": [{"agent": "a", "value": 2.0, "freshness_s": 0.5, "reward": 0.1}],
+        "source_resilience": {"http_pool": {"reused": 3}, "agents": {"a": {"ok_count": 1, "next_fetch_in_s": 4}}},
+    }
+    content = frame
+    for path in VOLATILE_FIELDS:
+        content = _without(content, path.split("."))
+    assert content == {
+        "signals": [{"agent": "a", "value": 2.0, "reward": 0.1}],
+        "source_resilience": {"agents": {"a": {"ok_count": 1}}},
+    }
+    assert frame["signals"][0]["freshness_s"] == 0.5
+    assert frame["source_resilience"]["http_pool"] == {"reused": 3}
+
+
+def test_fitness_only_change_is_persisted(tmp_path):
+    persister = FramePersister(tmp_path / "frame.json", min_interval_s=0.0)
+    frame = {"ts": 1, "signals": [{"agent": "a", "value": 2.0, "fitness": 0.5, "reward": 0.5}], "timings": {"fetch_ms": 1.0}}
+    persister.submit(frame)
+    assert persister.flush()
+    persister.submit({**frame, "ts": 2, "timings": {"fetch_ms": 9.0}})
+    assert persister.flush()
+    persister.submit({**frame, "ts": 3, "signals": [{"agent": "a", "value": 2.0, "fitness": 0.7, "reward": 0.52}]})
+    assert persister.flush()
+    persister.close()
+    assert persister.stats["writes"] == 2
+    assert persister.stats["skipped_unchanged"] == 1
+    assert json.loads((tmp_path / "frame.json").read_text())["signals"][0]["fitness"] == 0.7
+
+
+def test_unchanged_frame_is_rewritten_after_max_age(tmp_path):
+    persister = FramePersister(tmp_path / "frame.json", min_interval_s=0.0, max_age_s=0.2)
+    persister.submit({"ts": 1, "value": 1})
+    assert persister.flush()
+    persister.submit({"ts": 2, "value": 1})
+    assert persister.flush()
+    time.sleep(0.25)
+    persister.submit({"ts": 3, "value": 1})
+    assert persister.flush()
+    persister.close()
+    assert persister.stats["writes"] == 2
+    assert persister.stats["skipped_unchanged"] == 1
+    assert json.loads((tmp_path / "frame.json").read_text())["ts"] == 3
+
+
+def test_orchestrator_tick_with_unchanged_content_is_not_rewritten(make_orchestrator):
+    # fetched on the first tick only; later ticks carry the same values forward
+    orchestrator = make_orchestrator(engine={"persist_min_interval_seconds": 0}, interval_seconds=3600)
+    # the first tick fetches; the second is the first to carry the values forward
+    for _ in range(2):
+        orchestrator.tick()
+        assert orchestrator.persister.flush()
+    written = orchestrator.cache_file.read_text()
+    for _ in range(3):
+        frame = orchestrator.tick()
+        assert orchestrator.persister.flush()
+    assert all(signal["value"] == 100.0 for signal in frame["signals"])
+    assert orchestrator.persister.stats["writes"] == 2
+    assert orchestrator.persister.stats["skipped_unchanged"] == 3
+    assert orchestrator.cache_file.read_text() == written
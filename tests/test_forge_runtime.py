@@ -0,0 +1,87 @@
+import json
+import os
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from conftest import ROOT_CONFIG  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def forge_runtime(tmp_path_factory):
+    # importing the module builds its default runtime; keep that one's state out of the repo as well
+    home = tmp_path_factory.mktemp("home")
+    (home / "IrsanAI-TPM").mkdir()
+    previous = os.environ.get("HOME")
+    os.environ["HOME"] = str(home)
+    try:
+        from production import forge_runtime
+    finally:
+        if previous is None:
+            os.environ.pop("HOME")
+        else:
+            os.environ["HOME"] = previous
+    return forge_runtime
+
+
+@pytest.fixture
+def client(forge_runtime, tmp_path, monkeypatch):
+    config = json.loads(json.dumps(ROOT_CONFIG))
+    config["platform"].update(cache_dir=str(tmp_path / "state"), data_dir=str(tmp_path / "data"), logs_dir=str(tmp_path / "logs"))
+    config["agents"] = []
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps(config))
+    runtime = forge_runtime.ForgeRuntime(config_path)
+    # an existing index: a missing one is rebuilt by probing every catalogued source over the network
+    runtime.source_index_file.write_text(json.dumps({"generated_at": 0, "sources": []}))
+    monkeypatch.setattr(forge_runtime, "runtime", runtime)
+    # no lifespan: startup would launch the engine loop and probe every catalogued source
+    test_client = TestClient(forge_runtime.app)
+    test_client.runtime = runtime
+    yield test_client
+    runtime.stop()
+
+
+def _spec(**extra):
+    return {"name": "X", "domain": "finance", "market": "X", "source_type": "binance", "url": "http://127.0.0.1:9/x?symbol=X", **extra}
+
+
+def test_agent_interval_below_the_engine_tick_is_rejected(client):
+    tick_s = ROOT_CONFIG["engine"]["interval_seconds"]
+    response = client.post("/api/agents", json=_spec(interval_seconds=tick_s / 2))
+    assert response.status_code == 400
+    assert "interval_seconds" in response.json()["detail"]
+    assert client.post("/api/agents", json=_spec(interval_seconds=tick_s)).status_code == 200
+
+
+def test_dashboard_revalidates_with_exact_etags(client):
+    first = client.get("/api/dashboard")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert client.get("/api/dashboard", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/api/dashboard", headers={"If-None-Match": f'"other", W/{etag}'}).status_code == 304
+    # a substring of the tag, or a tag that contains it, is a different tag
+    assert client.get("/api/dashboard", headers={"If-None-Match": etag[:-2] + '"'}).status_code == 200
+    assert client.get("/api/dashboard", headers={"If-None-Match": f'"x{etag[1:]}'}).status_code == 200
+    assert client.get("/api/dashboard", headers={"If-None-Match": f"{etag}-gzip"}).status_code == 200
+
+
+def test_dashboard_etag_follows_breaker_state(client):
+    etag = client.get("/api/dashboard").headers["etag"]
+    client.runtime.mro.record_result("M0::binance::http://example", False, None, "boom")
+    response = client.get("/api/dashboard", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    sources = response.json()["sources_health"]["mro"]["sources"]
+    assert [source["last_error"] for source in sources] == ["boom"]
+
+
+def test_metrics_endpoint_serves_the_prometheus_text_format(client, forge_runtime):
+    forge_runtime.METRICS.inc("forge_test_probe_total", help_text="Test probe")
+    response = client.get("/api/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE forge_test_probe_total counter" in response.text.splitlines()
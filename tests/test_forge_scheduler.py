@@ -0,0 +1,35 @@
+from core.forge_scheduler import AgentScheduler
+
+
+def test_agents_follow_their_own_interval():
+    scheduler = AgentScheduler(slack_s=0.0)
+    scheduler.sync({"fast": 10, "slow": 3600, "every_tick": None}, now=1000.0)
+    assert scheduler.pop_due(1000.0) == {"fast", "slow"}
+    assert not scheduler.is_scheduled("every_tick")
+    scheduler.reschedule("fast", 1000.0)
+    scheduler.reschedule("slow", 1000.0)
+    assert scheduler.pop_due(1005.0) == set()
+    assert scheduler.pop_due(1010.0) == {"fast"}
+
+
+def test_zero_delay_reschedule_is_due_on_the_next_tick():
+    scheduler = AgentScheduler(slack_s=0.0)
+    scheduler.sync({"slow": 3600}, now=1000.0)
+    assert scheduler.pop_due(1000.0) == {"slow"}
+    # a failed fetch is retried right away instead of after a full interval
+    scheduler.reschedule("slow", 1000.0, delay_s=0.0)
+    assert scheduler.next_due_in("slow", 1000.0) == 0.0
+    assert scheduler.pop_due(1001.0) == {"slow"}
+    scheduler.reschedule("slow", 1001.0)
+    assert scheduler.pop_due(1002.0) == set()
+    assert scheduler.next_due_in("slow", 1002.0) == 3599.0
+
+
+def test_intervals_shorter_than_the_engine_tick_are_clamped():
+    scheduler = AgentScheduler(slack_s=0.0, min_interval_s=30.0)
+    scheduler.sync({"eager": 5, "slow": 120}, now=1000.0)
+    assert scheduler.pop_due(1000.0) == {"eager", "slow"}
+    scheduler.reschedule("eager", 1000.0)
+    scheduler.reschedule("slow", 1000.0)
+    assert scheduler.next_due_in("eager", 1000.0) == 30.0
+    assert scheduler.next_due_in("slow", 1000.0) == 120.0
@@ -0,0 +1,60 @@
+import socket
+import time
+
+import pytest
+
+from core.forge_stream import STREAM_PROVIDERS, StreamHub, WebSocketConnection
+from ws_standin import StandInWebSocketServer
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_connection_reads_standin_messages():
+    with StandInWebSocketServer() as server:
+        conn = WebSocketConnection(f"{server.url}/stream?streams=btcusdt@trade", timeout=2)
+        try:
+            assert '"s": "BTCUSDT"' in conn.recv_message()
+        finally:
+            conn.close()
+
+
+def test_timeout_mid_frame_resets_instead_of_desyncing():
+    with StandInWebSocketServer(stall_mid_frame=True) as server:
+        conn = WebSocketConnection(f"{server.url}/stream?streams=btcusdt@trade", timeout=2)
+        conn.settimeout(0.3)
+        try:
+            with pytest.raises(ConnectionError):
+                conn.recv_message()
+        finally:
+            conn.close()
+
+
+def test_idle_timeout_before_a_frame_stays_a_timeout():
+    with StandInWebSocketServer() as server:
+        conn = WebSocketConnection(f"{server.url}/stream", timeout=2)
+        conn.settimeout(0.2)
+        try:
+            with pytest.raises(socket.timeout):
+                conn.recv_message()
+        finally:
+            conn.close()
+
+
+def test_hub_reconnects_after_server_drops_connection():
+    with StandInWebSocketServer(drop_after=3) as server:
+        hub = StreamHub(STREAM_PROVIDERS["binance_ws"], f"{server.url}/stream", idle_timeout_s=2, max_backoff_s=0.2)
+        hub.add_symbol("btcusdt")
+        try:
+            assert _wait_for(lambda: hub.stats["connects"] >= 2 and hub.stats["reconnects"] >= 1, timeout=10)
+            first = hub.quote("btcusdt")
+            assert first is not None
+            assert _wait_for(lambda: hub.quote("btcusdt")[1] > first[1])
+        finally:
+            hub.remove_symbol("btcusdt")
@@ -0,0 +1,32 @@
+import pytest
+
+from production import preflight_manager
+from production.preflight_manager import PreflightManager, Source
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.setattr(preflight_manager, "STATE_DIR", tmp_path)
+    monkeypatch.setattr(preflight_manager, "init_db_v2", lambda: None)
+    return PreflightManager(pool_map={})
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"error": [], "result": {}},
+        {"error": [], "result": {"XXBTZUSD": [], "last": 1}},
+        {"error": ["EQuery:Unknown asset pair"]},
+    ],
+)
+def test_kraken_payload_without_a_candle_is_a_parse_error(manager, monkeypatch, payload):
+    monkeypatch.setattr(manager, "_get_json", lambda url, source_type="": (200, payload))
+    result = manager.fetch_price(Source("kraken", "kraken", "https://api.kraken.com/0/public/OHLC?pair=XBTUSD"))
+    assert result["status"] == "PARSE_ERROR"
+
+
+def test_kraken_close_is_read_from_the_last_candle(manager, monkeypatch):
+    payload = {"error": [], "result": {"XXBTZUSD": [[1, "1", "2", "0.5", "100.5"], [2, "1", "2", "0.5", "101.5"]], "last": 2}}
+    monkeypatch.setattr(manager, "_get_json", lambda url, source_type="": (200, payload))
+    result = manager.fetch_price(Source("kraken", "kraken", "https://api.kraken.com/0/public/OHLC?pair=XBTUSD"))
+    assert (result["status"], result["price"]) == ("OK", 101.5)
@@ -0,0 +1,105 @@
+"""Stand-in ws:// server for exercising the stream client without an exchange.
+
+Speaks just enough RFC 6455 for ``WebSocketConnection``: the upgrade handshake and unmasked server text
+frames. Each accepted connection pushes Binance-style ``@trade`` messages for the subscribed streams.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import socket
+import struct
+import threading
+import time
+
+_WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+def text_frame(text: str) -> bytes:
+    payload = text.encode("utf-8")
+    length = len(payload)
+    if length < 126:
+        header = bytes([0x81, length])
+    elif length < 1 << 16:
+        header = bytes([0x81, 126]) + struct.pack("!H", length)
+    else:
+        header = bytes([0x81, 127]) + struct.pack("!Q", length)
+    return header + payload
+
+
+class StandInWebSocketServer:
+    """``drop_after``: close each connection after that many messages (None keeps it open).
+    ``stall_mid_frame``: send the first frame's header, then stop sending (a peer hanging mid-frame)."""
+
+    def __init__(self, interval_s: float = 0.05, drop_after: int | None = None, stall_mid_frame: bool = False):
+        self.interval_s = interval_s
+        self.drop_after = drop_after
+        self.stall_mid_frame = stall_mid_frame
+        self.paths: list[str] = []
+        self._stop = threading.Event()
+        self._sock = socket.socket()
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(("127.0.0.1", 0))
+        self._sock.listen()
+        self._sock.settimeout(0.2)
+        self.port = self._sock.getsockname()[1]
+        self._thread = threading.Thread(target=self._accept_loop, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"ws://127.0.0.1:{self.port}"
+
+    def __enter__(self) -> StandInWebSocketServer:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join(timeout=2)
+        self._sock.close()
+
+    def _accept_loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                conn, _ = self._sock.accept()
+            except socket.timeout:
+                continue
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn: socket.socket) -> None:
+        with conn:
+            data = b""
+            while b"\r\n\r\n" not in data:
+                chunk = conn.recv(4096)
+                if not chunk:
+                    return
+                data += chunk
+            lines = data.decode("latin-1").split("\r\n")
+            path = lines[0].split()[1]
+            key = next(line.split(":", 1)[1].strip() for line in lines if line.lower().startswith("sec-websocket-key"))
+            accept = base64.b64encode(hashlib.sha1((key + _WS_GUID).encode("ascii")).digest()).decode("ascii")
+            conn.sendall(
+                "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                f"Sec-WebSocket-Accept: {accept}\r\n\r\n".encode("ascii")
+            )
+            self.paths.append(path)
+            streams = path.split("streams=", 1)[1].split("/") if "streams=" in path else []
+            sent = 0
+            try:
+                while not self._stop.is_set():
+                    for stream in streams:
+                        message = json.dumps({"stream": stream, "data": {"s": stream.split("@")[0].upper(), "p": str(100 + sent)}})
+                        frame = text_frame(message)
+                        if self.stall_mid_frame:
+                            conn.sendall(frame[:2])
+                            self._stop.wait()
+                            return
+                        conn.sendall(frame)
+                        sent += 1
+                        if self.drop_after is not None and sent >= self.drop_after:
+                            return
+                    time.sleep(self.interval_s)
+            except OSError:
+                return